@@ -0,0 +1,43 @@
+"""refresh token hmac digest
+
+Revision ID: 9b4c71e2d05a
+Revises: 5d2e8a1f3b7c
+Create Date: 2026-10-18 11:30:41.902117
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4c71e2d05a"
+down_revision: str | None = "5d2e8a1f3b7c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Истекшие токены больше не нужны, а действующие bcrypt-хеши (60 символов)
+    # помещаются в новую колонку и переводятся на HMAC при первом использовании
+    op.execute("DELETE FROM refresh WHERE expires_at <= now()")
+    op.alter_column(
+        "refresh",
+        "token_hash",
+        existing_type=sa.String(length=255),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+    )
+    op.create_index("ix_refresh_token_hash", "refresh", ["token_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_token_hash", table_name="refresh")
+    op.alter_column(
+        "refresh",
+        "token_hash",
+        existing_type=sa.String(length=64),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+    )
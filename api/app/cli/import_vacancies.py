@@ -0,0 +1,82 @@
+"""Импорт вакансий пользователя из NDJSON или CSV файла
+
+Тот же путь, что и у эндпоинта import_vacancies: файл читается потоком,
+записи валидируются пачками и загружаются через COPY. Отчет печатается
+в stdout в формате JSON.
+
+Запуск из каталога api:
+    python -m app.cli.import_vacancies --user-id 42 vacancies.csv
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app.config import app_config
+from app.core.response_cache import InMemoryResponseCache
+from app.database import AsyncSessionLocal, async_engine
+from app.exceptions import AppException
+from app.repositories.auth_repository import AuthRepository
+from app.repositories.vacancy_repository import VacancyRepository
+from app.schemas.export import ExportFormat
+from app.services.vacancy_service import VacancyService
+
+CHUNK_SIZE = 64 * 1024  # Байт за одно чтение файла
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def run(path: Path, user_id: int, import_format: ExportFormat) -> int:
+    try:
+        async with AsyncSessionLocal() as db:
+            # Кеш ответов живет в памяти воркеров API и отсюда не сбрасывается,
+            # как и при записи через соседний воркер
+            vacancy_service = VacancyService(
+                VacancyRepository(db),
+                AuthRepository(db),
+                InMemoryResponseCache(max_size=0),
+                AsyncSessionLocal,
+            )
+            result = await vacancy_service.import_vacancies(
+                user_id, read_chunks(path), import_format
+            )
+    except AppException as e:
+        print(e.detail, file=sys.stderr)
+        return 1
+    finally:
+        await async_engine.dispose()
+
+    print(result.model_dump_json(indent=2))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="Файл с вакансиями")
+    parser.add_argument("--user-id", type=int, required=True, help="Автор вакансий")
+    parser.add_argument(
+        "--format",
+        choices=[export_format.value for export_format in ExportFormat],
+        help="Формат файла, по умолчанию - по расширению (.csv или NDJSON)",
+    )
+    args = parser.parse_args()
+
+    if args.format:
+        import_format = ExportFormat(args.format)
+    elif args.path.suffix.lower() == ".csv":
+        import_format = ExportFormat.CSV
+    else:
+        import_format = ExportFormat.NDJSON
+    logging.basicConfig(level=app_config.log_level, format=app_config.log_format)
+    sys.exit(asyncio.run(run(args.path, args.user_id, import_format)))
+
+
+if __name__ == "__main__":
+    main()
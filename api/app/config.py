@@ -33,6 +33,38 @@ class AppConfig(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 10
+    token_cache_size: int = 10000  # Проверенные access токены в памяти воркера
+
+    # Password hashing
+    password_hash_rounds: int = 12  # Стоимость bcrypt
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 32  # Сверх этого запросы получают 503
+
+    # Pagination
+    default_page_size: int = 50
+    max_page_size: int = 200
+
+    # Response cache
+    response_cache_size: int = 10000  # Ответов в памяти воркера, 0 - без кеша
+
+    # Compression
+    compression_encodings: list[str] = ["br", "gzip"]  # В порядке предпочтения
+    compression_minimum_size: int = 1024  # Байт, ответы меньше отдаются как есть
+    compression_gzip_level: int = 6  # 1-9
+    compression_brotli_quality: int = 4  # 0-11, выше - заметно дороже по CPU
+
+    # Funnel
+    funnel_reconcile_batch_size: int = 500  # Пользователей за одну транзакцию
+
+    # Refresh token sweeper
+    token_sweep_interval_seconds: int = 3600  # 0 - фоновая очистка выключена
+    token_sweep_batch_size: int = 1000  # Токенов за один DELETE
+    max_refresh_tokens_per_user: int = 20  # Более старые сессии удаляются
+    user_deletion_retention_hours: int = 24  # Хранение удалений для ленты бота
+
+    # Import
+    import_batch_size: int = 1000  # Записей за один COPY во временную таблицу
+    import_max_errors: int = 1000  # Ошибок в отчете, остальные только считаются
 
     # Network
     http_only: bool = True  # True означает, что cookie не доступны через JavaScript
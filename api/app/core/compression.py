@@ -0,0 +1,211 @@
+import time
+import zlib
+from collections.abc import Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # brotli не обязателен, без него ответы сжимаются только gzip
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> str | None:
+    """Выбирает кодирование по Accept-Encoding клиента
+
+    Из принимаемых клиентом кодирований берется с наибольшим q, при равных q -
+    первое в порядке предпочтения сервера. None - сжимать не нужно.
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    candidates = [
+        (accepted.get(encoding, wildcard), -index, encoding)
+        for index, encoding in enumerate(encodings)
+    ]
+    quality, _, encoding = max(candidates, default=(0.0, 0, None))
+    return encoding if quality > 0 else None
+
+
+class StreamCompressor:
+    """Потоковый компрессор тела одного ответа со сбором метрик"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            # 16 + MAX_WBITS - формат gzip с заголовком и контрольной суммой
+            self._compressor = zlib.compressobj(
+                level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_time = 0.0
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Сжимает фрагмент и сбрасывает буфер, чтобы клиент получил его сразу"""
+        started = time.thread_time()
+        if self.encoding == "br":
+            compressed = self._compressor.process(data) + (
+                self._compressor.finish() if final else self._compressor.flush()
+            )
+        else:
+            compressed = self._compressor.compress(data) + self._compressor.flush(
+                zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+            )
+        self.cpu_time += time.thread_time() - started
+        self.bytes_in += len(data)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    def report(self) -> None:
+        """Добавляет объемы и время сжатия ответа в метрики"""
+        prefix = f"compression.{self.encoding}"
+        metrics.increment(f"{prefix}.responses")
+        metrics.increment(f"{prefix}.bytes_in", self.bytes_in)
+        metrics.increment(f"{prefix}.bytes_out", self.bytes_out)
+        metrics.increment(f"{prefix}.cpu_seconds", self.cpu_time)
+        bytes_in = metrics.get(f"{prefix}.bytes_in")
+        bytes_out = metrics.get(f"{prefix}.bytes_out")
+        metrics.set(f"{prefix}.ratio", bytes_in / max(bytes_out, 1))
+
+
+class CompressionMiddleware:
+    """Сжатие ответов gzip или brotli по Accept-Encoding клиента
+
+    Целиком отданные ответы меньше minimum_size не сжимаются. Потоковые ответы
+    сжимаются по фрагментам без буферизации всего тела.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str],
+        minimum_size: int,
+        gzip_level: int,
+        brotli_quality: int,
+    ):
+        self.app = app
+        self.encodings = [
+            encoding
+            for encoding in encodings
+            if encoding == "gzip" or (encoding == "br" and brotli is not None)
+        ]
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send, encoding, self.levels[encoding], self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Перехватывает сообщения ответа и сжимает тело"""
+
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.compressor: StreamCompressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or not (
+                content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                # Заголовки зависят от первого фрагмента тела
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                metrics.increment("compression.skipped_small")
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+            await self._start(body, more_body)
+            return
+
+        compressed = self.compressor.compress(body, final=not more_body)
+        if compressed or not more_body:
+            await self._send_body(compressed, more_body)
+
+    async def _start(self, body: bytes, more_body: bool) -> None:
+        """Отправляет заголовки сжатого ответа и первый фрагмент"""
+        self.compressor = StreamCompressor(self.encoding, self.level)
+        compressed = self.compressor.compress(body, final=not more_body)
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # Сжатое представление побайтно отличается, сильный ETag становится слабым
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if more_body:
+            if "content-length" in headers:
+                del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(compressed))
+
+        await self._send(self.start_message)
+        await self._send_body(compressed, more_body)
+
+    async def _send_body(self, body: bytes, more_body: bool) -> None:
+        """Отправляет сжатый фрагмент, после последнего пишет метрики"""
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
+        if not more_body:
+            self.compressor.report()
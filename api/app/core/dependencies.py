@@ -1,29 +1,45 @@
 import logging
+from datetime import datetime
 
-from fastapi import Depends
+from fastapi import Depends, Query
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import app_config
+from app.core.principal import CurrentUser
+from app.core.response_cache import InMemoryResponseCache
 from app.core.security import verify_token
-from app.database import get_async_db
+from app.core.token_cache import VerifiedTokenCache
+from app.database import AsyncSessionLocal, get_async_db
 from app.exceptions import TokenInvalidException, UserNotFoundException
-from app.models import UserModel
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.favorite_repository import FavoriteRepository
+from app.repositories.funnel_repository import FunnelRepository
 from app.repositories.stage_repository import StageRepository
 from app.repositories.vacancy_repository import VacancyRepository
+from app.schemas.export import ExportFiltersSchema, ExportFormat, ExportPageSchema
+from app.schemas.favorite import FavoriteStage
+from app.schemas.vacancy import VacancyFiltersSchema, VacancyStatus
 from app.services.admin_service import AdminService
 from app.services.auth_service import AuthService
 from app.services.favorite_service import FavoriteService
+from app.services.funnel_service import FunnelService
 from app.services.stage_service import StageService
 from app.services.vacancy_service import VacancyService
 
 security = HTTPBearer()
+token_cache = VerifiedTokenCache(max_size=app_config.token_cache_size)
+response_cache = InMemoryResponseCache(max_size=app_config.response_cache_size)
 logger = logging.getLogger(__name__)
 
 
-async def get_current_user(token=Depends(security)) -> UserModel:
+async def get_current_user(token=Depends(security)) -> CurrentUser:
     """Получение текущего пользователя из токена"""
+    # Токен уже проверялся - повторно подпись не проверяем
+    user = token_cache.get(token.credentials)
+    if user is not None:
+        return user
+
     try:
         payload = verify_token(token.credentials)
         if not payload or payload.get("type") != "access":
@@ -37,11 +53,12 @@ async def get_current_user(token=Depends(security)) -> UserModel:
             raise TokenInvalidException()
 
         # Создаем объект пользователя из данных токена
-        user = UserModel(
+        user = CurrentUser(
             id=user_id,
             username=username,
             telegram_username=telegram_username,
         )
+        token_cache.put(token.credentials, user, payload["exp"])
 
         return user
 
@@ -52,6 +69,46 @@ async def get_current_user(token=Depends(security)) -> UserModel:
         raise TokenInvalidException()
 
 
+def get_vacancy_filters(
+    stage: list[FavoriteStage] | None = Query(None, description="Этапы"),
+    status: list[VacancyStatus] | None = Query(None, description="Статусы"),
+    company_name: list[str] | None = Query(None, description="Компании"),
+    location: list[str] | None = Query(None, description="Локации"),
+    employment: list[str] | None = Query(None, description="Типы занятости"),
+) -> VacancyFiltersSchema:
+    """Собирает фильтры списка вакансий из query-параметров"""
+    return VacancyFiltersSchema(
+        stage=stage,
+        status=status,
+        company_name=company_name,
+        location=location,
+        employment=employment,
+    )
+
+
+def get_export_page(
+    export_format: ExportFormat = Query(
+        ExportFormat.NDJSON, alias="format", description="Формат выгрузки"
+    ),
+    limit: int | None = Query(
+        None, ge=1, description="Максимум строк, без него - до конца выборки"
+    ),
+    cursor: str | None = Query(
+        None, description="Курсор продолжения из заголовка X-Next-Cursor"
+    ),
+) -> ExportPageSchema:
+    """Собирает параметры страницы выгрузки из query-параметров"""
+    return ExportPageSchema(format=export_format, limit=limit, cursor=cursor)
+
+
+def get_export_filters(
+    created_from: datetime | None = Query(None, description="Создано не раньше"),
+    created_to: datetime | None = Query(None, description="Создано раньше"),
+) -> ExportFiltersSchema:
+    """Собирает общие фильтры выгрузки из query-параметров"""
+    return ExportFiltersSchema(created_from=created_from, created_to=created_to)
+
+
 def get_auth_repository(db: AsyncSession = Depends(get_async_db)) -> AuthRepository:
     """Создает репозиторий пользователей"""
     return AuthRepository(db)
@@ -71,6 +128,13 @@ def get_favorite_repository(
     return FavoriteRepository(db)
 
 
+def get_funnel_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> FunnelRepository:
+    """Создает репозиторий счетчиков воронки"""
+    return FunnelRepository(db)
+
+
 def get_stage_repository(db: AsyncSession = Depends(get_async_db)) -> StageRepository:
     """Создает репозиторий этапов"""
     return StageRepository(db)
@@ -88,14 +152,21 @@ def get_vacancy_service(
     auth_repo: AuthRepository = Depends(get_auth_repository),
 ) -> VacancyService:
     """Создает сервис вакансий"""
-    return VacancyService(vacancy_repo, auth_repo)
+    return VacancyService(vacancy_repo, auth_repo, response_cache, AsyncSessionLocal)
 
 
 def get_favorite_service(
     favorite_repo: FavoriteRepository = Depends(get_favorite_repository),
 ) -> FavoriteService:
     """Создает сервис вакансий"""
-    return FavoriteService(favorite_repo)
+    return FavoriteService(favorite_repo, response_cache)
+
+
+def get_funnel_service(
+    funnel_repo: FunnelRepository = Depends(get_funnel_repository),
+) -> FunnelService:
+    """Создает сервис счетчиков воронки"""
+    return FunnelService(funnel_repo)
 
 
 def get_stage_service(
@@ -103,7 +174,7 @@ def get_stage_service(
     vacancy_repo: VacancyRepository = Depends(get_vacancy_repository),
 ) -> StageService:
     """Создает сервис этапов"""
-    return StageService(stage_repo, vacancy_repo)
+    return StageService(stage_repo, vacancy_repo, response_cache)
 
 
 def get_admin_service(
@@ -112,4 +183,4 @@ def get_admin_service(
     stage_repo: StageRepository = Depends(get_stage_repository),
 ) -> AdminService:
     """Создает сервис администратора"""
-    return AdminService(auth_repo, vacancy_repo, stage_repo)
+    return AdminService(auth_repo, vacancy_repo, stage_repo, AsyncSessionLocal)
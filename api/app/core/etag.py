@@ -0,0 +1,42 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from app.config import app_config
+
+# Ответ персональный, браузер хранит его у себя и перепроверяет по ETag
+CACHE_CONTROL = "private, no-cache"
+
+
+def build_etag(*parts: Any) -> str:
+    """Строит ETag из значений, от которых зависит ответ
+
+    ETag слабый: сжатые gzip и brotli представления отличаются побайтно,
+    но равнозначны по содержанию.
+    """
+    raw = repr((app_config.version, *parts)).encode()
+    return f'W/"{hashlib.blake2b(raw, digest_size=16).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Проверяет, совпадает ли ETag с одним из If-None-Match"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Для If-None-Match используется слабое сравнение (RFC 9110, 13.1.2)
+    opaque_tag = etag.removeprefix("W/")
+    return opaque_tag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str
+) -> Response | None:
+    """Возвращает 304, если у клиента актуальная версия, иначе ставит заголовки"""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
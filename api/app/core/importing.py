@@ -0,0 +1,136 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any, NamedTuple
+
+from app.schemas.export import ExportFormat
+
+MAX_RECORD_SIZE = 1024 * 1024  # Символов в одной записи или строке файла
+RECORD_TOO_LONG = "Слишком длинная запись"
+
+
+class ImportRecord(NamedTuple):
+    row: int  # Номер записи в файле с единицы, без строки заголовков CSV
+    data: dict[str, Any] | None
+    error: str | None = None  # Запись не разобрана, data = None
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str | None]:
+    """Режет поток байтов на строки UTF-8, не накапливая весь файл
+
+    Вместо строки длиннее MAX_RECORD_SIZE возвращается None, а ее остаток
+    до перевода строки пропускается, не попадая в память.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    tail = ""
+    skipping = False  # Дочитываем строку, о которой уже вернули None
+    async for chunk in chunks:
+        text = tail + decoder.decode(chunk)
+        lines = text.splitlines(keepends=True)
+        # Последняя строка может быть не дочитана до конца
+        tail = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            if skipping:
+                skipping = False
+            elif len(line) > MAX_RECORD_SIZE:
+                yield None
+            else:
+                yield line
+        if len(tail) > MAX_RECORD_SIZE:
+            if not skipping:
+                skipping = True
+                yield None
+            tail = ""
+    tail += decoder.decode(b"", final=True)
+    if tail and not skipping:
+        yield tail if len(tail) <= MAX_RECORD_SIZE else None
+
+
+async def iter_records(
+    chunks: AsyncIterable[bytes], import_format: ExportFormat
+) -> AsyncIterator[ImportRecord]:
+    """Разбирает загружаемый файл по одной записи
+
+    Ошибка разбора записи не прерывает чтение, а возвращается вместе
+    с ее номером. Пустые строки пропускаются.
+    """
+    if import_format is ExportFormat.CSV:
+        records = _iter_csv_records(iter_lines(chunks))
+    else:
+        records = _iter_ndjson_records(iter_lines(chunks))
+    async for record in records:
+        yield record
+
+
+async def _iter_ndjson_records(
+    lines: AsyncIterable[str | None],
+) -> AsyncIterator[ImportRecord]:
+    row = 0
+    async for line in lines:
+        if line is None:
+            row += 1
+            yield ImportRecord(row, None, RECORD_TOO_LONG)
+            continue
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield ImportRecord(row, None, f"Некорректный JSON: {e}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRecord(row, None, "Строка должна быть JSON-объектом")
+            continue
+        yield ImportRecord(row, data)
+
+
+async def _iter_csv_records(
+    lines: AsyncIterable[str | None],
+) -> AsyncIterator[ImportRecord]:
+    header: list[str] | None = None
+    row = 0
+    record = ""
+    quotes = 0
+    async for line in lines:
+        if line is None:
+            # Слишком длинная строка обрывает и запись, в которую она входила
+            row += 1
+            yield ImportRecord(row, None, RECORD_TOO_LONG)
+            record, quotes = "", 0
+            continue
+        record += line
+        quotes += line.count('"')
+        # Значение в кавычках может занимать несколько строк файла,
+        # запись закончена, когда кавычки сбалансированы
+        if quotes % 2:
+            if len(record) > MAX_RECORD_SIZE:
+                # Несбалансированная кавычка не должна втянуть в память весь файл
+                row += 1
+                yield ImportRecord(row, None, RECORD_TOO_LONG)
+                record, quotes = "", 0
+            continue
+        text, record, quotes = record, "", 0
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row += 1
+        if len(values) != len(header):
+            yield ImportRecord(
+                row,
+                None,
+                f"Ожидалось колонок: {len(header)}, получено: {len(values)}",
+            )
+            continue
+        # Пустая ячейка означает незаданное поле
+        yield ImportRecord(
+            row, {name: value for name, value in zip(header, values) if value != ""}
+        )
+
+    if record.strip():
+        yield ImportRecord(row + 1, None, "Незакрытая кавычка в конце файла")
@@ -0,0 +1,37 @@
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions import AppException
+
+
+def violated_constraint(error: IntegrityError) -> str | None:
+    """Имя нарушенного ограничения из ошибки драйвера, None - если неизвестно"""
+    # Адаптер SQLAlchemy оборачивает исключение asyncpg, у которого есть имя
+    for exc in (error.orig, getattr(error.orig, "__cause__", None)):
+        constraint_name = getattr(exc, "constraint_name", None)
+        if constraint_name:
+            return constraint_name
+    return None
+
+
+@asynccontextmanager
+async def constraint_errors(
+    db: AsyncSession, exceptions: Mapping[str, type[AppException]]
+) -> AsyncIterator[None]:
+    """Превращает нарушение уникальности или внешнего ключа в доменное исключение
+
+    Проверку заменяет само ограничение БД, поэтому запись обходится одним
+    запросом без предварительного SELECT. Транзакция откатывается, ошибки
+    ограничений не из exceptions пробрасываются как есть.
+    """
+    try:
+        yield
+    except IntegrityError as e:
+        await db.rollback()
+        exception = exceptions.get(violated_constraint(e))
+        if exception is None:
+            raise
+        raise exception() from e
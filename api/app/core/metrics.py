@@ -0,0 +1,31 @@
+from collections import defaultdict
+
+
+class MetricsRegistry:
+    """Счетчики и текущие значения воркера для эндпоинта метрик админки
+
+    Имена метрик - строки через точку, например compression.gzip.bytes_in.
+    Значения не сбрасываются и видны только внутри своего воркера.
+    """
+
+    def __init__(self):
+        self._values: defaultdict[str, float] = defaultdict(float)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Увеличивает счетчик"""
+        self._values[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        """Записывает текущее значение"""
+        self._values[name] = value
+
+    def get(self, name: str) -> float:
+        """Возвращает значение метрики, 0 - если ее еще нет"""
+        return self._values.get(name, 0)
+
+    def snapshot(self) -> dict[str, float]:
+        """Возвращает копию всех метрик, отсортированных по имени"""
+        return dict(sorted(self._values.items()))
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import datetime
+
+from app.exceptions import InvalidCursorException
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Кодирует позицию (created_at, id) в непрозрачный курсор"""
+    return _encode([created_at.isoformat(), item_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Декодирует курсор обратно в позицию (created_at, id)"""
+    try:
+        created_at, item_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def encode_rank_cursor(rank: float, item_id: int) -> str:
+    """Кодирует позицию в выдаче поиска (rank, id) в непрозрачный курсор"""
+    return _encode([rank, item_id])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """Декодирует курсор поиска обратно в позицию (rank, id)"""
+    try:
+        rank, item_id = _decode(cursor)
+        return float(rank), int(item_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def encode_id_cursor(item_id: int) -> str:
+    """Кодирует позицию выгрузки по id в непрозрачный курсор"""
+    return _encode([item_id])
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """Декодирует курсор выгрузки обратно в id"""
+    try:
+        (item_id,) = _decode(cursor)
+        return int(item_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Пользователь текущего запроса, восстановленный из access токена"""
+
+    id: int
+    username: str
+    telegram_username: str | None = None
@@ -0,0 +1,120 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def user_namespace(user_id: int) -> str:
+    """Пространство ключей данных пользователя: список вакансий"""
+    return f"user:{user_id}"
+
+
+def vacancy_namespace(vacancy_id: int) -> str:
+    """Пространство ключей вакансии: сама вакансия и ее этапы"""
+    return f"vacancy:{vacancy_id}"
+
+
+class ResponseCacheBackend(ABC):
+    """Кеш готовых ответов сервисов, сгруппированных по пространствам ключей
+
+    Пространство сбрасывается целиком при любом изменении его данных. Каждый
+    сброс увеличивает поколение пространства: ответ, загруженный до сброса,
+    в кеш уже не попадет. Разделяемый между воркерами бэкенд (например, Redis)
+    реализует те же методы и сам сериализует значения.
+    """
+
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Any | None:
+        """Возвращает значение или None, если его нет в кеше"""
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Any, generation: int) -> None:
+        """Сохраняет значение, если с generation пространство не сбрасывалось"""
+
+    @abstractmethod
+    async def generation(self, namespace: str) -> int:
+        """Текущее поколение пространства"""
+
+    @abstractmethod
+    async def invalidate(self, *namespaces: str) -> None:
+        """Сбрасывает все значения пространств"""
+
+    async def get_or_load(
+        self, namespace: str, key: str, loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Возвращает значение из кеша, а при промахе загружает и сохраняет его"""
+        value = await self.get(namespace, key)
+        if value is not None:
+            return value
+
+        generation = await self.generation(namespace)
+        value = await loader()
+        await self.set(namespace, key, value, generation)
+        return value
+
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    """LRU-кеш ответов в памяти воркера
+
+    Хранит не больше max_size значений, при переполнении вытесняется самое
+    давнее. Поколения тоже хранятся для max_size последних сброшенных
+    пространств, остальные считаются сброшенными не раньше самого свежего
+    из вытесненных - это лишь иногда пропускает сохранение, но не дает
+    сохранить устаревший ответ. Сбросы видит только свой воркер.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._keys: dict[str, set[str]] = {}
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._evicted_generation = 0
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, namespace: str, key: str) -> Any | None:
+        value = self._entries.get((namespace, key))
+        if value is not None:
+            self._entries.move_to_end((namespace, key))
+        return value
+
+    async def set(self, namespace: str, key: str, value: Any, generation: int) -> None:
+        if self.max_size <= 0 or generation != await self.generation(namespace):
+            return
+
+        self._entries[(namespace, key)] = value
+        self._entries.move_to_end((namespace, key))
+        self._keys.setdefault(namespace, set()).add(key)
+        if len(self._entries) > self.max_size:
+            (old_namespace, old_key), _ = self._entries.popitem(last=False)
+            keys = self._keys[old_namespace]
+            keys.discard(old_key)
+            if not keys:
+                del self._keys[old_namespace]
+
+    async def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, self._evicted_generation)
+
+    async def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            for key in self._keys.pop(namespace, ()):
+                del self._entries[(namespace, key)]
+
+            self._clock += 1
+            self._generations[namespace] = self._clock
+            self._generations.move_to_end(namespace)
+            if len(self._generations) > max(self.max_size, 1):
+                _, generation = self._generations.popitem(last=False)
+                self._evicted_generation = max(self._evicted_generation, generation)
+
+    def clear(self) -> None:
+        """Очищает кеш, загружаемые сейчас ответы тоже не сохранятся"""
+        self._entries.clear()
+        self._keys.clear()
+        self._generations.clear()
+        self._clock += 1
+        self._evicted_generation = self._clock
@@ -0,0 +1,34 @@
+from collections.abc import Mapping
+from typing import Any, TypeVar
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+
+class SchemaJSONResponse(Response):
+    """JSON-ответ, уже сериализованный pydantic-core в байты"""
+
+    media_type = "application/json"
+
+
+def schema_response(
+    adapter: TypeAdapter[T],
+    content: Any,
+    *,
+    from_attributes: bool = False,
+    status_code: int = status.HTTP_200_OK,
+    headers: Mapping[str, str] | None = None,
+) -> SchemaJSONResponse:
+    """Сериализует ответ адаптером схемы в обход response_model
+
+    FastAPI не проверяет возвращенный Response, поэтому содержимое должно
+    соответствовать схеме адаптера: быть ее экземплярами или, при
+    from_attributes, ORM-объектами, которые валидируются здесь один раз.
+    """
+    if from_attributes:
+        content = adapter.validate_python(content, from_attributes=True)
+    return SchemaJSONResponse(
+        adapter.dump_json(content), status_code=status_code, headers=headers
+    )
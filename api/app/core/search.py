@@ -0,0 +1,65 @@
+import html
+
+from sqlalchemy import Float, cast, func
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSQUERY
+from sqlalchemy.sql.elements import ColumnElement
+
+# Посты о вакансиях пишут на русском и английском, индексируем оба языка
+SEARCH_CONFIGS = ("russian", "english")
+HEADLINE_CONFIG = "russian"  # Латиница в ней разбирается english_stem
+# ts_headline не экранирует документ, поэтому совпадения отмечаются
+# управляющими символами и меняются на <mark> уже после экранирования
+HEADLINE_START, HEADLINE_STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = (
+    f'StartSel="{HEADLINE_START}", StopSel="{HEADLINE_STOP}", MaxWords=35, '
+    'MinWords=15, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def weighted_tsvector_sql(*columns: tuple[str, str]) -> str:
+    """Строит SQL-выражение tsvector по колонкам с весами для генерируемой колонки
+
+    Принимает пары (колонка, вес A-D). Выражение иммутабельно, поэтому
+    подходит для GENERATED ALWAYS AS ... STORED.
+    """
+    return " || ".join(
+        f"setweight(to_tsvector('{config}'::regconfig, "
+        f"coalesce({column}, '')), '{weight}')"
+        for column, weight in columns
+        for config in SEARCH_CONFIGS
+    )
+
+
+def build_tsquery(query: str) -> ColumnElement:
+    """Строит tsquery из пользовательской строки в синтаксисе веб-поиска"""
+    tsqueries = [
+        func.websearch_to_tsquery(cast(config, REGCONFIG), query, type_=TSQUERY)
+        for config in SEARCH_CONFIGS
+    ]
+    tsquery = tsqueries[0]
+    for other in tsqueries[1:]:
+        tsquery = tsquery.op("||", return_type=TSQUERY)(other)
+    return tsquery
+
+
+def ts_rank(vector: ColumnElement, tsquery: ColumnElement) -> ColumnElement:
+    """Релевантность документа запросу"""
+    return func.ts_rank(vector, tsquery, type_=Float)
+
+
+def ts_headline(document: ColumnElement, tsquery: ColumnElement) -> ColumnElement:
+    """Фрагменты документа с подсвеченными совпадениями"""
+    return func.ts_headline(
+        cast(HEADLINE_CONFIG, REGCONFIG), document, tsquery, HEADLINE_OPTIONS
+    )
+
+
+def render_headline(headline: str | None) -> str | None:
+    """Экранирует HTML во фрагментах ts_headline и оборачивает совпадения в <mark>"""
+    if headline is None:
+        return None
+    return (
+        html.escape(headline)
+        .replace(HEADLINE_START, "<mark>")
+        .replace(HEADLINE_STOP, "</mark>")
+    )
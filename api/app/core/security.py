@@ -1,22 +1,46 @@
+import hashlib
+import hmac
+import uuid
 from datetime import datetime, timedelta
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import app_config
-
-# Настройки хеширования паролей
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Проверяет пароль"""
-    return pwd_context.verify(plain_password, hashed_password)
+from app.core.worker_pool import BoundedWorkerPool
+from app.exceptions import PasswordHashingBusyException
+
+# Настройки хеширования паролей. Хеши с другой стоимостью считаются
+# устаревшими и пересчитываются при следующем успешном входе
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=app_config.password_hash_rounds,
+    bcrypt__min_rounds=app_config.password_hash_rounds,
+    bcrypt__max_rounds=app_config.password_hash_rounds,
+)
+
+# bcrypt выполняется вне event loop, чтобы не блокировать другие запросы
+password_pool = BoundedWorkerPool(
+    max_workers=app_config.password_hash_workers,
+    queue_size=app_config.password_hash_queue_size,
+    thread_name_prefix="bcrypt",
+    busy_exception=PasswordHashingBusyException,
+)
+
+
+async def verify_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Проверяет пароль и возвращает новый хеш, если старый устарел"""
+    return await password_pool.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Хеширует пароль"""
-    return pwd_context.hash(password)
+    return await password_pool.run(pwd_context.hash, password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -41,7 +65,8 @@ def create_refresh_token(data: dict) -> str:
     """Создает refresh токен"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=app_config.refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti делает токены уникальными даже при выдаче в одну и ту же секунду
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, app_config.secret_key, algorithm=app_config.algorithm
     )
@@ -60,5 +85,12 @@ def verify_token(token: str) -> dict | None:
 
 
 def get_token_hash(token: str) -> str:
-    """Создает хеш токена для хранения в БД"""
-    return pwd_context.hash(token)
+    """Создает HMAC-SHA256 дайджест токена для хранения и поиска в БД"""
+    return hmac.new(
+        app_config.secret_key.encode(), token.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+async def verify_legacy_token_hash(token: str, token_hash: str) -> bool:
+    """Проверяет токен по старому bcrypt-хешу"""
+    return await password_pool.run(pwd_context.verify, token, token_hash)
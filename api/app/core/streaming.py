@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+)
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.pagination import decode_id_cursor, encode_id_cursor
+from app.schemas.export import ExportFiltersSchema, ExportFormat, ExportPageSchema
+
+STREAM_FETCH_SIZE = 500  # Строк за одно чтение серверного курсора
+STREAM_CHUNK_SIZE = 64 * 1024  # Байт в одном фрагменте ответа
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+# ID последней строки страницы из limit строк после after_id
+PageEndFinder = Callable[[int, int], Awaitable[int | None]]
+# Читает строки выгрузки в переданной сессии по (after_id, until_id]
+RowStreamer = Callable[[AsyncSession, int, int | None], AsyncIterator[Any]]
+
+
+def export_conditions(model: Any, filters: ExportFiltersSchema) -> list[ColumnElement]:
+    """Условия фильтров выгрузки по колонкам модели, незаданные пропускаются"""
+    conditions = []
+    if filters.created_from is not None:
+        conditions.append(model.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        conditions.append(model.created_at < filters.created_to)
+    for name in ("user_id", "vacancy_id"):
+        value = getattr(filters, name)
+        if value is not None:
+            conditions.append(getattr(model, name) == value)
+    return conditions
+
+
+async def find_page_end(
+    db: AsyncSession,
+    query: Select,
+    id_column: InstrumentedAttribute,
+    after_id: int,
+    limit: int,
+) -> int | None:
+    """ID последней строки страницы из limit строк после after_id
+
+    None - если после страницы строк нет и выгрузка дойдет до конца выборки.
+    """
+    result = await db.execute(
+        query.with_only_columns(id_column)
+        .where(id_column > after_id)
+        .order_by(id_column)
+        .offset(limit - 1)
+        .limit(2)
+    )
+    ids = result.scalars().all()
+    return ids[0] if len(ids) == 2 else None
+
+
+async def stream_keyset(
+    db: AsyncSession,
+    query: Select,
+    id_column: InstrumentedAttribute,
+    after_id: int,
+    until_id: int | None,
+) -> AsyncIterator[Any]:
+    """Читает строки с id в (after_id, until_id] серверным курсором
+
+    В памяти одновременно находится не больше STREAM_FETCH_SIZE объектов.
+    """
+    query = query.where(id_column > after_id).order_by(id_column)
+    if until_id is not None:
+        query = query.where(id_column <= until_id)
+    result = await db.stream_scalars(
+        query.execution_options(yield_per=STREAM_FETCH_SIZE)
+    )
+    async for item in result:
+        yield item
+
+
+async def keyset_export(
+    page: ExportPageSchema,
+    find_end: PageEndFinder,
+    streamer: RowStreamer,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> tuple[AsyncIterator[Any], str | None]:
+    """Определяет границу страницы выгрузки и готовит поток ее строк
+
+    Граница вычисляется до начала ответа, чтобы курсор продолжения попал
+    в заголовки. Строки выше границы, добавленные во время выгрузки,
+    достанутся следующей странице.
+    """
+    after_id = decode_id_cursor(page.cursor) if page.cursor else 0
+    until_id = await find_end(after_id, page.limit) if page.limit else None
+    next_cursor = encode_id_cursor(until_id) if until_id is not None else None
+    rows = _stream_in_session(session_factory, streamer, after_id, until_id)
+    return rows, next_cursor
+
+
+async def encode_rows(
+    rows: AsyncIterable[Any], schema: type[BaseModel], export_format: ExportFormat
+) -> AsyncIterator[bytes]:
+    """Сериализует строки по схеме и отдает фрагментами по STREAM_CHUNK_SIZE"""
+    chunk = bytearray()
+    if export_format is ExportFormat.CSV:
+        chunk += _csv_line(schema.model_fields)
+
+    async for row in rows:
+        item = schema.model_validate(row, from_attributes=True)
+        if export_format is ExportFormat.CSV:
+            chunk += _csv_line(
+                # Вложенные списки и объекты занимают одну ячейку в виде JSON
+                json.dumps(value, ensure_ascii=False)
+                if isinstance(value, (list, dict))
+                else value
+                for value in item.model_dump(mode="json").values()
+            )
+        else:
+            chunk += item.model_dump_json().encode() + b"\n"
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+
+    if chunk:
+        yield bytes(chunk)
+
+
+def export_response(
+    rows: AsyncIterable[Any],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+    next_cursor: str | None = None,
+    filename: str | None = None,
+) -> StreamingResponse:
+    """Потоковый ответ выгрузки, курсор продолжения - в заголовке"""
+    headers = {}
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if filename:
+        filename = f"{filename}.{export_format.value}"
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        encode_rows(rows, schema, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+async def _stream_in_session(
+    session_factory: async_sessionmaker[AsyncSession],
+    streamer: RowStreamer,
+    after_id: int,
+    until_id: int | None,
+) -> AsyncIterator[Any]:
+    """Читает строки в отдельной сессии, живущей до конца ответа"""
+    # Сессия запроса не должна держать серверный курсор после выхода
+    # из эндпоинта, поэтому поток открывает собственную
+    async with session_factory() as db:
+        async for row in streamer(db, after_id, until_id):
+            yield row
+
+
+def _csv_line(values: Iterable[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode()
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+
+from app.core.principal import CurrentUser
+
+
+class VerifiedTokenCache:
+    """LRU-кеш проверенных access токенов
+
+    Запись живет до момента exp из токена, поэтому кеш не продлевает
+    срок действия токена. При переполнении вытесняется самая давняя запись.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[CurrentUser, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> CurrentUser | None:
+        """Возвращает пользователя для токена, если токен уже проверен"""
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+
+        user, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            return None
+
+        self._entries.move_to_end(token)
+        return user
+
+    def put(self, token: str, user: CurrentUser, expires_at: float) -> None:
+        """Сохраняет проверенный токен до его истечения"""
+        if self.max_size <= 0:
+            return
+
+        self._entries[token] = (user, expires_at)
+        self._entries.move_to_end(token)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очищает кеш"""
+        self._entries.clear()
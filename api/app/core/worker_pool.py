@@ -0,0 +1,70 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.exceptions import ServiceUnavailableException
+
+
+class BoundedWorkerPool:
+    """Пул потоков для CPU-тяжелых задач с ограниченной очередью
+
+    Задачи выполняются вне event loop. Если занято max_workers потоков
+    и в очереди уже ждут queue_size задач, новая задача сразу
+    отклоняется исключением busy_exception, а не копится в памяти.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        queue_size: int,
+        thread_name_prefix: str,
+        busy_exception: type[ServiceUnavailableException] = (
+            ServiceUnavailableException
+        ),
+    ):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.busy_exception = busy_exception
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        # Счетчик меняется только из event loop, поэтому блокировка не нужна
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Количество выполняемых и ожидающих задач"""
+        return self._in_flight
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Выполняет функцию в пуле или отклоняет ее при переполнении"""
+        if self._in_flight >= self.max_workers + self.queue_size:
+            raise self.busy_exception()
+
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._in_flight -= 1
+            raise
+        # Место освобождается, когда задача закончилась в потоке, а не когда
+        # ее перестали ждать: отмена ожидающего не прерывает запущенный поток
+        future.add_done_callback(lambda _: self._release(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Уменьшает счетчик в event loop, вызывается из потока пула"""
+        try:
+            loop.call_soon_threadsafe(self._decrement)
+        except RuntimeError:
+            # Цикл уже закрыт, счетчик больше никто не прочитает
+            pass
+
+    def _decrement(self) -> None:
+        self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Останавливает пул, дожидаясь выполняемых задач"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,7 @@
 from .auth_exceptions import (
+    EmailAlreadyExistsException,
     InvalidCredentialsException,
+    PasswordHashingBusyException,
     TelegramUsernameAlreadyExistsException,
     TokenExpiredException,
     TokenInvalidException,
@@ -11,9 +13,13 @@ from .base_exceptions import (
     ConflictException,
     ForbiddenException,
     NotFoundException,
+    ServiceUnavailableException,
     UnauthorizedException,
     ValidationException,
 )
+from .pagination_exceptions import (
+    InvalidCursorException,
+)
 from .stage_exceptions import (
     StageNotFoundException,
 )
@@ -29,15 +35,20 @@ __all__ = [
     "ConflictException",
     "UnauthorizedException",
     "ForbiddenException",
+    "ServiceUnavailableException",
     # Auth exceptions
     "UserAlreadyExistsException",
+    "EmailAlreadyExistsException",
     "InvalidCredentialsException",
     "TokenExpiredException",
     "TokenInvalidException",
     "UserNotFoundException",
     "TelegramUsernameAlreadyExistsException",
+    "PasswordHashingBusyException",
     # Vacancy exceptions
     "VacancyNotFoundException",
     # Stage exceptions
     "StageNotFoundException",
+    # Pagination exceptions
+    "InvalidCursorException",
 ]
@@ -1,6 +1,7 @@
 from .base_exceptions import (
     ConflictException,
     NotFoundException,
+    ServiceUnavailableException,
     UnauthorizedException,
 )
 
@@ -9,6 +10,10 @@ class UserAlreadyExistsException(ConflictException):
     detail = "Пользователь с таким username уже существует"
 
 
+class EmailAlreadyExistsException(ConflictException):
+    detail = "Пользователь с таким email уже существует"
+
+
 class InvalidCredentialsException(UnauthorizedException):
     detail = "Неверный username или пароль"
 
@@ -27,3 +32,7 @@ class UserNotFoundException(NotFoundException):
 
 class TelegramUsernameAlreadyExistsException(ConflictException):
     detail = "Telegram username уже используется"
+
+
+class PasswordHashingBusyException(ServiceUnavailableException):
+    detail = "Слишком много запросов авторизации, попробуйте позже"
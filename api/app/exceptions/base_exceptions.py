@@ -43,3 +43,10 @@ class ForbiddenException(AppException):
 
     status_code = status.HTTP_403_FORBIDDEN
     detail = "Доступ запрещен"
+
+
+class ServiceUnavailableException(AppException):
+    """Исключение для временной недоступности сервиса (перегрузка)"""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Сервис временно перегружен, попробуйте позже"
@@ -0,0 +1,5 @@
+from .base_exceptions import ValidationException
+
+
+class InvalidCursorException(ValidationException):
+    detail = "Некорректный курсор пагинации"
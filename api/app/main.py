@@ -1,10 +1,16 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
 from app.config import app_config
+from app.core.compression import CompressionMiddleware
 from app.core.exception_handlers import register_exception_handlers
+from app.core.security import password_pool
+from app.database import AsyncSessionLocal
 from app.routers.all import admin_router, internal_router, public_router
+from app.services.token_sweep_service import TokenSweepService
 
 # Настройка логирования
 logging.basicConfig(
@@ -12,17 +18,50 @@ logging.basicConfig(
     format=app_config.log_format,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Жизненный цикл приложения"""
+    sweep_task = None
+    if app_config.token_sweep_interval_seconds > 0:
+        token_sweep_service = TokenSweepService(
+            AsyncSessionLocal,
+            interval_seconds=app_config.token_sweep_interval_seconds,
+            batch_size=app_config.token_sweep_batch_size,
+            max_tokens_per_user=app_config.max_refresh_tokens_per_user,
+            deletion_retention_hours=app_config.user_deletion_retention_hours,
+        )
+        sweep_task = asyncio.create_task(token_sweep_service.run())
+
+    yield
+
+    if sweep_task is not None:
+        sweep_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweep_task
+    password_pool.shutdown()
+
+
 app = FastAPI(
     title="Applyr API",
     description="API для управления вакансиями",
     version="1.0.0",
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 # Регистрация обработчиков исключений
 register_exception_handlers(app)
 
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=app_config.compression_encodings,
+    minimum_size=app_config.compression_minimum_size,
+    gzip_level=app_config.compression_gzip_level,
+    brotli_quality=app_config.compression_brotli_quality,
+)
+
 
 app.include_router(admin_router, prefix="/api")
 app.include_router(internal_router, prefix="/api")
@@ -1,8 +1,10 @@
 # Импортируем Base для Alembic
 from app.database import Base
 
-from .auth import RefreshModel, UserModel
+from .auth import RefreshModel, UserDeletionModel, UserModel
+from .data_version import DataVersionModel
 from .favorite import FavoriteModel
+from .funnel import FunnelCounterModel
 from .stage import StageModel
 from .vacancy import VacancyModel
 
@@ -10,7 +12,10 @@ __all__ = [
     "Base",
     "UserModel",
     "RefreshModel",
+    "UserDeletionModel",
     "VacancyModel",
     "StageModel",
     "FavoriteModel",
+    "FunnelCounterModel",
+    "DataVersionModel",
 ]
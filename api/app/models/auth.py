@@ -1,6 +1,6 @@
 from enum import Enum
 
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.sql import func
 
@@ -26,6 +26,9 @@ class UserModel(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    # Лента изменений привязки Telegram для инвалидации кеша бота
+    __table_args__ = (Index("ix_user_updated_at", updated_at),)
+
 
 class RefreshModel(Base):
     __tablename__ = "refresh"
@@ -34,6 +37,34 @@ class RefreshModel(Base):
     user_id = Column(
         BigInteger, ForeignKey("user.id", ondelete="CASCADE"), nullable=False
     )
-    token_hash = Column(String(255), nullable=False)
+    # HMAC-SHA256 дайджест токена (hex), ищется по равенству
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        # Поиск действующего токена пользователя
+        Index(
+            "ix_refresh_user_id_expires_at",
+            user_id,
+            expires_at,
+            postgresql_include=["created_at"],
+        ),
+        # Удаление истекших токенов
+        Index("ix_refresh_expires_at", expires_at),
+    )
+
+
+class UserDeletionModel(Base):
+    """Удаленные пользователи для ленты изменений привязок Telegram
+
+    Строки добавляет триггер на удаление из user, поэтому учитывается
+    и удаление в обход API.
+    """
+
+    __tablename__ = "user_deletion"
+
+    user_id = Column(BigInteger, primary_key=True)
+    deleted_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (Index("ix_user_deletion_deleted_at", deleted_at),)
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, ForeignKey
+
+from app.database import Base
+
+
+class DataVersionModel(Base):
+    """Версия списка вакансий пользователя, растет при каждом изменении"""
+
+    __tablename__ = "data_version"
+
+    user_id = Column(
+        BigInteger, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,7 +1,9 @@
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy import BigInteger, Column, Computed, DateTime, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import ENUM, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
+from app.core.search import weighted_tsvector_sql
 from app.database import Base
 from app.schemas.favorite import FavoriteStage
 
@@ -21,5 +23,26 @@ class FavoriteModel(Base):
     )
 
     notes = Column(Text)
+    notes_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(weighted_tsvector_sql(("notes", "B")), persisted=True),
+        )
+    )
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Одна запись на пару пользователь-вакансия, цель ON CONFLICT для upsert
+        # и поиск избранного пользователя по вакансии без обращения к таблице
+        Index(
+            "ix_favorite_user_id_vacancy_id",
+            user_id,
+            vacancy_id,
+            unique=True,
+            postgresql_include=["stage"],
+        ),
+        # Подгрузка избранного для страницы вакансий (vacancy_id IN (...))
+        Index("ix_favorite_vacancy_id", vacancy_id, postgresql_include=["user_id"]),
+        Index("ix_favorite_notes_vector", "notes_vector", postgresql_using="gin"),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.schemas.favorite import FavoriteStage
+
+
+class FunnelCounterModel(Base):
+    """Количество записей избранного пользователя на каждом этапе"""
+
+    __tablename__ = "funnel_counter"
+
+    user_id = Column(
+        BigInteger, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    stage = Column(
+        ENUM(FavoriteStage, name="favorite_stage", create_type=False),
+        primary_key=True,
+    )
+    count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
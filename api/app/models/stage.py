@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Text
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.sql import func
 
@@ -18,3 +18,5 @@ class StageModel(Base):
     description = Column(Text)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (Index("ix_stage_vacancy_id_created_at", vacancy_id, created_at),)
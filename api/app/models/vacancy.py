@@ -1,11 +1,23 @@
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import ENUM
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import ENUM, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
+from app.core.search import weighted_tsvector_sql
 from app.database import Base
 from app.schemas.vacancy import VacancyStatus
 
+DESCRIPTION_SNIPPET_LENGTH = 200
+
 
 class VacancyModel(Base):
     __tablename__ = "vacancy"
@@ -31,7 +43,50 @@ class VacancyModel(Base):
     conditions = Column(Text)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Начало описания для компактного списка, хранится готовым
+    description_snippet = deferred(
+        Column(
+            Text,
+            Computed(
+                "left(btrim(regexp_replace(description, '\\s+', ' ', 'g')), "
+                f"{DESCRIPTION_SNIPPET_LENGTH})",
+                persisted=True,
+            ),
+        )
+    )
+    # Полнотекстовый индекс, в выдачу API не попадает и не грузится по умолчанию
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                weighted_tsvector_sql(
+                    ("name", "A"),
+                    ("company_name", "B"),
+                    ("requirements", "C"),
+                    ("description", "D"),
+                ),
+                persisted=True,
+            ),
+        )
+    )
 
     favorite = relationship(
         "FavoriteModel", backref="favorite", cascade="all, delete-orphan"
     )
+    # Хронология этапов, удаляется каскадом в БД
+    stages = relationship(
+        "StageModel",
+        order_by="[StageModel.created_at, StageModel.id]",
+        viewonly=True,
+    )
+
+    __table_args__ = (
+        # Список вакансий пользователя с keyset-пагинацией по (created_at, id)
+        Index(
+            "ix_vacancy_user_id_created_at_id",
+            user_id,
+            created_at.desc(),
+            id.desc(),
+        ),
+        Index("ix_vacancy_search_vector", "search_vector", postgresql_using="gin"),
+    )
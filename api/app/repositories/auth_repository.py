@@ -1,15 +1,43 @@
+from collections import Counter
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import Select, delete, func, insert, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, get_token_hash, verify_password
-from app.models import RefreshModel, UserModel
+from app.config import app_config
+from app.core.integrity import constraint_errors
+from app.core.streaming import export_conditions, find_page_end, stream_keyset
+from app.core.security import (
+    get_password_hash,
+    get_token_hash,
+    verify_legacy_token_hash,
+    verify_password,
+)
+from app.exceptions import (
+    EmailAlreadyExistsException,
+    TelegramUsernameAlreadyExistsException,
+    UserAlreadyExistsException,
+)
+from app.models import (
+    FavoriteModel,
+    RefreshModel,
+    UserDeletionModel,
+    UserModel,
+    VacancyModel,
+)
+from app.repositories.funnel_repository import FunnelRepository
+from app.schemas.export import ExportFiltersSchema
+from app.schemas.favorite import FavoriteStage
+
+# Пространство ключей pg_advisory_xact_lock для очистки refresh токенов
+TOKEN_SWEEP_LOCK_NAMESPACE = 0x52465348
 
 
 class AuthRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.funnel_repo = FunnelRepository(db)
 
     # Методы для работы с пользователями
     async def get_by_id(self, user_id: int) -> UserModel | None:
@@ -33,10 +61,54 @@ class AuthRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all_users(self) -> list[UserModel]:
-        """Получает всех пользователей"""
-        result = await self.db.execute(select(UserModel))
-        return result.scalars().all()
+    async def get_existing_user_ids(self, user_ids: set[int]) -> set[int]:
+        """Возвращает ID пользователей из набора, которые существуют"""
+        result = await self.db.execute(
+            select(UserModel.id).where(UserModel.id.in_(user_ids))
+        )
+        return set(result.scalars().all())
+
+    async def get_telegram_changes_since(
+        self, since: datetime
+    ) -> tuple[list[int], list[str]]:
+        """Пользователи, измененные или удаленные после since, и их текущие username
+
+        Старые username по ID не восстановить, поэтому потребитель сбрасывает
+        записи и по ID, и по новым username.
+        """
+        result = await self.db.execute(
+            select(UserModel.id, UserModel.telegram_username).where(
+                UserModel.updated_at > since
+            )
+        )
+        user_ids = []
+        usernames = []
+        for user_id, telegram_username in result.all():
+            user_ids.append(user_id)
+            if telegram_username is not None:
+                usernames.append(telegram_username)
+
+        result = await self.db.execute(
+            select(UserDeletionModel.user_id).where(
+                UserDeletionModel.deleted_at > since
+            )
+        )
+        user_ids.extend(result.scalars().all())
+        return user_ids, usernames
+
+    async def get_users_export_end(
+        self, filters: ExportFiltersSchema, after_id: int, limit: int
+    ) -> int | None:
+        """ID последнего пользователя страницы выгрузки, None - если она последняя"""
+        query = select(UserModel).where(*export_conditions(UserModel, filters))
+        return await find_page_end(self.db, query, UserModel.id, after_id, limit)
+
+    def stream_users(
+        self, filters: ExportFiltersSchema, after_id: int, until_id: int | None
+    ) -> AsyncIterator[UserModel]:
+        """Читает пользователей для выгрузки серверным курсором по порядку ID"""
+        query = select(UserModel).where(*export_conditions(UserModel, filters))
+        return stream_keyset(self.db, query, UserModel.id, after_id, until_id)
 
     async def create(
         self,
@@ -46,19 +118,32 @@ class AuthRepository:
         second_name: str,
         email: str,
     ) -> UserModel:
-        """Создает нового пользователя"""
+        """Создает нового пользователя, серверные поля приходят из RETURNING
 
-        password_hash = get_password_hash(password)
-        user = UserModel(
-            username=username,
-            password_hash=password_hash,
-            first_name=first_name,
-            second_name=second_name,
-            email=email,
-        )
-        self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        Занятые username и email определяет уникальное ограничение.
+        """
+
+        password_hash = await get_password_hash(password)
+        async with constraint_errors(
+            self.db,
+            {
+                "user_username_key": UserAlreadyExistsException,
+                "user_email_key": EmailAlreadyExistsException,
+            },
+        ):
+            result = await self.db.execute(
+                insert(UserModel)
+                .values(
+                    username=username,
+                    password_hash=password_hash,
+                    first_name=first_name,
+                    second_name=second_name,
+                    email=email,
+                )
+                .returning(UserModel)
+            )
+            user = result.scalar_one()
+            await self.db.commit()
         return user
 
     async def get_user_with_password_check(
@@ -69,22 +154,65 @@ class AuthRepository:
         if not user or not user.password_hash:
             return None
 
-        if not verify_password(password, user.password_hash):
+        is_valid, new_hash = await verify_password(password, user.password_hash)
+        if not is_valid:
             return None
 
+        # Пересчитываем хеш, если изменилась стоимость bcrypt
+        if new_hash:
+            user.password_hash = new_hash
+            await self.db.commit()
+
         return user
 
     async def update_telegram_username(
         self, user_id: int, telegram_username: str
-    ) -> None:
-        """Обновляет Telegram username пользователя"""
-        result = await self.db.execute(select(UserModel).where(UserModel.id == user_id))
-        user = result.scalar_one_or_none()
+    ) -> UserModel | None:
+        """Обновляет Telegram username и возвращает пользователя, None - если его нет
 
-        if user:
-            user.telegram_username = telegram_username
+        Занятый другим пользователем username определяет уникальное ограничение.
+        """
+        async with constraint_errors(
+            self.db,
+            {"user_telegram_username_key": TelegramUsernameAlreadyExistsException},
+        ):
+            result = await self.db.execute(
+                update(UserModel)
+                .where(UserModel.id == user_id)
+                .values(telegram_username=telegram_username)
+                .returning(UserModel)
+                .execution_options(populate_existing=True)
+            )
+            user = result.scalar_one_or_none()
             await self.db.commit()
-            await self.db.refresh(user)
+        return user
+
+    async def delete(self, user_id: int) -> bool:
+        """Удаляет пользователя вместе с его данными"""
+        user = await self.get_by_id(user_id)
+        if not user:
+            return False
+
+        # Счетчики самого пользователя удалятся каскадно, а избранное других
+        # пользователей на его вакансиях нужно вычесть из их счетчиков явно
+        result = await self.db.execute(
+            delete(FavoriteModel)
+            .where(
+                FavoriteModel.vacancy_id.in_(
+                    select(VacancyModel.id).where(VacancyModel.user_id == user_id)
+                ),
+                FavoriteModel.user_id != user_id,
+            )
+            .returning(FavoriteModel.user_id, FavoriteModel.stage)
+        )
+        deltas = Counter()
+        for favorite_user_id, stage in result.all():
+            deltas[(favorite_user_id, stage or FavoriteStage.NOTHING)] -= 1
+        await self.funnel_repo.apply_deltas(deltas)
+
+        await self.db.delete(user)
+        await self.db.commit()
+        return True
 
     # Методы для работы с refresh токенами
     async def save_refresh_token(
@@ -92,54 +220,190 @@ class AuthRepository:
     ) -> RefreshModel:
         """Сохраняет refresh токен в БД"""
         token_hash = get_token_hash(refresh_token)
-        expires_at = datetime.utcnow() + timedelta(days=10)
+        expires_at = datetime.utcnow() + timedelta(
+            days=app_config.refresh_token_expire_days
+        )
 
-        refresh_token_model = RefreshModel(
-            user_id=user_id,
-            token_hash=token_hash,
-            expires_at=expires_at,
+        result = await self.db.execute(
+            insert(RefreshModel)
+            .values(user_id=user_id, token_hash=token_hash, expires_at=expires_at)
+            .returning(RefreshModel)
         )
-        self.db.add(refresh_token_model)
+        refresh_token_model = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(refresh_token_model)
         return refresh_token_model
 
-    async def get_valid_refresh_token(self, user_id: int) -> RefreshModel | None:
-        """Получает действительный refresh токен пользователя"""
+    async def get_valid_refresh_token(
+        self, user_id: int, refresh_token: str
+    ) -> RefreshModel | None:
+        """Получает действительный refresh токен по его дайджесту"""
         result = await self.db.execute(
-            select(RefreshModel)
-            .where(
-                RefreshModel.user_id == user_id,
+            select(RefreshModel).where(
+                RefreshModel.token_hash == get_token_hash(refresh_token),
                 RefreshModel.expires_at > datetime.utcnow(),
             )
-            .order_by(RefreshModel.created_at.desc())
-            .limit(1)
         )
-        return result.scalar_one_or_none()
+        token = result.scalar_one_or_none()
+        if token is None:
+            token = await self._upgrade_legacy_refresh_token(user_id, refresh_token)
+        return token
 
-    async def delete_refresh_token(self, user_id: int) -> bool:
-        """Удаляет refresh токен пользователя"""
-        token = await self.get_valid_refresh_token(user_id)
+    async def delete_refresh_token(self, user_id: int, refresh_token: str) -> bool:
+        """Удаляет refresh токен по его дайджесту"""
+        result = await self.db.execute(
+            delete(RefreshModel).where(
+                RefreshModel.token_hash == get_token_hash(refresh_token)
+            )
+        )
+        if result.rowcount:
+            await self.db.commit()
+            return True
+
+        token = await self._upgrade_legacy_refresh_token(user_id, refresh_token)
         if token:
             await self.db.delete(token)
             await self.db.commit()
             return True
         return False
 
-    async def delete_expired_tokens(self) -> int:
-        """Удаляет истекшие токены и возвращает количество удаленных"""
+    async def _upgrade_legacy_refresh_token(
+        self, user_id: int, refresh_token: str
+    ) -> RefreshModel | None:
+        """Находит токен, сохраненный в bcrypt, и переводит его на дайджест
+
+        Токены bcrypt выдавались только до перехода на HMAC и живут не дольше
+        refresh_token_expire_days, после чего их удаляет delete_expired_tokens.
+        Когда в таблице не останется строк с token_hash LIKE '$2%', этот метод
+        и verify_legacy_token_hash можно убрать.
+        """
         result = await self.db.execute(
-            select(RefreshModel).where(RefreshModel.expires_at <= datetime.utcnow())
+            select(RefreshModel).where(
+                RefreshModel.user_id == user_id,
+                RefreshModel.token_hash.like("$2%"),
+                RefreshModel.expires_at > datetime.utcnow(),
+            )
         )
-        expired_tokens = result.scalars().all()
+        for token in result.scalars().all():
+            if await verify_legacy_token_hash(refresh_token, token.token_hash):
+                token.token_hash = get_token_hash(refresh_token)
+                await self.db.commit()
+                return token
+        return None
 
-        for token in expired_tokens:
-            await self.db.delete(token)
+    async def delete_expired_tokens(self, batch_size: int) -> int | None:
+        """Удаляет до batch_size истекших токенов одним DELETE
+
+        Возвращает количество удаленных, None - если очистку ведет другой воркер.
+        """
+        if not await self._try_lock_token_sweep():
+            return None
+
+        expired = (
+            select(RefreshModel.id)
+            .where(RefreshModel.expires_at <= datetime.utcnow())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return await self._delete_tokens(expired)
+
+    async def delete_excess_tokens(
+        self, max_per_user: int, batch_size: int
+    ) -> int | None:
+        """Удаляет до batch_size токенов сверх max_per_user самых свежих у каждого
+
+        Возвращает количество удаленных, None - если очистку ведет другой воркер.
+        """
+        if not await self._try_lock_token_sweep():
+            return None
+
+        # Нумеруем токены только у пользователей, превысивших лимит
+        ranked = (
+            select(
+                RefreshModel.id,
+                func.row_number()
+                .over(
+                    partition_by=RefreshModel.user_id,
+                    order_by=(RefreshModel.expires_at.desc(), RefreshModel.id.desc()),
+                )
+                .label("position"),
+            )
+            .where(
+                RefreshModel.user_id.in_(
+                    select(RefreshModel.user_id)
+                    .group_by(RefreshModel.user_id)
+                    .having(func.count() > max_per_user)
+                )
+            )
+            .subquery()
+        )
+        excess = (
+            select(ranked.c.id)
+            .where(ranked.c.position > max_per_user)
+            .limit(batch_size)
+        )
+        return await self._delete_tokens(excess)
+
+    async def delete_user_deletions_before(
+        self, before: datetime, batch_size: int
+    ) -> int | None:
+        """Удаляет до batch_size записей об удалении пользователей старше before
+
+        Записи нужны только ленте изменений привязок, бот запрашивает ее
+        с небольшим перекрытием, поэтому старые строки больше не читаются.
+        Возвращает количество удаленных, None - если очистку ведет другой воркер.
+        """
+        if not await self._try_lock_token_sweep():
+            return None
+
+        outdated = (
+            select(UserDeletionModel.user_id)
+            .where(UserDeletionModel.deleted_at < before)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(UserDeletionModel)
+            .where(UserDeletionModel.user_id.in_(outdated))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
 
+    async def _delete_tokens(self, token_ids: Select) -> int:
+        """Удаляет токены с ID из подзапроса и фиксирует транзакцию"""
+        result = await self.db.execute(
+            delete(RefreshModel)
+            .where(RefreshModel.id.in_(token_ids))
+            .execution_options(synchronize_session=False)
+        )
         await self.db.commit()
-        return len(expired_tokens)
+        return result.rowcount
+
+    async def _try_lock_token_sweep(self) -> bool:
+        """Берет транзакционную advisory-блокировку очистки токенов без ожидания
+
+        Блокировка снимается с концом транзакции. Если ее держит другой воркер,
+        транзакция откатывается и возвращается False.
+        """
+        result = await self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:namespace, 0)"),
+            {"namespace": TOKEN_SWEEP_LOCK_NAMESPACE},
+        )
+        if result.scalar_one():
+            return True
+        await self.db.rollback()
+        return False
+
+    async def get_tokens_export_end(
+        self, filters: ExportFiltersSchema, after_id: int, limit: int
+    ) -> int | None:
+        """ID последнего токена страницы выгрузки, None - если она последняя"""
+        query = select(RefreshModel).where(*export_conditions(RefreshModel, filters))
+        return await find_page_end(self.db, query, RefreshModel.id, after_id, limit)
 
-    async def get_all_refresh_tokens(self) -> list[RefreshModel]:
-        """Получает все refresh токены"""
-        result = await self.db.execute(select(RefreshModel))
-        return result.scalars().all()
+    def stream_tokens(
+        self, filters: ExportFiltersSchema, after_id: int, until_id: int | None
+    ) -> AsyncIterator[RefreshModel]:
+        """Читает refresh токены для выгрузки серверным курсором по порядку ID"""
+        query = select(RefreshModel).where(*export_conditions(RefreshModel, filters))
+        return stream_keyset(self.db, query, RefreshModel.id, after_id, until_id)
@@ -0,0 +1,49 @@
+from collections.abc import Iterable
+
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DataVersionModel, VacancyModel
+
+
+class DataVersionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, user_id: int) -> int:
+        """Получает версию данных пользователя, 0 - если изменений еще не было"""
+        result = await self.db.execute(
+            select(DataVersionModel.version).where(DataVersionModel.user_id == user_id)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def bump(self, user_ids: Iterable[int]) -> None:
+        """Увеличивает версии пользователей в текущей транзакции"""
+        user_ids = sorted(set(user_ids))  # Один порядок блокировок строк
+        if not user_ids:
+            return
+        query = insert(DataVersionModel).values(
+            [{"user_id": user_id, "version": 1} for user_id in user_ids]
+        )
+        await self.db.execute(
+            query.on_conflict_do_update(
+                index_elements=[DataVersionModel.user_id],
+                set_={"version": DataVersionModel.version + 1},
+            )
+        )
+
+    async def bump_vacancy_author(self, vacancy_id: int) -> None:
+        """Увеличивает версию автора вакансии в текущей транзакции"""
+        query = insert(DataVersionModel).from_select(
+            ["user_id", "version"],
+            select(VacancyModel.user_id, literal(1)).where(
+                VacancyModel.id == vacancy_id
+            ),
+        )
+        await self.db.execute(
+            query.on_conflict_do_update(
+                index_elements=[DataVersionModel.user_id],
+                set_={"version": DataVersionModel.version + 1},
+            )
+        )
@@ -1,53 +1,106 @@
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.integrity import constraint_errors
+from app.exceptions import VacancyNotFoundException
 from app.models import FavoriteModel
-from app.schemas.favorite import FavoriteBaseSchema
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.funnel_repository import FunnelRepository
+from app.schemas.favorite import FavoriteBaseSchema, FavoriteStage
 
 
 class FavoriteRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.funnel_repo = FunnelRepository(db)
+        self.data_version_repo = DataVersionRepository(db)
 
     async def get_by_vacancy_and_user(
-        self, vacancy_id: int, user_id: int
+        self, vacancy_id: int, user_id: int, for_update: bool = False
     ) -> FavoriteModel | None:
         """Получает запись избранного по ID вакансии и пользователя"""
-        result = await self.db.execute(
-            select(FavoriteModel).where(
-                FavoriteModel.vacancy_id == vacancy_id,
-                FavoriteModel.user_id == user_id,
-            )
+        query = select(FavoriteModel).where(
+            FavoriteModel.vacancy_id == vacancy_id,
+            FavoriteModel.user_id == user_id,
         )
+        if for_update:
+            query = query.with_for_update()
+        result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def create(
-        self, vacancy_id: int, user_id: int, favorite_data: FavoriteBaseSchema
-    ) -> FavoriteModel:
-        """Создает запись в избранном"""
-        favorite = FavoriteModel(
-            vacancy_id=vacancy_id, user_id=user_id, **favorite_data.model_dump()
-        )
-        self.db.add(favorite)
-        await self.db.commit()
-        await self.db.refresh(favorite)
-        return favorite
-
     async def create_or_update(
         self, vacancy_id: int, user_id: int, favorite_data: FavoriteBaseSchema
     ) -> FavoriteModel:
-        """Создает или обновляет запись в избранном"""
-        favorite = await self.get_by_vacancy_and_user(vacancy_id, user_id)
+        """Создает или обновляет запись одним INSERT ... ON CONFLICT DO UPDATE
 
-        if favorite is None:
-            return await self.create(
-                vacancy_id=vacancy_id, user_id=user_id, favorite_data=favorite_data
+        Меняются только переданные поля. Если передан этап, старый этап для
+        счетчиков воронки сначала читается под блокировкой строки.
+        """
+        values = favorite_data.model_dump(exclude_unset=True)
+        existing = None
+        if "stage" in values:
+            existing = await self.get_by_vacancy_and_user(
+                vacancy_id, user_id, for_update=True
             )
+        old_stage = (existing.stage or FavoriteStage.NOTHING) if existing else None
 
-        # Обновляем только переданные поля
-        for key, value in favorite_data.model_dump(exclude_none=True).items():
-            setattr(favorite, key, value)
+        # Этап записи, созданной параллельно после чтения, не перезаписываем:
+        # его старое значение неизвестно и счетчики разошлись бы
+        row = await self._upsert(
+            vacancy_id,
+            user_id,
+            values,
+            overwrite=existing is not None or "stage" not in values,
+        )
+        if row is None:
+            # Теперь запись видна, повторная попытка заблокирует ее
+            return await self.create_or_update(vacancy_id, user_id, favorite_data)
 
+        favorite, inserted = row
+        new_stage = favorite.stage or FavoriteStage.NOTHING
+        if inserted:
+            await self.funnel_repo.apply_deltas({(user_id, new_stage): 1})
+        elif old_stage is not None and new_stage != old_stage:
+            await self.funnel_repo.apply_deltas(
+                {(user_id, old_stage): -1, (user_id, new_stage): 1}
+            )
+        # Этап и заметки показываются в списке вакансий автора
+        await self.data_version_repo.bump_vacancy_author(vacancy_id)
         await self.db.commit()
-        await self.db.refresh(favorite)
         return favorite
+
+    async def _upsert(
+        self, vacancy_id: int, user_id: int, values: dict, overwrite: bool
+    ) -> tuple[FavoriteModel, bool] | None:
+        """Вставляет запись или обновляет переданные поля существующей
+
+        Возвращает запись и признак вставки. Без overwrite существующая запись
+        не меняется и возвращается None.
+        """
+        query = insert(FavoriteModel).values(
+            vacancy_id=vacancy_id, user_id=user_id, **values
+        )
+        index_elements = [FavoriteModel.user_id, FavoriteModel.vacancy_id]
+        if overwrite:
+            query = query.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={
+                    **{key: query.excluded[key] for key in values},
+                    "updated_at": func.now(),
+                },
+            )
+        else:
+            query = query.on_conflict_do_nothing(index_elements=index_elements)
+
+        # xmax = 0 только у строк, вставленных этим запросом
+        async with constraint_errors(
+            self.db, {"favorite_vacancy_id_fkey": VacancyNotFoundException}
+        ):
+            result = await self.db.execute(
+                query.returning(
+                    FavoriteModel, literal_column("xmax = 0").label("inserted")
+                ).execution_options(populate_existing=True)
+            )
+        row = result.one_or_none()
+        return tuple(row) if row else None
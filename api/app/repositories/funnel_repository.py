@@ -0,0 +1,139 @@
+from collections.abc import Iterable, Mapping
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.models import FavoriteModel, FunnelCounterModel, UserModel
+from app.schemas.favorite import FavoriteStage, FunnelDriftSchema
+
+# Пространство ключей pg_advisory_xact_lock для счетчиков воронки
+FUNNEL_LOCK_NAMESPACE = 0x46554E4C
+
+FunnelDeltas = Mapping[tuple[int, FavoriteStage], int]
+
+
+class FunnelRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_user_id(self, user_id: int) -> dict[FavoriteStage, int]:
+        """Получает счетчики пользователя по этапам"""
+        result = await self.db.execute(
+            select(FunnelCounterModel.stage, FunnelCounterModel.count).where(
+                FunnelCounterModel.user_id == user_id
+            )
+        )
+        return {stage: count for stage, count in result.all()}
+
+    async def apply_deltas(self, deltas: FunnelDeltas) -> None:
+        """Изменяет счетчики в текущей транзакции, коммит остается за вызывающим"""
+        rows = [
+            {"user_id": user_id, "stage": stage, "count": delta}
+            for (user_id, stage), delta in sorted(
+                deltas.items(), key=lambda item: (item[0][0], item[0][1].name)
+            )
+            if delta
+        ]
+        if not rows:
+            return
+
+        await self._lock_users({row["user_id"] for row in rows}, exclusive=False)
+        query = insert(FunnelCounterModel).values(rows)
+        await self.db.execute(
+            query.on_conflict_do_update(
+                index_elements=[FunnelCounterModel.user_id, FunnelCounterModel.stage],
+                set_={
+                    "count": FunnelCounterModel.count + query.excluded.count,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def reconcile_batch(
+        self, after_user_id: int, batch_size: int
+    ) -> tuple[list[FunnelDriftSchema], list[int]]:
+        """Пересчитывает счетчики пачки пользователей с ID больше after_user_id
+
+        Возвращает найденные расхождения и ID проверенных пользователей,
+        пустой список - если пользователи закончились.
+        """
+        result = await self.db.execute(
+            select(UserModel.id)
+            .where(UserModel.id > after_user_id)
+            .order_by(UserModel.id)
+            .limit(batch_size)
+        )
+        user_ids = list(result.scalars().all())
+        if not user_ids:
+            return [], []
+
+        # Пока пачка пересчитывается, счетчики ее пользователей не меняются
+        await self._lock_users(user_ids, exclusive=True)
+
+        result = await self.db.execute(
+            select(FavoriteModel.user_id, FavoriteModel.stage, func.count())
+            .where(FavoriteModel.user_id.in_(user_ids))
+            .group_by(FavoriteModel.user_id, FavoriteModel.stage)
+        )
+        actual: dict[tuple[int, FavoriteStage], int] = {}
+        for user_id, stage, count in result.all():
+            key = (user_id, stage or FavoriteStage.NOTHING)
+            actual[key] = actual.get(key, 0) + count
+
+        result = await self.db.execute(
+            select(
+                FunnelCounterModel.user_id,
+                FunnelCounterModel.stage,
+                FunnelCounterModel.count,
+            ).where(FunnelCounterModel.user_id.in_(user_ids))
+        )
+        stored = {(user_id, stage): count for user_id, stage, count in result.all()}
+
+        drift = [
+            FunnelDriftSchema(
+                user_id=user_id,
+                stage=stage,
+                stored=stored.get((user_id, stage), 0),
+                actual=actual.get((user_id, stage), 0),
+            )
+            for user_id, stage in sorted(
+                stored.keys() | actual.keys(), key=lambda key: (key[0], key[1].name)
+            )
+            if stored.get((user_id, stage), 0) != actual.get((user_id, stage), 0)
+        ]
+
+        if drift:
+            drifted_user_ids = {item.user_id for item in drift}
+            await self.db.execute(
+                delete(FunnelCounterModel).where(
+                    FunnelCounterModel.user_id.in_(drifted_user_ids)
+                )
+            )
+            rows = [
+                {"user_id": user_id, "stage": stage, "count": count}
+                for (user_id, stage), count in actual.items()
+                if user_id in drifted_user_ids
+            ]
+            if rows:
+                await self.db.execute(insert(FunnelCounterModel).values(rows))
+
+        await self.db.commit()
+        return drift, user_ids
+
+    async def _lock_users(self, user_ids: Iterable[int], exclusive: bool) -> None:
+        """Берет транзакционные advisory-блокировки пользователей по порядку ключей
+
+        Изменения счетчиков берут разделяемую блокировку, пересчет -
+        эксклюзивную, поэтому пересчет не теряет параллельные инкременты.
+        """
+        lock = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+        keys = sorted({user_id % 2**31 for user_id in user_ids})
+        await self.db.execute(
+            text(
+                f"SELECT {lock}(:namespace, key) FROM "
+                "(SELECT unnest(CAST(:keys AS integer[])) AS key ORDER BY key) AS keys"
+            ),
+            {"namespace": FUNNEL_LOCK_NAMESPACE, "keys": keys},
+        )
@@ -1,7 +1,14 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import StageModel
+from app.core.integrity import constraint_errors
+from app.core.streaming import export_conditions, find_page_end, stream_keyset
+from app.exceptions import VacancyNotFoundException
+from app.models import StageModel, VacancyModel
+from app.schemas.export import ExportFiltersSchema
 from app.schemas.stage import StageCreateSchema, StageUpdateSchema
 
 
@@ -10,21 +17,29 @@ class StageRepository:
         self.db = db
 
     async def create(self, stage_data: StageCreateSchema) -> StageModel:
-        """Создает новый этап"""
-        stage = StageModel(
-            vacancy_id=stage_data.vacancy_id,
-            stage_type=stage_data.stage_type,
-            title=stage_data.title,
-            description=stage_data.description,
-        )
+        """Создает новый этап, серверные поля приходят из RETURNING
+
+        Несуществующую вакансию отклоняет внешний ключ.
+        """
+        values = {
+            "vacancy_id": stage_data.vacancy_id,
+            "stage_type": stage_data.stage_type,
+            "title": stage_data.title,
+            "description": stage_data.description,
+        }
 
         # Если передана дата создания, устанавливаем её
         if stage_data.created_at:
-            stage.created_at = stage_data.created_at
+            values["created_at"] = stage_data.created_at
 
-        self.db.add(stage)
-        await self.db.commit()
-        await self.db.refresh(stage)
+        async with constraint_errors(
+            self.db, {"stage_vacancy_id_fkey": VacancyNotFoundException}
+        ):
+            result = await self.db.execute(
+                insert(StageModel).values(**values).returning(StageModel)
+            )
+            stage = result.scalar_one()
+            await self.db.commit()
         return stage
 
     async def get_by_id(self, stage_id: int) -> StageModel | None:
@@ -37,41 +52,74 @@ class StageRepository:
     async def get_by_vacancy_id(self, vacancy_id: int) -> list[StageModel]:
         """Получает все этапы вакансии"""
         result = await self.db.execute(
-            select(StageModel).where(StageModel.vacancy_id == vacancy_id)
+            select(StageModel)
+            .where(StageModel.vacancy_id == vacancy_id)
+            .order_by(StageModel.created_at)
         )
         return result.scalars().all()
 
-    async def get_all(self) -> list[StageModel]:
-        """Получает все этапы"""
-        result = await self.db.execute(select(StageModel))
-        return result.scalars().all()
+    async def get_list_version(
+        self, vacancy_id: int
+    ) -> tuple[int, int | None, datetime | None] | None:
+        """Количество, последний ID и время изменения этапов вакансии для ETag
+
+        Возвращает None, если вакансии нет.
+        """
+        result = await self.db.execute(
+            select(
+                func.count(StageModel.id),
+                func.max(StageModel.id),
+                func.max(StageModel.updated_at),
+            )
+            .select_from(VacancyModel)
+            .outerjoin(StageModel, StageModel.vacancy_id == VacancyModel.id)
+            .where(VacancyModel.id == vacancy_id)
+            .group_by(VacancyModel.id)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def get_export_end(
+        self, filters: ExportFiltersSchema, after_id: int, limit: int
+    ) -> int | None:
+        """ID последнего этапа страницы выгрузки, None - если она последняя"""
+        query = select(StageModel).where(*export_conditions(StageModel, filters))
+        return await find_page_end(self.db, query, StageModel.id, after_id, limit)
+
+    def stream(
+        self, filters: ExportFiltersSchema, after_id: int, until_id: int | None
+    ) -> AsyncIterator[StageModel]:
+        """Читает этапы для выгрузки серверным курсором по порядку ID"""
+        query = select(StageModel).where(*export_conditions(StageModel, filters))
+        return stream_keyset(self.db, query, StageModel.id, after_id, until_id)
 
     async def update(
         self, stage_id: int, stage_data: StageUpdateSchema
     ) -> StageModel | None:
-        """Обновляет этап"""
-        stage = await self.get_by_id(stage_id)
-        if not stage:
-            return None
-
+        """Обновляет этап одним UPDATE ... RETURNING"""
         # Обновляем только переданные поля
-        if stage_data.stage_type is not None:
-            stage.stage_type = stage_data.stage_type
-        if stage_data.title is not None:
-            stage.title = stage_data.title
-        if stage_data.description is not None:
-            stage.description = stage_data.description
+        values = stage_data.model_dump(exclude_none=True)
+        if not values:
+            return await self.get_by_id(stage_id)
 
+        result = await self.db.execute(
+            update(StageModel)
+            .where(StageModel.id == stage_id)
+            .values(**values)
+            .returning(StageModel)
+            .execution_options(populate_existing=True)
+        )
+        stage = result.scalar_one_or_none()
         await self.db.commit()
-        await self.db.refresh(stage)
         return stage
 
-    async def delete(self, stage_id: int) -> bool:
-        """Удаляет этап"""
-        stage = await self.get_by_id(stage_id)
-        if not stage:
-            return False
-
-        await self.db.delete(stage)
+    async def delete(self, stage_id: int) -> int | None:
+        """Удаляет этап и возвращает ID его вакансии, None - если этапа нет"""
+        result = await self.db.execute(
+            delete(StageModel)
+            .where(StageModel.id == stage_id)
+            .returning(StageModel.vacancy_id)
+        )
+        vacancy_id = result.scalar_one_or_none()
         await self.db.commit()
-        return True
+        return vacancy_id
@@ -1,28 +1,235 @@
-from sqlalchemy import select
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    MetaData,
+    Select,
+    Table,
+    Text,
+    and_,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    tuple_,
+    union,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.sql.elements import ColumnElement
 
-from app.models import VacancyModel
+from app.core.integrity import constraint_errors
+from app.core.pagination import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from app.core.search import build_tsquery, render_headline, ts_headline, ts_rank
+from app.core.streaming import export_conditions, find_page_end, stream_keyset
+from app.exceptions import UserNotFoundException
+from app.models import FavoriteModel, VacancyModel
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.funnel_repository import FunnelRepository
+from app.schemas.export import ExportFiltersSchema
 from app.schemas.favorite import FavoriteStage
 from app.schemas.vacancy import (
+    FacetValueSchema,
     GetVacancySchema,
     VacancyBaseSchema,
+    VacancyCompactSchema,
+    VacancyFacetsSchema,
+    VacancyFiltersSchema,
+    VacancyImportRowSchema,
+    VacancySearchItemSchema,
     VacancyUpdateSchema,
 )
 
+# Колонки компактного списка: все, кроме длинных текстов
+COMPACT_COLUMNS = (
+    VacancyModel.id,
+    VacancyModel.user_id,
+    VacancyModel.name,
+    VacancyModel.status,
+    VacancyModel.company_name,
+    VacancyModel.salary,
+    VacancyModel.experience,
+    VacancyModel.location,
+    VacancyModel.employment,
+    VacancyModel.description_snippet,
+    VacancyModel.created_at,
+    VacancyModel.updated_at,
+)
+
+# Поля вакансии, которые принимает импорт
+IMPORT_FIELDS = tuple(VacancyBaseSchema.model_fields)
+
+# Временная таблица импорта, удаляется в конце транзакции. ID вакансий
+# выдаются при COPY, чтобы избранное ссылалось на них в том же запросе
+IMPORT_STAGING = Table(
+    "vacancy_import",
+    MetaData(),
+    Column(
+        "vacancy_id",
+        BigInteger,
+        server_default=text("nextval(pg_get_serial_sequence('vacancy', 'id'))"),
+    ),
+    *(Column(name, Text) for name in IMPORT_FIELDS),
+    Column("stage", Text),
+    Column("notes", Text),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+IMPORT_COPY_COLUMNS = [
+    column.name for column in IMPORT_STAGING.columns if column.name != "vacancy_id"
+]
+
 
 class VacancyRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.funnel_repo = FunnelRepository(db)
+        self.data_version_repo = DataVersionRepository(db)
 
     async def create(self, vacancy_data: VacancyBaseSchema) -> VacancyModel:
-        """Создает новую вакансию"""
-        vacancy = VacancyModel(**vacancy_data.model_dump())
-        self.db.add(vacancy)
-        await self.db.commit()
-        await self.db.refresh(vacancy)
+        """Создает новую вакансию, серверные поля приходят из RETURNING
+
+        Несуществующего автора отклоняет внешний ключ.
+        """
+        async with constraint_errors(
+            self.db, {"vacancy_user_id_fkey": UserNotFoundException}
+        ):
+            result = await self.db.execute(
+                insert(VacancyModel)
+                .values(**vacancy_data.model_dump())
+                .returning(VacancyModel)
+            )
+            vacancy = result.scalar_one()
+            await self.data_version_repo.bump([vacancy.user_id])
+            await self.db.commit()
         return vacancy
 
+    async def create_many(self, vacancies_data: list[VacancyBaseSchema]) -> list[int]:
+        """Создает вакансии одним INSERT ... RETURNING и возвращает их ID по порядку"""
+        result = await self.db.execute(
+            insert(VacancyModel).returning(
+                VacancyModel.id, sort_by_parameter_order=True
+            ),
+            [vacancy_data.model_dump() for vacancy_data in vacancies_data],
+        )
+        vacancy_ids = list(result.scalars().all())
+        await self.data_version_repo.bump(
+            vacancy_data.user_id for vacancy_data in vacancies_data
+        )
+        await self.db.commit()
+        return vacancy_ids
+
+    async def import_many(
+        self, user_id: int, batches: AsyncIterable[list[VacancyImportRowSchema]]
+    ) -> int:
+        """Импортирует вакансии пользователя и возвращает их количество
+
+        Пачки копируются через COPY во временную таблицу по мере чтения файла,
+        в вакансии и избранное они переносятся одним запросом в конце.
+        Все происходит в одной транзакции: импорт применяется целиком.
+        """
+        await self.db.execute(CreateTable(IMPORT_STAGING))
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+
+        deltas = Counter()
+        copied = 0
+        async for batch in batches:
+            records = []
+            for item in batch:
+                # Заметки без этапа сохраняются в избранном на начальном этапе
+                stage = item.stage
+                if stage is None and item.notes is not None:
+                    stage = FavoriteStage.NOTHING
+                if stage is not None:
+                    deltas[(user_id, stage)] += 1
+                records.append(
+                    (
+                        *(_copy_value(getattr(item, name)) for name in IMPORT_FIELDS),
+                        _copy_value(stage),
+                        item.notes,
+                    )
+                )
+            await raw_connection.driver_connection.copy_records_to_table(
+                IMPORT_STAGING.name, records=records, columns=IMPORT_COPY_COLUMNS
+            )
+            copied += len(records)
+
+        if not copied:
+            await self.db.rollback()
+            return 0
+
+        async with constraint_errors(
+            self.db, {"vacancy_user_id_fkey": UserNotFoundException}
+        ):
+            imported = await self._merge_import(user_id)
+            await self.funnel_repo.apply_deltas(deltas)
+            await self.data_version_repo.bump([user_id])
+            await self.db.commit()
+        return imported
+
+    async def _merge_import(self, user_id: int) -> int:
+        """Переносит временную таблицу в вакансии и избранное одним запросом"""
+        staging = IMPORT_STAGING.c
+        author_id = literal(user_id, BigInteger)
+        new_vacancies = (
+            insert(VacancyModel)
+            .from_select(
+                ["id", "user_id", *IMPORT_FIELDS, "created_at", "updated_at"],
+                select(
+                    staging.vacancy_id,
+                    author_id,
+                    *(
+                        cast(staging.status, VacancyModel.status.type)
+                        if name == "status"
+                        else staging[name]
+                        for name in IMPORT_FIELDS
+                    ),
+                    func.now(),
+                    func.now(),
+                ),
+            )
+            .returning(VacancyModel.id)
+            .cte("new_vacancy")
+        )
+        # Внешний ключ на вакансию проверяется в конце запроса,
+        # поэтому избранное вставляется в соседнем CTE
+        new_favorites = (
+            insert(FavoriteModel)
+            .from_select(
+                ["user_id", "vacancy_id", "stage", "notes", "created_at", "updated_at"],
+                select(
+                    author_id,
+                    staging.vacancy_id,
+                    cast(staging.stage, FavoriteModel.stage.type),
+                    staging.notes,
+                    func.now(),
+                    func.now(),
+                ).where(staging.stage.is_not(None)),
+            )
+            .returning(FavoriteModel.id)
+            .cte("new_favorite")
+        )
+        result = await self.db.execute(
+            select(func.count()).select_from(new_vacancies).add_cte(new_favorites)
+        )
+        return result.scalar_one()
+
     async def get_by_id(self, vacancy_id: int) -> VacancyModel | None:
         """Получает вакансию по ID"""
         result = await self.db.execute(
@@ -62,52 +269,405 @@ class VacancyRepository:
             for vacancy in vacancies
         ]
 
-    async def get_all_by_user_id(self, user_id: int) -> list[GetVacancySchema]:
-        """Получает все вакансии пользователя с этапами"""
+    async def get_page_by_user_id(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        filters: VacancyFiltersSchema | None = None,
+    ) -> tuple[list[GetVacancySchema], str | None]:
+        """Получает страницу вакансий пользователя и курсор следующей страницы"""
+        query = self._page_query(user_id, limit, cursor, filters).options(
+            selectinload(VacancyModel.favorite)
+        )
+        vacancies, next_cursor = await self._fetch_page(query, limit)
+        for vacancy in vacancies:
+            self._attach_favorite(vacancy)
+        return [
+            GetVacancySchema.model_validate(vacancy) for vacancy in vacancies
+        ], next_cursor
+
+    async def get_compact_page_by_user_id(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        filters: VacancyFiltersSchema | None = None,
+    ) -> tuple[list[VacancyCompactSchema], str | None]:
+        """Получает страницу вакансий без длинных текстовых полей"""
+        query = self._page_query(user_id, limit, cursor, filters).options(
+            # Остальные колонки не читаются из БД, обращение к ним - ошибка
+            load_only(*COMPACT_COLUMNS, raiseload=True),
+            selectinload(VacancyModel.favorite).load_only(
+                FavoriteModel.vacancy_id, FavoriteModel.stage, raiseload=True
+            ),
+        )
+        vacancies, next_cursor = await self._fetch_page(query, limit)
+        for vacancy in vacancies:
+            vacancy.stage = (
+                vacancy.favorite[0].stage if vacancy.favorite else FavoriteStage.NOTHING
+            )
+        return [
+            VacancyCompactSchema.model_validate(vacancy) for vacancy in vacancies
+        ], next_cursor
+
+    def _page_query(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None,
+        filters: VacancyFiltersSchema | None,
+    ) -> Select:
+        """Запрос страницы вакансий пользователя с фильтрами и курсором"""
         query = (
             select(VacancyModel)
-            .options(joinedload(VacancyModel.favorite))
             .where(VacancyModel.user_id == user_id)
-            .order_by(VacancyModel.created_at.desc())
+            .order_by(VacancyModel.created_at.desc(), VacancyModel.id.desc())
+            .limit(limit + 1)  # Лишняя строка показывает, есть ли следующая страница
         )
+        if filters:
+            # Этап пользователя берется подзапросом, чтобы не размножать строки
+            stage = (
+                select(FavoriteModel.stage)
+                .where(
+                    FavoriteModel.vacancy_id == VacancyModel.id,
+                    FavoriteModel.user_id == user_id,
+                )
+                .limit(1)
+                .scalar_subquery()
+            )
+            conditions = self._filter_conditions(self._facet_dimensions(stage), filters)
+            if conditions:
+                query = query.where(*conditions.values())
+        if cursor:
+            created_at, vacancy_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(VacancyModel.created_at, VacancyModel.id)
+                < tuple_(created_at, vacancy_id)
+            )
+        return query
+
+    async def _fetch_page(
+        self, query: Select, limit: int
+    ) -> tuple[list[VacancyModel], str | None]:
+        """Выполняет запрос страницы и отрезает строку для курсора"""
         result = await self.db.execute(query)
-        vacancies = result.unique().scalars().all()  # Убираем дубли с помощью unique()
-        for vacancy in vacancies:
-            if vacancy.favorite:
-                vacancy.notes = vacancy.favorite[0].notes
-                vacancy.stage = vacancy.favorite[0].stage
-            else:
-                vacancy.notes = None
-                vacancy.stage = FavoriteStage.NOTHING
-        return [GetVacancySchema.model_validate(vacancy) for vacancy in vacancies]
-
-    async def get_all(self) -> list[VacancyModel]:
-        """Получает все вакансии"""
-        result = await self.db.execute(select(VacancyModel))
-        return result.scalars().all()
+        vacancies = list(result.scalars().all())
+
+        next_cursor = None
+        if len(vacancies) > limit:
+            vacancies = vacancies[:limit]
+            next_cursor = encode_cursor(vacancies[-1].created_at, vacancies[-1].id)
+        return vacancies, next_cursor
+
+    async def search_by_user_id(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        highlight: bool = True,
+    ) -> tuple[list[VacancySearchItemSchema], str | None]:
+        """Ищет вакансии пользователя по тексту и заметкам, сортируя по релевантности"""
+        tsquery = build_tsquery(query)
+
+        # Совпадения по вакансиям и по заметкам ищутся каждое по своему
+        # GIN-индексу, OR через JOIN заставил бы проверять все вакансии
+        matched = union(
+            select(VacancyModel.id.label("id")).where(
+                VacancyModel.user_id == user_id,
+                VacancyModel.search_vector.bool_op("@@")(tsquery),
+            ),
+            select(FavoriteModel.vacancy_id).where(
+                FavoriteModel.user_id == user_id,
+                FavoriteModel.notes_vector.bool_op("@@")(tsquery),
+            ),
+        ).subquery()
+
+        notes_rank = (
+            select(func.max(ts_rank(FavoriteModel.notes_vector, tsquery)))
+            .where(
+                FavoriteModel.vacancy_id == VacancyModel.id,
+                FavoriteModel.user_id == user_id,
+            )
+            .scalar_subquery()
+        )
+        rank = ts_rank(VacancyModel.search_vector, tsquery) + func.coalesce(
+            notes_rank, 0
+        )
+        rank_column = rank.label("rank")
+
+        page_query = (
+            select(VacancyModel.id.label("id"), rank_column)
+            .join(matched, matched.c.id == VacancyModel.id)
+            .where(VacancyModel.user_id == user_id)
+            .order_by(rank_column.desc(), VacancyModel.id.desc())
+            .limit(limit + 1)  # Лишняя строка показывает, есть ли следующая страница
+        )
+        if cursor:
+            cursor_rank, vacancy_id = decode_rank_cursor(cursor)
+            page_query = page_query.where(
+                tuple_(rank, VacancyModel.id) < tuple_(cursor_rank, vacancy_id)
+            )
+        page = page_query.subquery()
+
+        # Подсветка дорогая, поэтому считается только для строк страницы
+        columns = [VacancyModel, page.c.rank]
+        if highlight:
+            columns += [
+                ts_headline(VacancyModel.name, tsquery),
+                ts_headline(VacancyModel.description, tsquery),
+            ]
+        result = await self.db.execute(
+            select(*columns)
+            .join(page, page.c.id == VacancyModel.id)
+            .options(selectinload(VacancyModel.favorite))
+            .order_by(page.c.rank.desc(), VacancyModel.id.desc())
+        )
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1][1], rows[-1][0].id)
+
+        items = []
+        for vacancy, vacancy_rank, *highlights in rows:
+            self._attach_favorite(vacancy)
+            vacancy.rank = vacancy_rank
+            if highlights:
+                vacancy.name_highlight, vacancy.description_highlight = map(
+                    render_headline, highlights
+                )
+            items.append(VacancySearchItemSchema.model_validate(vacancy))
+        return items, next_cursor
+
+    async def get_facets_by_user_id(
+        self, user_id: int, filters: VacancyFiltersSchema
+    ) -> VacancyFacetsSchema:
+        """Считает вакансии пользователя по значениям измерений одним GROUP BY"""
+        dimensions = self._facet_dimensions(FavoriteModel.stage)
+        conditions = self._filter_conditions(dimensions, filters)
+
+        columns = []
+        for name, column in dimensions.items():
+            # Фильтр измерения не сужает его собственные счетчики,
+            # иначе после выбора одного значения пропали бы остальные
+            others = [
+                condition for other, condition in conditions.items() if other != name
+            ]
+            count = func.count().filter(and_(*others)) if others else func.count()
+            columns += [
+                column.label(name),
+                count.label(f"{name}_count"),
+                func.grouping(column).label(f"{name}_grouping"),
+            ]
+
+        result = await self.db.execute(
+            select(*columns)
+            .select_from(VacancyModel)
+            .outerjoin(
+                FavoriteModel,
+                and_(
+                    FavoriteModel.vacancy_id == VacancyModel.id,
+                    FavoriteModel.user_id == user_id,
+                ),
+            )
+            .where(VacancyModel.user_id == user_id)
+            .group_by(
+                func.grouping_sets(*(tuple_(column) for column in dimensions.values()))
+            )
+        )
+
+        facets: dict[str, dict[str | None, int]] = {name: {} for name in dimensions}
+        for row in result.mappings():
+            # grouping() = 0 у измерения, по которому сгруппирована строка
+            name = next(name for name in dimensions if row[f"{name}_grouping"] == 0)
+            value = row[name]
+            if name == "stage" and value is None:
+                value = FavoriteStage.NOTHING  # Вакансия еще не в избранном
+            if isinstance(value, Enum):
+                value = value.value
+            counts = facets[name]
+            counts[value] = counts.get(value, 0) + row[f"{name}_count"]
+
+        return VacancyFacetsSchema(
+            **{
+                name: [
+                    FacetValueSchema(value=value, count=count)
+                    for value, count in sorted(
+                        counts.items(), key=lambda item: (-item[1], item[0] or "")
+                    )
+                    if count
+                ]
+                for name, counts in facets.items()
+            }
+        )
+
+    @staticmethod
+    def _facet_dimensions(stage: ColumnElement) -> dict[str, ColumnElement]:
+        """Колонки измерений, по которым фильтруется и группируется список"""
+        return {
+            "stage": stage,
+            "status": VacancyModel.status,
+            "company_name": VacancyModel.company_name,
+            "location": VacancyModel.location,
+            "employment": VacancyModel.employment,
+        }
+
+    @staticmethod
+    def _filter_conditions(
+        dimensions: dict[str, ColumnElement], filters: VacancyFiltersSchema
+    ) -> dict[str, ColumnElement]:
+        """Условия фильтров по измерениям, незаданные фильтры пропускаются"""
+        conditions = {}
+        for name, column in dimensions.items():
+            values = getattr(filters, name)
+            if not values:
+                continue
+            condition = column.in_(values)
+            if name == "stage" and FavoriteStage.NOTHING in values:
+                # Вакансия без записи в избранном находится на этапе NOTHING
+                condition = condition | column.is_(None)
+            conditions[name] = condition
+        return conditions
+
+    @staticmethod
+    def _attach_favorite(vacancy: VacancyModel) -> None:
+        """Переносит заметки и этап из избранного в атрибуты вакансии"""
+        if vacancy.favorite:
+            vacancy.notes = vacancy.favorite[0].notes
+            vacancy.stage = vacancy.favorite[0].stage
+        else:
+            vacancy.notes = None
+            vacancy.stage = FavoriteStage.NOTHING
+
+    async def get_list_version(self, user_id: int) -> int:
+        """Версия списка вакансий пользователя для ETag"""
+        return await self.data_version_repo.get(user_id)
+
+    async def get_item_version(
+        self, vacancy_id: int, user_id: int
+    ) -> tuple[datetime, datetime | None] | None:
+        """Время изменения вакансии и избранного пользователя к ней для ETag"""
+        result = await self.db.execute(
+            select(VacancyModel.updated_at, FavoriteModel.updated_at)
+            .outerjoin(
+                FavoriteModel,
+                and_(
+                    FavoriteModel.vacancy_id == VacancyModel.id,
+                    FavoriteModel.user_id == user_id,
+                ),
+            )
+            .where(VacancyModel.id == vacancy_id)
+            .limit(1)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def get_export_end(
+        self, filters: ExportFiltersSchema, after_id: int, limit: int
+    ) -> int | None:
+        """ID последней вакансии страницы выгрузки, None - если она последняя"""
+        query = select(VacancyModel).where(*export_conditions(VacancyModel, filters))
+        return await find_page_end(self.db, query, VacancyModel.id, after_id, limit)
+
+    def stream(
+        self, filters: ExportFiltersSchema, after_id: int, until_id: int | None
+    ) -> AsyncIterator[VacancyModel]:
+        """Читает вакансии для выгрузки серверным курсором по порядку ID"""
+        query = select(VacancyModel).where(*export_conditions(VacancyModel, filters))
+        return stream_keyset(self.db, query, VacancyModel.id, after_id, until_id)
+
+    async def get_user_export_end(
+        self,
+        user_id: int,
+        filters: ExportFiltersSchema,
+        after_id: int,
+        limit: int,
+    ) -> int | None:
+        """ID последней вакансии страницы выгрузки пользователя"""
+        query = self._user_export_query(user_id, filters)
+        return await find_page_end(self.db, query, VacancyModel.id, after_id, limit)
+
+    async def stream_with_history(
+        self,
+        user_id: int,
+        filters: ExportFiltersSchema,
+        after_id: int,
+        until_id: int | None,
+    ) -> AsyncIterator[VacancyModel]:
+        """Читает вакансии пользователя с этапом, заметками и хронологией этапов
+
+        Избранное и этапы подгружаются отдельным запросом на каждую порцию
+        серверного курсора, а не на каждую вакансию.
+        """
+        query = self._user_export_query(user_id, filters).options(
+            selectinload(VacancyModel.stages),
+            selectinload(VacancyModel.favorite.and_(FavoriteModel.user_id == user_id)),
+        )
+        async for vacancy in stream_keyset(
+            self.db, query, VacancyModel.id, after_id, until_id
+        ):
+            self._attach_favorite(vacancy)
+            yield vacancy
+
+    @staticmethod
+    def _user_export_query(user_id: int, filters: ExportFiltersSchema) -> Select:
+        """Вакансии пользователя с фильтрами выгрузки"""
+        return select(VacancyModel).where(
+            VacancyModel.user_id == user_id, *export_conditions(VacancyModel, filters)
+        )
 
     async def update(
         self, vacancy_id: int, vacancy_data: VacancyUpdateSchema
     ) -> VacancyModel | None:
-        """Обновляет вакансию"""
-        vacancy = await self.get_by_id(vacancy_id)
+        """Обновляет вакансию одним UPDATE ... RETURNING"""
+        # Обновляем только переданные поля, загруженный объект перезаписывается
+        result = await self.db.execute(
+            update(VacancyModel)
+            .where(VacancyModel.id == vacancy_id)
+            .values(**vacancy_data.model_dump(exclude_none=True))
+            .returning(VacancyModel)
+            .execution_options(populate_existing=True)
+        )
+        vacancy = result.scalar_one_or_none()
         if not vacancy:
             return None
 
-        # Обновляем только переданные поля
-        for key, value in vacancy_data.model_dump(exclude_none=True).items():
-            setattr(vacancy, key, value)
-
+        await self.data_version_repo.bump([vacancy.user_id])
         await self.db.commit()
-        await self.db.refresh(vacancy)
         return vacancy
 
-    async def delete(self, vacancy_id: int) -> bool:
-        """Удаляет вакансию"""
-        vacancy = await self.get_by_id(vacancy_id)
-        if not vacancy:
-            return False
+    async def delete(self, vacancy_id: int) -> int | None:
+        """Удаляет вакансию и возвращает ID ее автора, None - если вакансии нет"""
+        # Избранное удаляем явно, чтобы вычесть ровно удаленные записи из счетчиков
+        result = await self.db.execute(
+            delete(FavoriteModel)
+            .where(FavoriteModel.vacancy_id == vacancy_id)
+            .returning(FavoriteModel.user_id, FavoriteModel.stage)
+        )
+        deltas = Counter()
+        for user_id, stage in result.all():
+            deltas[(user_id, stage or FavoriteStage.NOTHING)] -= 1
 
-        await self.db.delete(vacancy)
+        # Этапы удаляются каскадом в БД
+        result = await self.db.execute(
+            delete(VacancyModel)
+            .where(VacancyModel.id == vacancy_id)
+            .returning(VacancyModel.user_id)
+        )
+        owner_id = result.scalar_one_or_none()
+        if owner_id is None:
+            await self.db.rollback()
+            return None
+
+        await self.funnel_repo.apply_deltas(deltas)
+        await self.data_version_repo.bump([owner_id])
         await self.db.commit()
-        return True
+        return owner_id
+
+
+def _copy_value(value: Any) -> Any:
+    """Значение для COPY: перечисления хранятся в БД по имени"""
+    return value.name if isinstance(value, Enum) else value
@@ -1,31 +1,86 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
-from app.core.dependencies import get_admin_service
+from app.core.dependencies import (
+    get_admin_service,
+    get_export_filters,
+    get_export_page,
+    get_funnel_service,
+)
+from app.core.metrics import metrics
+from app.core.responses import schema_response
+from app.core.streaming import export_response
 from app.schemas.admin import TokenResponse, UserResponse, VacancyResponse
+from app.schemas.export import ExportFiltersSchema, ExportPageSchema
+from app.schemas.favorite import (
+    FUNNEL_RECONCILE_REPORT_ADAPTER,
+    FunnelReconcileReportSchema,
+)
+from app.schemas.stage import StageSchema
 from app.services.admin_service import AdminService
+from app.services.funnel_service import FunnelService
 
 router = APIRouter()
 
 
-@router.get("/get_users", response_model=list[UserResponse])
-async def get_users(admin_service: AdminService = Depends(get_admin_service)):
-    """Получить всех пользователей"""
-    return await admin_service.get_all_users()
+@router.get("/get_users", response_class=StreamingResponse)
+async def get_users(
+    page: ExportPageSchema = Depends(get_export_page),
+    filters: ExportFiltersSchema = Depends(get_export_filters),
+    admin_service: AdminService = Depends(get_admin_service),
+):
+    """Выгрузка пользователей потоком NDJSON или CSV"""
+    rows, next_cursor = await admin_service.export_users(filters, page)
+    return export_response(rows, UserResponse, page.format, next_cursor)
 
 
-@router.get("/get_vacancies", response_model=list[VacancyResponse])
-async def get_vacancies(admin_service: AdminService = Depends(get_admin_service)):
-    """Получить все вакансии"""
-    return await admin_service.get_all_vacancies()
+@router.get("/get_vacancies", response_class=StreamingResponse)
+async def get_vacancies(
+    user_id: int | None = Query(None, description="Автор вакансий"),
+    page: ExportPageSchema = Depends(get_export_page),
+    filters: ExportFiltersSchema = Depends(get_export_filters),
+    admin_service: AdminService = Depends(get_admin_service),
+):
+    """Выгрузка вакансий потоком NDJSON или CSV"""
+    filters.user_id = user_id
+    rows, next_cursor = await admin_service.export_vacancies(filters, page)
+    return export_response(rows, VacancyResponse, page.format, next_cursor)
 
 
-@router.get("/get_stages")
-async def get_stages(admin_service: AdminService = Depends(get_admin_service)):
-    """Получить все этапы"""
-    return await admin_service.get_all_stages()
+@router.get("/get_stages", response_class=StreamingResponse)
+async def get_stages(
+    vacancy_id: int | None = Query(None, description="Вакансия этапов"),
+    page: ExportPageSchema = Depends(get_export_page),
+    filters: ExportFiltersSchema = Depends(get_export_filters),
+    admin_service: AdminService = Depends(get_admin_service),
+):
+    """Выгрузка этапов потоком NDJSON или CSV"""
+    filters.vacancy_id = vacancy_id
+    rows, next_cursor = await admin_service.export_stages(filters, page)
+    return export_response(rows, StageSchema, page.format, next_cursor)
 
 
-@router.get("/get_tokens", response_model=list[TokenResponse])
-async def get_tokens(admin_service: AdminService = Depends(get_admin_service)):
-    """Получить все refresh токены"""
-    return await admin_service.get_all_tokens()
+@router.get("/get_tokens", response_class=StreamingResponse)
+async def get_tokens(
+    user_id: int | None = Query(None, description="Владелец токенов"),
+    page: ExportPageSchema = Depends(get_export_page),
+    filters: ExportFiltersSchema = Depends(get_export_filters),
+    admin_service: AdminService = Depends(get_admin_service),
+):
+    """Выгрузка refresh токенов потоком NDJSON или CSV"""
+    filters.user_id = user_id
+    rows, next_cursor = await admin_service.export_tokens(filters, page)
+    return export_response(rows, TokenResponse, page.format, next_cursor)
+
+
+@router.post("/reconcile_funnel", response_model=FunnelReconcileReportSchema)
+async def reconcile_funnel(funnel_service: FunnelService = Depends(get_funnel_service)):
+    """Пересчитать счетчики воронки и вернуть найденные расхождения"""
+    report = await funnel_service.reconcile()
+    return schema_response(FUNNEL_RECONCILE_REPORT_ADAPTER, report)
+
+
+@router.get("/metrics", response_model=dict[str, float])
+async def get_metrics():
+    """Метрики воркера: сжатие ответов и фоновые задачи"""
+    return metrics.snapshot()
@@ -1,11 +1,27 @@
 import logging
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from app.config import app_config
 from app.core.dependencies import get_auth_service, get_vacancy_service
-from app.schemas.auth import UserInfoSchema
+from app.core.responses import schema_response
+from app.schemas.auth import (
+    TELEGRAM_CHANGES_ADAPTER,
+    USER_INFO_ADAPTER,
+    TelegramChangesSchema,
+    UserInfoSchema,
+)
 from app.schemas.vacancy import (
+    VACANCY_ADAPTER,
+    VACANCY_BULK_RESULT_ADAPTER,
+    VACANCY_PAGE_ADAPTERS,
+    VacancyBulkCreateSchema,
+    VacancyBulkResultSchema,
+    VacancyCompactPageSchema,
     VacancyCreateSchema,
+    VacancyListView,
+    VacancyPageSchema,
     VacancySchema,
 )
 from app.services.auth_service import AuthService
@@ -24,12 +40,17 @@ async def get_by_telegram_username(
     user = await auth_service.auth_repo.get_by_telegram_username(telegram_username)
     if not user:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
-    return UserInfoSchema(
-        id=user.id,
-        username=user.username,
-        telegram_username=user.telegram_username,
-        created_at=user.created_at,
-    )
+    return schema_response(USER_INFO_ADAPTER, user, from_attributes=True)
+
+
+@router.get("/telegram_changes", response_model=TelegramChangesSchema)
+async def get_telegram_changes(
+    since: datetime = Query(..., description="Момент предыдущей синхронизации"),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """Пользователи с изменившейся привязкой Telegram (для инвалидации кеша бота)"""
+    changes = await auth_service.get_telegram_changes(since)
+    return schema_response(TELEGRAM_CHANGES_ADAPTER, changes)
 
 
 @router.post("/create_vacancy", response_model=VacancySchema)
@@ -38,13 +59,40 @@ async def create_vacancy(
     vacancy_service: VacancyService = Depends(get_vacancy_service),
 ):
     """Создание новой вакансии через бот"""
-    return await vacancy_service.create_vacancy(vacancy_data)
+    vacancy = await vacancy_service.create_vacancy(vacancy_data)
+    return schema_response(VACANCY_ADAPTER, vacancy, from_attributes=True)
 
 
-@router.post("/get_vacancies", response_model=VacancySchema)
+@router.post("/create_vacancies", response_model=VacancyBulkResultSchema)
+async def create_vacancies(
+    bulk_data: VacancyBulkCreateSchema,
+    vacancy_service: VacancyService = Depends(get_vacancy_service),
+):
+    """Пакетное создание вакансий через бот с отчетом по каждой позиции"""
+    result = await vacancy_service.create_vacancies_bulk(bulk_data.items)
+    return schema_response(VACANCY_BULK_RESULT_ADAPTER, result)
+
+
+@router.post(
+    "/get_vacancies", response_model=VacancyPageSchema | VacancyCompactPageSchema
+)
 async def get_vacancies_by_user_id(
     user_id: int,
+    limit: int = Query(
+        app_config.default_page_size,
+        ge=1,
+        le=app_config.max_page_size,
+        description="Размер страницы",
+    ),
+    cursor: str | None = Query(None, description="Курсор следующей страницы"),
+    view: VacancyListView = Query(
+        VacancyListView.FULL,
+        description="compact - без длинных текстов, с началом описания",
+    ),
     vacancy_service: VacancyService = Depends(get_vacancy_service),
 ):
-    """Получение вакансий пользователя по id"""
-    return await vacancy_service.get_vacancies_by_user_id(user_id)
+    """Получение страницы вакансий пользователя по id"""
+    page = await vacancy_service.get_vacancies_by_user_id(
+        user_id, limit, cursor, view=view
+    )
+    return schema_response(VACANCY_PAGE_ADAPTERS[view], page)
@@ -3,8 +3,8 @@ import logging
 from fastapi import APIRouter, Depends, Request, Response
 
 from app.core.dependencies import get_auth_service, get_current_user
+from app.core.principal import CurrentUser
 from app.exceptions import TokenInvalidException
-from app.models import UserModel
 from app.schemas.auth import (
     AuthLoginSchema,
     AuthRegisterSchema,
@@ -70,7 +70,7 @@ async def logout(
 @router.put("/update_telegram")
 async def update_telegram_username(
     telegram_data: UpdateTelegramSchema,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service),
 ):
     """Обновление Telegram username"""
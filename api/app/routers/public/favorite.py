@@ -2,22 +2,36 @@ import logging
 
 from fastapi import APIRouter, Depends
 
-from app.core.dependencies import get_current_user, get_favorite_service
-from app.models import UserModel
-from app.schemas.favorite import FavoriteBaseSchema
+from app.core.dependencies import (
+    get_current_user,
+    get_favorite_service,
+    get_funnel_service,
+)
+from app.core.principal import CurrentUser
+from app.schemas.favorite import FavoriteBaseSchema, FunnelStatsSchema
 from app.services.favorite_service import FavoriteService
+from app.services.funnel_service import FunnelService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/favorite", tags=["favorite"])
 
 
+@router.get("/stats")
+async def get_funnel_stats(
+    funnel_service: FunnelService = Depends(get_funnel_service),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> FunnelStatsSchema:
+    """Количество вакансий текущего пользователя на каждом этапе"""
+    return await funnel_service.get_stats(current_user.id)
+
+
 @router.put("/{vacancy_id}")
 async def update_favorite(
     vacancy_id: int,
     favorite_data: FavoriteBaseSchema,
     favorite_service: FavoriteService = Depends(get_favorite_service),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ) -> FavoriteBaseSchema:
     """Обновляет заметки к вакансии"""
     return await favorite_service.update_favorite(
@@ -1,9 +1,17 @@
 import logging
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response
 
 from app.core.dependencies import get_stage_service
-from app.schemas.stage import StageCreateSchema, StageSchema, StageUpdateSchema
+from app.core.etag import conditional_response
+from app.core.responses import schema_response
+from app.schemas.stage import (
+    STAGE_ADAPTER,
+    STAGE_LIST_ADAPTER,
+    StageCreateSchema,
+    StageSchema,
+    StageUpdateSchema,
+)
 from app.services.stage_service import StageService
 
 router = APIRouter(prefix="/stage")
@@ -16,7 +24,8 @@ async def create_stage(
     stage_service: StageService = Depends(get_stage_service),
 ):
     """Создание нового этапа"""
-    return await stage_service.create_stage(stage_data)
+    stage = await stage_service.create_stage(stage_data)
+    return schema_response(STAGE_ADAPTER, stage, from_attributes=True)
 
 
 @router.get("/get_stage/{stage_id}", response_model=StageSchema)
@@ -25,16 +34,26 @@ async def get_stage(
     stage_service: StageService = Depends(get_stage_service),
 ):
     """Получение этапа по ID"""
-    return await stage_service.get_stage_by_id(stage_id)
+    stage = await stage_service.get_stage_by_id(stage_id)
+    return schema_response(STAGE_ADAPTER, stage, from_attributes=True)
 
 
 @router.get("/get_stages/{vacancy_id}", response_model=list[StageSchema])
 async def get_stages(
+    request: Request,
+    response: Response,
     vacancy_id: int = Path(..., description="ID вакансии"),
     stage_service: StageService = Depends(get_stage_service),
 ):
     """Получение этапов вакансии"""
-    return await stage_service.get_stages_by_vacancy_id(vacancy_id)
+    version = await stage_service.get_stages_version(vacancy_id)
+    if version is not None:
+        etag = stage_service.get_stages_etag(vacancy_id, version)
+        if not_modified := conditional_response(request, response, etag):
+            return not_modified
+
+    stages = await stage_service.get_stages_by_vacancy_id(vacancy_id, version)
+    return schema_response(STAGE_LIST_ADAPTER, stages, headers=response.headers)
 
 
 @router.put("/update_stage/{stage_id}", response_model=StageSchema)
@@ -44,7 +63,8 @@ async def update_stage(
     stage_service: StageService = Depends(get_stage_service),
 ):
     """Обновление этапа"""
-    return await stage_service.update_stage(stage_id, stage_data)
+    stage = await stage_service.update_stage(stage_id, stage_data)
+    return schema_response(STAGE_ADAPTER, stage, from_attributes=True)
 
 
 @router.delete("/delete_stage/{stage_id}")
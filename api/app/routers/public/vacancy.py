@@ -1,18 +1,41 @@
 import logging
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
+from app.config import app_config
 from app.core.dependencies import (
     get_current_user,
+    get_export_filters,
+    get_export_page,
     get_favorite_service,
+    get_vacancy_filters,
     get_vacancy_service,
 )
-from app.models import UserModel
+from app.core.etag import conditional_response
+from app.core.principal import CurrentUser
+from app.core.responses import schema_response
+from app.core.streaming import export_response
+from app.schemas.export import ExportFiltersSchema, ExportFormat, ExportPageSchema
 from app.schemas.vacancy import (
+    GET_VACANCY_ADAPTER,
+    VACANCY_ADAPTER,
+    VACANCY_FACETS_ADAPTER,
+    VACANCY_IMPORT_RESULT_ADAPTER,
+    VACANCY_PAGE_ADAPTERS,
+    VACANCY_SEARCH_PAGE_ADAPTER,
     GetVacancySchema,
     VacancyBaseSchema,
+    VacancyCompactPageSchema,
     VacancyCreateSchema,
+    VacancyExportSchema,
+    VacancyFacetsSchema,
+    VacancyFiltersSchema,
+    VacancyImportResultSchema,
+    VacancyListView,
+    VacancyPageSchema,
     VacancySchema,
+    VacancySearchPageSchema,
     VacancyUpdateSchema,
 )
 from app.services.favorite_service import FavoriteService
@@ -25,36 +48,146 @@ logger = logging.getLogger(__name__)
 @router.post("/create_vacancy", response_model=VacancySchema)
 async def create_vacancy(
     vacancy_data: VacancyBaseSchema,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     vacancy_service: VacancyService = Depends(get_vacancy_service),
 ):
     """Создание новой вакансии"""
     data = VacancyCreateSchema(user_id=current_user.id, **vacancy_data.model_dump())
-    return await vacancy_service.create_vacancy(data)
+    vacancy = await vacancy_service.create_vacancy(data)
+    return schema_response(VACANCY_ADAPTER, vacancy, from_attributes=True)
 
 
 @router.get("/get_vacancy/{vacancy_id}", response_model=GetVacancySchema)
 async def get_vacancy(
+    request: Request,
+    response: Response,
     vacancy_id: int = Path(..., description="ID вакансии"),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     vacancy_service: VacancyService = Depends(get_vacancy_service),
     favorite_service: FavoriteService = Depends(get_favorite_service),
 ):
     """Получение вакансии по ID"""
-    vacancy = await vacancy_service.get_vacancy_by_id(vacancy_id)
+    version = await vacancy_service.get_vacancy_version(vacancy_id, current_user.id)
+    if version is not None:
+        etag = vacancy_service.get_vacancy_etag(vacancy_id, current_user.id, version)
+        if not_modified := conditional_response(request, response, etag):
+            return not_modified
+
+    # Избранное читается отдельно, в кэше лежит только сама вакансия
+    updated_at = version[0] if version else None
+    vacancy = await vacancy_service.get_vacancy_by_id(vacancy_id, updated_at)
     favorite = await favorite_service.get_favorite(vacancy_id, current_user.id)
     vacancy.notes = favorite.notes
     vacancy.stage = favorite.stage
-    return vacancy
+    return schema_response(GET_VACANCY_ADAPTER, vacancy, headers=response.headers)
 
 
-@router.get("/get_vacancies", response_model=list[GetVacancySchema])
+@router.get(
+    "/get_vacancies", response_model=VacancyPageSchema | VacancyCompactPageSchema
+)
 async def get_vacancies(
-    current_user: UserModel = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    limit: int = Query(
+        app_config.default_page_size,
+        ge=1,
+        le=app_config.max_page_size,
+        description="Размер страницы",
+    ),
+    cursor: str | None = Query(None, description="Курсор следующей страницы"),
+    view: VacancyListView = Query(
+        VacancyListView.FULL,
+        description="compact - без длинных текстов, с началом описания",
+    ),
+    filters: VacancyFiltersSchema = Depends(get_vacancy_filters),
+    current_user: CurrentUser = Depends(get_current_user),
+    vacancy_service: VacancyService = Depends(get_vacancy_service),
+):
+    """Получение страницы вакансий текущего пользователя"""
+    version = await vacancy_service.get_vacancies_version(current_user.id)
+    etag = vacancy_service.get_vacancies_etag(
+        current_user.id, version, str(request.query_params)
+    )
+    if not_modified := conditional_response(request, response, etag):
+        return not_modified
+
+    page = await vacancy_service.get_vacancies_by_user_id(
+        current_user.id, limit, cursor, filters, view, version
+    )
+    return schema_response(VACANCY_PAGE_ADAPTERS[view], page, headers=response.headers)
+
+
+@router.get("/get_facets", response_model=VacancyFacetsSchema)
+async def get_facets(
+    filters: VacancyFiltersSchema = Depends(get_vacancy_filters),
+    current_user: CurrentUser = Depends(get_current_user),
+    vacancy_service: VacancyService = Depends(get_vacancy_service),
+):
+    """Количество вакансий текущего пользователя по значениям фильтров"""
+    facets = await vacancy_service.get_vacancy_facets(current_user.id, filters)
+    return schema_response(VACANCY_FACETS_ADAPTER, facets)
+
+
+@router.get("/search_vacancies", response_model=VacancySearchPageSchema)
+async def search_vacancies(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description='Поисковый запрос: слова, "фразы", OR и -исключения',
+    ),
+    limit: int = Query(
+        app_config.default_page_size,
+        ge=1,
+        le=app_config.max_page_size,
+        description="Размер страницы",
+    ),
+    cursor: str | None = Query(None, description="Курсор следующей страницы"),
+    highlight: bool = Query(True, description="Подсвечивать совпадения"),
+    current_user: CurrentUser = Depends(get_current_user),
+    vacancy_service: VacancyService = Depends(get_vacancy_service),
+):
+    """Полнотекстовый поиск по вакансиям и заметкам текущего пользователя"""
+    page = await vacancy_service.search_vacancies(
+        current_user.id, q, limit, cursor, highlight
+    )
+    return schema_response(VACANCY_SEARCH_PAGE_ADAPTER, page)
+
+
+@router.get("/export_vacancies", response_class=StreamingResponse)
+async def export_vacancies(
+    page: ExportPageSchema = Depends(get_export_page),
+    filters: ExportFiltersSchema = Depends(get_export_filters),
+    current_user: CurrentUser = Depends(get_current_user),
     vacancy_service: VacancyService = Depends(get_vacancy_service),
 ):
-    """Получение вакансий текущего пользователя"""
-    return await vacancy_service.get_vacancies_by_user_id(current_user.id)
+    """Выгрузка вакансий текущего пользователя с этапом, заметками и этапами"""
+    rows, next_cursor = await vacancy_service.export_vacancies(
+        current_user.id, filters, page
+    )
+    return export_response(
+        rows, VacancyExportSchema, page.format, next_cursor, filename="vacancies"
+    )
+
+
+@router.post("/import_vacancies", response_model=VacancyImportResultSchema)
+async def import_vacancies(
+    request: Request,
+    import_format: ExportFormat = Query(
+        ExportFormat.NDJSON, alias="format", description="Формат файла в теле запроса"
+    ),
+    current_user: CurrentUser = Depends(get_current_user),
+    vacancy_service: VacancyService = Depends(get_vacancy_service),
+):
+    """Импорт вакансий текущего пользователя из NDJSON или CSV в теле запроса
+
+    Колонки совпадают с полями создания вакансии, stage и notes попадают
+    в избранное. В ответе - количество загруженных записей и ошибки по номерам.
+    """
+    result = await vacancy_service.import_vacancies(
+        current_user.id, request.stream(), import_format
+    )
+    return schema_response(VACANCY_IMPORT_RESULT_ADAPTER, result)
 
 
 @router.put("/update_vacancy/{vacancy_id}", response_model=VacancySchema)
@@ -64,7 +197,8 @@ async def update_vacancy(
     vacancy_service: VacancyService = Depends(get_vacancy_service),
 ):
     """Обновление вакансии"""
-    return await vacancy_service.update_vacancy(vacancy_id, vacancy_data)
+    vacancy = await vacancy_service.update_vacancy(vacancy_id, vacancy_data)
+    return schema_response(VACANCY_ADAPTER, vacancy, from_attributes=True)
 
 
 @router.delete("/delete_vacancy/{vacancy_id}")
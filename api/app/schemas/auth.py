@@ -1,7 +1,7 @@
 import re
 from datetime import datetime
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 
 class AuthRegisterSchema(BaseModel):
@@ -66,6 +66,16 @@ class UpdateTelegramSchema(BaseModel):
     telegram_username: str = Field(..., min_length=1, max_length=50)
 
 
+class TelegramChangesSchema(BaseModel):
+    user_ids: list[int] = Field(
+        default_factory=list, description="Измененные и удаленные пользователи"
+    )
+    usernames: list[str] = Field(
+        default_factory=list, description="Текущие Telegram username этих пользователей"
+    )
+    until: datetime = Field(..., description="Момент, до которого собраны изменения")
+
+
 class UserInfoSchema(BaseModel):
     id: int
     username: str
@@ -74,3 +84,8 @@ class UserInfoSchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Адаптеры для сериализации ответов без повторной валидации
+USER_INFO_ADAPTER = TypeAdapter(UserInfoSchema)
+TELEGRAM_CHANGES_ADAPTER = TypeAdapter(TelegramChangesSchema)
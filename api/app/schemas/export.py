@@ -0,0 +1,23 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ExportFormat(Enum):
+    NDJSON = "ndjson"  # Объект JSON на строку
+    CSV = "csv"  # Строка заголовков, затем значения
+
+
+class ExportPageSchema(BaseModel):
+    format: ExportFormat = ExportFormat.NDJSON
+    limit: int | None = None  # None - до конца выборки
+    cursor: str | None = None  # Продолжение после предыдущей выгрузки
+
+
+class ExportFiltersSchema(BaseModel):
+    # Незаданные фильтры не применяются
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    user_id: int | None = None
+    vacancy_id: int | None = None
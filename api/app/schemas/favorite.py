@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class FavoriteStage(Enum):
@@ -39,3 +39,27 @@ class FavoriteSchema(FavoriteBaseSchema):
     vacancy_id: int
     created_at: datetime
     updated_at: datetime
+
+
+class FunnelStatsSchema(BaseModel):
+    stages: dict[FavoriteStage, int] = Field(
+        ..., description="Количество вакансий на каждом этапе"
+    )
+    total: int
+
+
+class FunnelDriftSchema(BaseModel):
+    user_id: int
+    stage: FavoriteStage
+    stored: int = Field(..., description="Значение счетчика до пересчета")
+    actual: int = Field(..., description="Фактическое количество записей")
+
+
+class FunnelReconcileReportSchema(BaseModel):
+    users_checked: int
+    drifted_users: int
+    drift: list[FunnelDriftSchema]
+
+
+# Адаптеры для сериализации ответов без повторной валидации
+FUNNEL_RECONCILE_REPORT_ADAPTER = TypeAdapter(FunnelReconcileReportSchema)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class StageTypes(Enum):
@@ -63,3 +63,8 @@ class GetStageSchema(BaseModel):
     description: str | None = None
     created_at: datetime
     updated_at: datetime
+
+
+# Адаптеры для сериализации ответов без повторной валидации
+STAGE_ADAPTER = TypeAdapter(StageSchema)
+STAGE_LIST_ADAPTER = TypeAdapter(list[StageSchema])
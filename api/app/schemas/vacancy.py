@@ -1,9 +1,16 @@
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 from app.schemas.favorite import FavoriteStage
+from app.schemas.stage import StageTypes
+
+
+class VacancyListView(Enum):
+    FULL = "full"  # Все поля вакансии и заметки
+    COMPACT = "compact"  # Поля карточки и начало описания
 
 
 class VacancyStatus(Enum):
@@ -61,6 +68,48 @@ class VacancyCreateSchema(VacancyBaseSchema):
         return v
 
 
+class VacancyBulkCreateSchema(BaseModel):
+    # Элементы валидируются по одному, чтобы ошибка в одном не отклоняла весь пакет
+    items: list[dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Вакансии в формате VacancyCreateSchema",
+    )
+
+
+class VacancyBulkItemResultSchema(BaseModel):
+    index: int = Field(..., description="Позиция вакансии в запросе")
+    success: bool
+    id: int | None = None
+    error: str | None = None
+
+
+class VacancyBulkResultSchema(BaseModel):
+    created: int
+    failed: int
+    items: list[VacancyBulkItemResultSchema]
+
+
+class VacancyImportRowSchema(VacancyBaseSchema):
+    # Этап и заметки попадают в избранное автора
+    stage: FavoriteStage | None = Field(None, description="Этап в избранном")
+    notes: str | None = Field(None, description="Заметки к вакансии")
+
+
+class VacancyImportErrorSchema(BaseModel):
+    row: int = Field(..., description="Номер записи в файле, с единицы")
+    error: str
+
+
+class VacancyImportResultSchema(BaseModel):
+    imported: int
+    failed: int
+    errors: list[VacancyImportErrorSchema] = Field(
+        ..., description="Ошибки по записям, не больше import_max_errors"
+    )
+
+
 class VacancyUpdateSchema(VacancyBaseSchema):
     pass
 
@@ -85,3 +134,105 @@ class GetVacancySchema(VacancyBaseSchema):
 
     class Config:
         from_attributes = True
+
+
+class VacancyFiltersSchema(BaseModel):
+    # Внутри измерения значения объединяются через OR, между измерениями - AND
+    stage: list[FavoriteStage] | None = None
+    status: list[VacancyStatus] | None = None
+    company_name: list[str] | None = None
+    location: list[str] | None = None
+    employment: list[str] | None = None
+
+
+class FacetValueSchema(BaseModel):
+    value: str | None = Field(..., description="Значение, null - не указано")
+    count: int
+
+
+class VacancyFacetsSchema(BaseModel):
+    # Счетчики измерения учитывают фильтры по всем остальным измерениям
+    stage: list[FacetValueSchema]
+    status: list[FacetValueSchema]
+    company_name: list[FacetValueSchema]
+    location: list[FacetValueSchema]
+    employment: list[FacetValueSchema]
+
+
+class VacancyPageSchema(BaseModel):
+    items: list[GetVacancySchema]
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы")
+
+
+class VacancyCompactSchema(BaseModel):
+    id: int
+    user_id: int
+    name: str
+    status: VacancyStatus
+    company_name: str | None = None
+    salary: str | None = None
+    experience: str | None = None
+    location: str | None = None
+    employment: str | None = None
+    description_snippet: str | None = Field(
+        None, description="Начало описания без переносов строк"
+    )
+    stage: FavoriteStage = FavoriteStage.NOTHING
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class VacancyCompactPageSchema(BaseModel):
+    items: list[VacancyCompactSchema]
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы")
+
+
+class VacancySearchItemSchema(GetVacancySchema):
+    rank: float = Field(..., description="Релевантность запросу")
+    name_highlight: str | None = Field(
+        None, description="Название с совпадениями в <mark>, HTML экранирован"
+    )
+    description_highlight: str | None = Field(
+        None, description="Фрагменты описания с совпадениями в <mark>, HTML экранирован"
+    )
+
+
+class VacancySearchPageSchema(BaseModel):
+    items: list[VacancySearchItemSchema]
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы")
+
+
+class VacancyExportStageSchema(BaseModel):
+    id: int
+    stage_type: StageTypes | None = None
+    title: str | None = None
+    description: str | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class VacancyExportSchema(GetVacancySchema):
+    # В CSV хронология занимает одну ячейку в виде JSON-массива
+    stages: list[VacancyExportStageSchema] = Field(
+        default_factory=list, description="Этапы в порядке прохождения"
+    )
+
+
+# Адаптеры для сериализации ответов без повторной валидации
+VACANCY_ADAPTER = TypeAdapter(VacancySchema)
+GET_VACANCY_ADAPTER = TypeAdapter(GetVacancySchema)
+VACANCY_PAGE_ADAPTER = TypeAdapter(VacancyPageSchema)
+VACANCY_COMPACT_PAGE_ADAPTER = TypeAdapter(VacancyCompactPageSchema)
+VACANCY_PAGE_ADAPTERS = {
+    VacancyListView.FULL: VACANCY_PAGE_ADAPTER,
+    VacancyListView.COMPACT: VACANCY_COMPACT_PAGE_ADAPTER,
+}
+VACANCY_SEARCH_PAGE_ADAPTER = TypeAdapter(VacancySearchPageSchema)
+VACANCY_FACETS_ADAPTER = TypeAdapter(VacancyFacetsSchema)
+VACANCY_BULK_RESULT_ADAPTER = TypeAdapter(VacancyBulkResultSchema)
+VACANCY_IMPORT_RESULT_ADAPTER = TypeAdapter(VacancyImportResultSchema)
@@ -1,10 +1,14 @@
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.streaming import keyset_export
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.stage_repository import StageRepository
 from app.repositories.vacancy_repository import VacancyRepository
-from app.schemas.admin import TokenResponse, UserResponse, VacancyResponse
+from app.schemas.export import ExportFiltersSchema, ExportPageSchema
 
 logger = logging.getLogger(__name__)
 
@@ -15,56 +19,69 @@ class AdminService:
         auth_repo: AuthRepository,
         vacancy_repo: VacancyRepository,
         stage_repo: StageRepository,
+        session_factory: async_sessionmaker[AsyncSession],
     ):
         self.auth_repo = auth_repo
         self.vacancy_repo = vacancy_repo
         self.stage_repo = stage_repo
+        self.session_factory = session_factory
 
-    async def get_all_users(self) -> list[UserResponse]:
-        """Получает всех пользователей"""
-        users = await self.auth_repo.get_all_users()
-        return [
-            UserResponse(
-                id=user.id,
-                username=user.username,
-                telegram_username=user.telegram_username,
-                created_at=user.created_at,
-            )
-            for user in users
-        ]
+    async def export_users(
+        self, filters: ExportFiltersSchema, page: ExportPageSchema
+    ) -> tuple[AsyncIterator[Any], str | None]:
+        """Выгрузка пользователей и курсор продолжения"""
+        return await keyset_export(
+            page,
+            lambda after_id, limit: self.auth_repo.get_users_export_end(
+                filters, after_id, limit
+            ),
+            lambda db, after_id, until_id: AuthRepository(db).stream_users(
+                filters, after_id, until_id
+            ),
+            self.session_factory,
+        )
 
-    async def get_all_vacancies(self) -> list[VacancyResponse]:
-        """Получает все вакансии"""
-        vacancies = await self.vacancy_repo.get_all()
-        return [
-            VacancyResponse(
-                id=vacancy.id,
-                name=vacancy.name,
-                description=vacancy.description,
-                link=vacancy.link,
-                contact_link=vacancy.contact_link,
-                company_name=vacancy.company_name,
-                user_id=vacancy.user_id,
-                created_at=vacancy.created_at,
-            )
-            for vacancy in vacancies
-        ]
+    async def export_vacancies(
+        self, filters: ExportFiltersSchema, page: ExportPageSchema
+    ) -> tuple[AsyncIterator[Any], str | None]:
+        """Выгрузка вакансий и курсор продолжения"""
+        return await keyset_export(
+            page,
+            lambda after_id, limit: self.vacancy_repo.get_export_end(
+                filters, after_id, limit
+            ),
+            lambda db, after_id, until_id: VacancyRepository(db).stream(
+                filters, after_id, until_id
+            ),
+            self.session_factory,
+        )
 
-    async def get_all_stages(self) -> Any:
-        """Получает все этапы"""
-        stages = await self.stage_repo.get_all()
-        return stages
+    async def export_stages(
+        self, filters: ExportFiltersSchema, page: ExportPageSchema
+    ) -> tuple[AsyncIterator[Any], str | None]:
+        """Выгрузка этапов и курсор продолжения"""
+        return await keyset_export(
+            page,
+            lambda after_id, limit: self.stage_repo.get_export_end(
+                filters, after_id, limit
+            ),
+            lambda db, after_id, until_id: StageRepository(db).stream(
+                filters, after_id, until_id
+            ),
+            self.session_factory,
+        )
 
-    async def get_all_tokens(self) -> list[TokenResponse]:
-        """Получает все refresh токены"""
-        tokens = await self.auth_repo.get_all_refresh_tokens()
-        return [
-            TokenResponse(
-                id=token.id,
-                token_hash=token.token_hash,
-                user_id=token.user_id,
-                expires_at=token.expires_at,
-                created_at=token.created_at,
-            )
-            for token in tokens
-        ]
+    async def export_tokens(
+        self, filters: ExportFiltersSchema, page: ExportPageSchema
+    ) -> tuple[AsyncIterator[Any], str | None]:
+        """Выгрузка refresh токенов и курсор продолжения"""
+        return await keyset_export(
+            page,
+            lambda after_id, limit: self.auth_repo.get_tokens_export_end(
+                filters, after_id, limit
+            ),
+            lambda db, after_id, until_id: AuthRepository(db).stream_tokens(
+                filters, after_id, until_id
+            ),
+            self.session_factory,
+        )
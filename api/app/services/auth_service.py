@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 
 from fastapi import Response
 
@@ -10,15 +11,18 @@ from app.core.security import (
 )
 from app.exceptions import (
     InvalidCredentialsException,
-    TelegramUsernameAlreadyExistsException,
     TokenExpiredException,
     TokenInvalidException,
-    UserAlreadyExistsException,
     UserNotFoundException,
 )
 from app.models import UserModel
 from app.repositories.auth_repository import AuthRepository
-from app.schemas.auth import AuthLoginSchema, AuthRegisterSchema, AuthResponseSchema
+from app.schemas.auth import (
+    AuthLoginSchema,
+    AuthRegisterSchema,
+    AuthResponseSchema,
+    TelegramChangesSchema,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,12 +35,7 @@ class AuthService:
         self, user_data: AuthRegisterSchema
     ) -> tuple[AuthResponseSchema, str]:
         """Регистрация нового пользователя"""
-        # Проверяем, существует ли пользователь с таким username
-        existing_user = await self.auth_repo.get_by_username(user_data.username)
-        if existing_user:
-            raise UserAlreadyExistsException()
-
-        # Создаем нового пользователя через репозиторий
+        # Занятый username отклоняет уникальное ограничение при вставке
         db_user = await self.auth_repo.create(
             username=user_data.username,
             password=user_data.password,
@@ -87,8 +86,8 @@ class AuthService:
         if not user:
             raise UserNotFoundException()
 
-        # Проверяем, существует ли токен в БД через репозиторий
-        db_token = await self.auth_repo.get_valid_refresh_token(user_id)
+        # Проверяем, существует ли именно этот токен в БД
+        db_token = await self.auth_repo.get_valid_refresh_token(user_id, refresh_token)
         if not db_token:
             raise TokenExpiredException()
 
@@ -114,22 +113,18 @@ class AuthService:
             if payload:
                 user_id = payload.get("user_id")
                 if user_id:
-                    # Удаляем токен из БД через репозиторий
-                    await self.auth_repo.delete_refresh_token(user_id)
+                    # Удаляем именно этот токен из БД
+                    await self.auth_repo.delete_refresh_token(user_id, refresh_token)
 
     async def update_telegram_username(
         self, user_id: int, telegram_username: str
     ) -> AuthResponseSchema:
         """Обновление Telegram username"""
-        # Проверяем, не занят ли telegram_username другим пользователем
-        existing_user = await self.auth_repo.get_by_telegram_username(telegram_username)
-        if existing_user and existing_user.id != user_id:
-            raise TelegramUsernameAlreadyExistsException()
-
-        await self.auth_repo.update_telegram_username(user_id, telegram_username)
-
-        # Получаем обновленные данные пользователя
-        updated_user = await self.auth_repo.get_by_id(user_id)
+        # Занятость username проверяет уникальное ограничение, обновленные
+        # данные пользователя возвращаются тем же запросом
+        updated_user = await self.auth_repo.update_telegram_username(
+            user_id, telegram_username
+        )
         if not updated_user:
             raise UserNotFoundException()
 
@@ -147,6 +142,14 @@ class AuthService:
         logger.info(f"Обновлен Telegram username для пользователя {user_id}")
         return AuthResponseSchema(access_token=access_token)
 
+    async def get_telegram_changes(self, since: datetime) -> TelegramChangesSchema:
+        """Возвращает пользователей, привязка которых могла измениться после since"""
+        until = datetime.utcnow()
+        user_ids, usernames = await self.auth_repo.get_telegram_changes_since(since)
+        return TelegramChangesSchema(
+            user_ids=user_ids, usernames=usernames, until=until
+        )
+
     @staticmethod
     def _create_tokens(user: UserModel) -> tuple[str, str]:
         """Создает access и refresh токены для пользователя"""
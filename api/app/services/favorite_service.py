@@ -1,5 +1,6 @@
 import logging
 
+from app.core.response_cache import ResponseCacheBackend, user_namespace
 from app.repositories.favorite_repository import FavoriteRepository
 from app.schemas.favorite import FavoriteBaseSchema
 
@@ -7,8 +8,11 @@ logger = logging.getLogger(__name__)
 
 
 class FavoriteService:
-    def __init__(self, favorite_repository: FavoriteRepository):
+    def __init__(
+        self, favorite_repository: FavoriteRepository, cache: ResponseCacheBackend
+    ):
         self.favorite_repository = favorite_repository
+        self.cache = cache
 
     async def get_favorite(self, vacancy_id: int, user_id: int) -> FavoriteBaseSchema:
         """Возвращает заметки к вакансии"""
@@ -26,4 +30,6 @@ class FavoriteService:
         favorite = await self.favorite_repository.create_or_update(
             vacancy_id, user_id, favorite_data
         )
+        # Этап и заметки входят в список вакансий пользователя
+        await self.cache.invalidate(user_namespace(user_id))
         return FavoriteBaseSchema.model_validate(favorite)
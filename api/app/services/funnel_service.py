@@ -0,0 +1,54 @@
+import logging
+
+from app.config import app_config
+from app.repositories.funnel_repository import FunnelRepository
+from app.schemas.favorite import (
+    FavoriteStage,
+    FunnelDriftSchema,
+    FunnelReconcileReportSchema,
+    FunnelStatsSchema,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FunnelService:
+    def __init__(self, funnel_repo: FunnelRepository):
+        self.funnel_repo = funnel_repo
+
+    async def get_stats(self, user_id: int) -> FunnelStatsSchema:
+        """Возвращает количество вакансий пользователя на каждом этапе"""
+        counters = await self.funnel_repo.get_by_user_id(user_id)
+        stages = {stage: max(counters.get(stage, 0), 0) for stage in FavoriteStage}
+        return FunnelStatsSchema(stages=stages, total=sum(stages.values()))
+
+    async def reconcile(
+        self, batch_size: int = app_config.funnel_reconcile_batch_size
+    ) -> FunnelReconcileReportSchema:
+        """Пересчитывает счетчики пачками и сообщает о найденных расхождениях"""
+        drift: list[FunnelDriftSchema] = []
+        users_checked = 0
+        last_user_id = 0
+        while True:
+            batch_drift, user_ids = await self.funnel_repo.reconcile_batch(
+                last_user_id, batch_size
+            )
+            if not user_ids:
+                break
+            drift += batch_drift
+            users_checked += len(user_ids)
+            last_user_id = user_ids[-1]
+
+        for item in drift:
+            logger.warning(
+                f"Расхождение счетчика воронки: пользователь {item.user_id}, "
+                f"этап {item.stage.name}, было {item.stored}, стало {item.actual}"
+            )
+        drifted_users = len({item.user_id for item in drift})
+        logger.info(
+            f"Пересчет воронки: проверено {users_checked} пользователей, "
+            f"исправлено {drifted_users}"
+        )
+        return FunnelReconcileReportSchema(
+            users_checked=users_checked, drifted_users=drifted_users, drift=drift
+        )
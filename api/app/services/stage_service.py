@@ -1,5 +1,8 @@
 import logging
+from datetime import datetime
 
+from app.core.etag import build_etag
+from app.core.response_cache import ResponseCacheBackend, vacancy_namespace
 from app.exceptions import StageNotFoundException, VacancyNotFoundException
 from app.repositories.stage_repository import StageRepository
 from app.repositories.vacancy_repository import VacancyRepository
@@ -9,18 +12,21 @@ logger = logging.getLogger(__name__)
 
 
 class StageService:
-    def __init__(self, stage_repo: StageRepository, vacancy_repo: VacancyRepository):
+    def __init__(
+        self,
+        stage_repo: StageRepository,
+        vacancy_repo: VacancyRepository,
+        cache: ResponseCacheBackend,
+    ):
         self.stage_repo = stage_repo
         self.vacancy_repo = vacancy_repo
+        self.cache = cache
 
     async def create_stage(self, stage_data: StageCreateSchema) -> StageSchema:
         """Создает новый этап"""
-        # Проверяем, существует ли вакансия
-        vacancy = await self.vacancy_repo.get_by_id(stage_data.vacancy_id)
-        if not vacancy:
-            raise VacancyNotFoundException()
-
+        # Несуществующую вакансию отклоняет внешний ключ при вставке
         stage = await self.stage_repo.create(stage_data)
+        await self.cache.invalidate(vacancy_namespace(stage_data.vacancy_id))
         logger.info(f"Создан этап {stage.id} для вакансии {stage_data.vacancy_id}")
         return stage
 
@@ -33,8 +39,23 @@ class StageService:
         logger.info(f"Получен этап {stage_id}")
         return stage
 
-    async def get_stages_by_vacancy_id(self, vacancy_id: int) -> list[StageSchema]:
-        """Получает этапы вакансии"""
+    async def get_stages_by_vacancy_id(
+        self, vacancy_id: int, version: tuple[int, int | None, datetime | None] | None
+    ) -> list[StageSchema]:
+        """Получает этапы вакансии
+
+        version - версия этапов, по которой построен ETag. Она входит в ключ
+        кэша, чтобы тело ответа не отставало от ETag до сброса кэша.
+        """
+        stages = await self.cache.get_or_load(
+            vacancy_namespace(vacancy_id),
+            f"stages:{version}",
+            lambda: self._load_stages(vacancy_id),
+        )
+        return list(stages)
+
+    async def _load_stages(self, vacancy_id: int) -> list[StageSchema]:
+        """Загружает этапы вакансии из БД"""
         # Проверяем, существует ли вакансия
         vacancy = await self.vacancy_repo.get_by_id(vacancy_id)
         if not vacancy:
@@ -42,25 +63,38 @@ class StageService:
 
         stages = await self.stage_repo.get_by_vacancy_id(vacancy_id)
         logger.info(f"Получено {len(stages)} этапов для вакансии {vacancy_id}")
-        return stages
+        return [StageSchema.model_validate(stage) for stage in stages]
+
+    async def get_stages_version(
+        self, vacancy_id: int
+    ) -> tuple[int, int | None, datetime | None] | None:
+        """Версия этапов вакансии для ETag, None - если вакансии нет"""
+        return await self.stage_repo.get_list_version(vacancy_id)
+
+    @staticmethod
+    def get_stages_etag(
+        vacancy_id: int, version: tuple[int, int | None, datetime | None]
+    ) -> str:
+        """ETag списка этапов вакансии"""
+        return build_etag("stages", vacancy_id, *version)
 
     async def update_stage(
         self, stage_id: int, stage_data: StageUpdateSchema
     ) -> StageSchema:
         """Обновляет этап"""
-        stage = await self.stage_repo.get_by_id(stage_id)
-        if not stage:
+        updated_stage = await self.stage_repo.update(stage_id, stage_data)
+        if not updated_stage:
             raise StageNotFoundException()
 
-        updated_stage = await self.stage_repo.update(stage_id, stage_data)
+        await self.cache.invalidate(vacancy_namespace(updated_stage.vacancy_id))
         logger.info(f"Обновлен этап {stage_id}")
         return updated_stage
 
     async def delete_stage(self, stage_id: int) -> None:
         """Удаляет этап"""
-        stage = await self.stage_repo.get_by_id(stage_id)
-        if not stage:
+        vacancy_id = await self.stage_repo.delete(stage_id)
+        if vacancy_id is None:
             raise StageNotFoundException()
 
-        await self.stage_repo.delete(stage_id)
+        await self.cache.invalidate(vacancy_namespace(vacancy_id))
         logger.info(f"Удален этап {stage_id}")
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.metrics import metrics
+from app.repositories.auth_repository import AuthRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TokenSweepService:
+    """Фоновая очистка таблицы refresh токенов
+
+    Каждый проход удаляет истекшие токены, затем токены сверх лимита на
+    пользователя, затем записи об удалении пользователей старше
+    deletion_retention_hours. Удаление идет пачками, у каждой пачки своя
+    короткая транзакция. Одновременно проход выполняет только один воркер,
+    остальные его пропускают.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_seconds: int,
+        batch_size: int,
+        max_tokens_per_user: int,
+        deletion_retention_hours: int = 24,
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_tokens_per_user = max_tokens_per_user
+        self.deletion_retention = timedelta(hours=deletion_retention_hours)
+
+    async def run(self) -> None:
+        """Запускает проходы по расписанию до отмены задачи
+
+        Первый проход - через интервал после старта, чтобы перезапуск всех
+        воркеров разом не нагружал БД.
+        """
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sweep()
+            except Exception:
+                metrics.increment("token_sweep.errors")
+                logger.exception("Ошибка очистки refresh токенов")
+
+    async def sweep(self) -> dict[str, int] | None:
+        """Один проход очистки
+
+        Возвращает количество удаленных токенов по причинам, None - если
+        проход уже выполняет другой воркер.
+        """
+        started = time.perf_counter()
+        removed = {}
+        for reason, delete_batch in (
+            ("expired", self._delete_expired_batch),
+            ("excess", self._delete_excess_batch),
+            ("deletions", self._delete_user_deletions_batch),
+        ):
+            removed[reason] = 0
+            while True:
+                deleted = await delete_batch()
+                if deleted is None:
+                    metrics.increment("token_sweep.skipped_locked")
+                    return None
+                removed[reason] += deleted
+                if deleted < self.batch_size:
+                    break
+
+        elapsed = time.perf_counter() - started
+        metrics.increment("token_sweep.runs")
+        metrics.increment("token_sweep.expired_deleted", removed["expired"])
+        metrics.increment("token_sweep.excess_deleted", removed["excess"])
+        metrics.increment("token_sweep.deletions_deleted", removed["deletions"])
+        metrics.increment("token_sweep.seconds", elapsed)
+        metrics.set("token_sweep.last_run_seconds", elapsed)
+        logger.info(
+            f"Очистка refresh токенов: удалено {removed['expired']} истекших, "
+            f"{removed['excess']} сверх лимита и {removed['deletions']} записей "
+            f"об удалении пользователей за {elapsed:.2f} с"
+        )
+        return removed
+
+    async def _delete_expired_batch(self) -> int | None:
+        async with self.session_factory() as db:
+            return await AuthRepository(db).delete_expired_tokens(self.batch_size)
+
+    async def _delete_excess_batch(self) -> int | None:
+        async with self.session_factory() as db:
+            return await AuthRepository(db).delete_excess_tokens(
+                self.max_tokens_per_user, self.batch_size
+            )
+
+    async def _delete_user_deletions_batch(self) -> int | None:
+        before = datetime.utcnow() - self.deletion_retention
+        async with self.session_factory() as db:
+            return await AuthRepository(db).delete_user_deletions_before(
+                before, self.batch_size
+            )
@@ -1,12 +1,39 @@
 import logging
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+from typing import Any
 
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import app_config
+from app.core.etag import build_etag
+from app.core.importing import iter_records
+from app.core.response_cache import (
+    ResponseCacheBackend,
+    user_namespace,
+    vacancy_namespace,
+)
+from app.core.streaming import keyset_export
 from app.exceptions import UserNotFoundException, VacancyNotFoundException
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.vacancy_repository import VacancyRepository
+from app.schemas.export import ExportFiltersSchema, ExportFormat, ExportPageSchema
 from app.schemas.vacancy import (
     GetVacancySchema,
+    VacancyBulkItemResultSchema,
+    VacancyBulkResultSchema,
+    VacancyCompactPageSchema,
     VacancyCreateSchema,
+    VacancyFacetsSchema,
+    VacancyFiltersSchema,
+    VacancyImportErrorSchema,
+    VacancyImportResultSchema,
+    VacancyImportRowSchema,
+    VacancyListView,
+    VacancyPageSchema,
     VacancySchema,
+    VacancySearchPageSchema,
     VacancyUpdateSchema,
 )
 
@@ -14,25 +41,136 @@ logger = logging.getLogger(__name__)
 
 
 class VacancyService:
-    def __init__(self, vacancy_repo: VacancyRepository, auth_repo: AuthRepository):
+    def __init__(
+        self,
+        vacancy_repo: VacancyRepository,
+        auth_repo: AuthRepository,
+        cache: ResponseCacheBackend,
+        session_factory: async_sessionmaker[AsyncSession],
+    ):
         self.vacancy_repo = vacancy_repo
         self.auth_repo = auth_repo
+        self.cache = cache
+        self.session_factory = session_factory
 
     async def create_vacancy(self, vacancy_data: VacancyCreateSchema) -> VacancySchema:
         """Создает новую вакансию"""
-        # Проверяем, существует ли пользователь
-        user = await self.auth_repo.get_by_id(vacancy_data.user_id)
-        if not user:
-            raise UserNotFoundException()
-
+        # Несуществующего пользователя отклоняет внешний ключ при вставке
         vacancy = await self.vacancy_repo.create(vacancy_data)
+        await self.cache.invalidate(user_namespace(vacancy_data.user_id))
         logger.info(
             f"Создана вакансия {vacancy.id} для пользователя {vacancy_data.user_id}"
         )
         return vacancy
 
-    async def get_vacancy_by_id(self, vacancy_id: int) -> GetVacancySchema:
-        """Получает вакансию по ID"""
+    async def create_vacancies_bulk(
+        self, items: list[dict[str, Any]]
+    ) -> VacancyBulkResultSchema:
+        """Создает пакет вакансий с отчетом по каждой позиции"""
+        results: list[VacancyBulkItemResultSchema | None] = [None] * len(items)
+        valid: list[tuple[int, VacancyCreateSchema]] = []
+
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, VacancyCreateSchema.model_validate(item)))
+            except ValidationError as e:
+                results[index] = VacancyBulkItemResultSchema(
+                    index=index, success=False, error=_validation_error_message(e)
+                )
+
+        # Каждого пользователя проверяем один раз на весь пакет
+        user_ids = {vacancy_data.user_id for _, vacancy_data in valid}
+        existing_user_ids = (
+            await self.auth_repo.get_existing_user_ids(user_ids) if user_ids else set()
+        )
+
+        to_create: list[tuple[int, VacancyCreateSchema]] = []
+        for index, vacancy_data in valid:
+            if vacancy_data.user_id in existing_user_ids:
+                to_create.append((index, vacancy_data))
+            else:
+                results[index] = VacancyBulkItemResultSchema(
+                    index=index, success=False, error=UserNotFoundException.detail
+                )
+
+        if to_create:
+            vacancy_ids = await self.vacancy_repo.create_many(
+                [vacancy_data for _, vacancy_data in to_create]
+            )
+            for (index, _), vacancy_id in zip(to_create, vacancy_ids):
+                results[index] = VacancyBulkItemResultSchema(
+                    index=index, success=True, id=vacancy_id
+                )
+            await self.cache.invalidate(
+                *{user_namespace(vacancy_data.user_id) for _, vacancy_data in to_create}
+            )
+
+        logger.info(f"Пакетно создано {len(to_create)} из {len(items)} вакансий")
+        return VacancyBulkResultSchema(
+            created=len(to_create),
+            failed=len(items) - len(to_create),
+            items=results,
+        )
+
+    async def import_vacancies(
+        self, user_id: int, chunks: AsyncIterable[bytes], import_format: ExportFormat
+    ) -> VacancyImportResultSchema:
+        """Импортирует вакансии пользователя из файла с отчетом по ошибочным записям
+
+        Файл читается потоком, записи валидируются и копируются в БД пачками,
+        поэтому память не растет с размером файла. Ошибочные записи пропускаются.
+        """
+        errors: list[VacancyImportErrorSchema] = []
+        failed = 0
+
+        async def valid_batches() -> AsyncIterator[list[VacancyImportRowSchema]]:
+            nonlocal failed
+            batch = []
+            async for row, data, error in iter_records(chunks, import_format):
+                if error is None:
+                    try:
+                        batch.append(VacancyImportRowSchema.model_validate(data))
+                    except ValidationError as e:
+                        error = _validation_error_message(e)
+                if error is not None:
+                    failed += 1
+                    if len(errors) < app_config.import_max_errors:
+                        errors.append(VacancyImportErrorSchema(row=row, error=error))
+                if len(batch) >= app_config.import_batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        imported = await self.vacancy_repo.import_many(user_id, valid_batches())
+        if imported:
+            await self.cache.invalidate(user_namespace(user_id))
+        logger.info(
+            f"Импортировано {imported} вакансий пользователя {user_id}, "
+            f"с ошибками {failed}"
+        )
+        return VacancyImportResultSchema(
+            imported=imported, failed=failed, errors=errors
+        )
+
+    async def get_vacancy_by_id(
+        self, vacancy_id: int, updated_at: datetime | None
+    ) -> GetVacancySchema:
+        """Получает вакансию по ID
+
+        updated_at - время изменения вакансии, по которому построен ETag.
+        Оно входит в ключ кэша, как версия в get_vacancies_by_user_id.
+        """
+        vacancy = await self.cache.get_or_load(
+            vacancy_namespace(vacancy_id),
+            f"vacancy:{updated_at}",
+            lambda: self._load_vacancy(vacancy_id),
+        )
+        # Вызывающий дополняет вакансию заметками, кеш не должен это видеть
+        return vacancy.model_copy()
+
+    async def _load_vacancy(self, vacancy_id: int) -> GetVacancySchema:
+        """Загружает вакансию из БД"""
         vacancy = await self.vacancy_repo.get_by_id(vacancy_id)
         if not vacancy:
             raise VacancyNotFoundException()
@@ -40,29 +178,139 @@ class VacancyService:
         logger.info(f"Получена вакансия {vacancy_id}")
         return GetVacancySchema.model_validate(vacancy)
 
-    async def get_vacancies_by_user_id(self, user_id: int) -> list[GetVacancySchema]:
-        """Получает вакансии пользователя по username"""
-        vacancies = await self.vacancy_repo.get_all_by_user_id(user_id)
+    async def get_vacancies_by_user_id(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        filters: VacancyFiltersSchema | None = None,
+        view: VacancyListView = VacancyListView.FULL,
+        version: int | None = None,
+    ) -> VacancyPageSchema | VacancyCompactPageSchema:
+        """Получает страницу вакансий пользователя в полном или компактном виде
+
+        version - версия списка, по которой построен ETag ответа. Она входит
+        в ключ кэша, чтобы страница не отставала от ETag, пока кэш
+        не сброшен после коммита изменений.
+        """
+        if version is None:
+            version = await self.get_vacancies_version(user_id)
+        filters_key = filters.model_dump_json() if filters else ""
+        return await self.cache.get_or_load(
+            user_namespace(user_id),
+            f"vacancies:{version}:{view.value}:{limit}:{cursor}:{filters_key}",
+            lambda: self._load_vacancies(user_id, limit, cursor, filters, view),
+        )
+
+    async def _load_vacancies(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None,
+        filters: VacancyFiltersSchema | None,
+        view: VacancyListView,
+    ) -> VacancyPageSchema | VacancyCompactPageSchema:
+        """Загружает страницу вакансий пользователя из БД"""
+        if view == VacancyListView.COMPACT:
+            get_page, page_schema = (
+                self.vacancy_repo.get_compact_page_by_user_id,
+                VacancyCompactPageSchema,
+            )
+        else:
+            get_page, page_schema = (
+                self.vacancy_repo.get_page_by_user_id,
+                VacancyPageSchema,
+            )
+        vacancies, next_cursor = await get_page(user_id, limit, cursor, filters)
         logger.info(f"Получено {len(vacancies)} вакансий для пользователя {user_id}")
-        return vacancies
+        return page_schema(items=vacancies, next_cursor=next_cursor)
+
+    async def get_vacancies_version(self, user_id: int) -> int:
+        """Версия списка вакансий пользователя"""
+        return await self.vacancy_repo.get_list_version(user_id)
+
+    @staticmethod
+    def get_vacancies_etag(user_id: int, version: int, query: str) -> str:
+        """ETag страницы списка вакансий, query - строка параметров запроса"""
+        return build_etag("vacancies", user_id, version, query)
+
+    async def get_vacancy_version(
+        self, vacancy_id: int, user_id: int
+    ) -> tuple[datetime, datetime | None] | None:
+        """Время изменения вакансии и избранного пользователя, None - если ее нет"""
+        return await self.vacancy_repo.get_item_version(vacancy_id, user_id)
+
+    @staticmethod
+    def get_vacancy_etag(
+        vacancy_id: int, user_id: int, version: tuple[datetime, datetime | None]
+    ) -> str:
+        """ETag вакансии вместе с избранным пользователя"""
+        return build_etag("vacancy", vacancy_id, user_id, *version)
+
+    async def get_vacancy_facets(
+        self, user_id: int, filters: VacancyFiltersSchema
+    ) -> VacancyFacetsSchema:
+        """Считает вакансии пользователя по этапам, статусам, компаниям и локациям"""
+        return await self.vacancy_repo.get_facets_by_user_id(user_id, filters)
+
+    async def search_vacancies(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        highlight: bool = True,
+    ) -> VacancySearchPageSchema:
+        """Ищет вакансии пользователя по тексту и заметкам"""
+        vacancies, next_cursor = await self.vacancy_repo.search_by_user_id(
+            user_id, query, limit, cursor, highlight
+        )
+        logger.info(f"Найдено {len(vacancies)} вакансий для пользователя {user_id}")
+        return VacancySearchPageSchema(items=vacancies, next_cursor=next_cursor)
+
+    async def export_vacancies(
+        self, user_id: int, filters: ExportFiltersSchema, page: ExportPageSchema
+    ) -> tuple[AsyncIterator[Any], str | None]:
+        """Выгрузка истории откликов пользователя и курсор продолжения"""
+        return await keyset_export(
+            page,
+            lambda after_id, limit: self.vacancy_repo.get_user_export_end(
+                user_id, filters, after_id, limit
+            ),
+            lambda db, after_id, until_id: VacancyRepository(db).stream_with_history(
+                user_id, filters, after_id, until_id
+            ),
+            self.session_factory,
+        )
 
     async def update_vacancy(
         self, vacancy_id: int, vacancy_data: VacancyUpdateSchema
     ) -> VacancySchema:
         """Обновляет вакансию"""
-        vacancy = await self.vacancy_repo.get_by_id(vacancy_id)
-        if not vacancy:
+        updated_vacancy = await self.vacancy_repo.update(vacancy_id, vacancy_data)
+        if not updated_vacancy:
             raise VacancyNotFoundException()
 
-        updated_vacancy = await self.vacancy_repo.update(vacancy_id, vacancy_data)
+        await self.cache.invalidate(
+            user_namespace(updated_vacancy.user_id), vacancy_namespace(vacancy_id)
+        )
         logger.info(f"Обновлена вакансия {vacancy_id}")
         return updated_vacancy
 
     async def delete_vacancy(self, vacancy_id: int) -> None:
         """Удаляет вакансию"""
-        vacancy = await self.vacancy_repo.get_by_id(vacancy_id)
-        if not vacancy:
+        owner_id = await self.vacancy_repo.delete(vacancy_id)
+        if owner_id is None:
             raise VacancyNotFoundException()
 
-        await self.vacancy_repo.delete(vacancy_id)
+        await self.cache.invalidate(
+            user_namespace(owner_id), vacancy_namespace(vacancy_id)
+        )
         logger.info(f"Удалена вакансия {vacancy_id}")
+
+
+def _validation_error_message(error: ValidationError) -> str:
+    """Ошибки валидации одной строкой: поле и причина"""
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in error.errors()
+    )
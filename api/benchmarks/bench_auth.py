@@ -0,0 +1,79 @@
+"""Микробенчмарк стоимости аутентификации одного запроса
+
+Сравнивает прежний путь get_current_user (jwt.decode с проверкой подписи
+и создание UserModel) с кешем проверенных токенов.
+
+Запуск из каталога api:
+    python -m benchmarks.bench_auth
+"""
+
+import os
+import timeit
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("DB__HOST", "localhost")
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from app.core.dependencies import get_current_user, token_cache  # noqa: E402
+from app.core.security import create_access_token, verify_token  # noqa: E402
+from app.models import UserModel  # noqa: E402
+
+ITERATIONS = 20000
+
+
+def run_coroutine(coro):
+    """Выполняет корутину без ожиданий, не затрагивая event loop"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("Корутина не должна ожидать ввод-вывод")
+
+
+def legacy_get_current_user(credentials: HTTPAuthorizationCredentials) -> UserModel:
+    """Прежняя реализация зависимости: декодирование и ORM-объект на каждый запрос"""
+    payload = verify_token(credentials.credentials)
+    return UserModel(
+        id=payload["user_id"],
+        username=payload["username"],
+        telegram_username=payload.get("telegram_username"),
+    )
+
+
+def cold_get_current_user(credentials: HTTPAuthorizationCredentials):
+    """Новая реализация при промахе кеша"""
+    token_cache.clear()
+    return run_coroutine(get_current_user(credentials))
+
+
+def warm_get_current_user(credentials: HTTPAuthorizationCredentials):
+    """Новая реализация при попадании в кеш"""
+    return run_coroutine(get_current_user(credentials))
+
+
+def main() -> None:
+    token = create_access_token(
+        {"user_id": 1, "username": "benchmark", "telegram_username": "@benchmark"}
+    )
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    cases = [
+        ("до: jwt.decode + UserModel", legacy_get_current_user),
+        ("после: промах кеша", cold_get_current_user),
+        ("после: попадание в кеш", warm_get_current_user),
+    ]
+    baseline = None
+    for title, func in cases:
+        func(credentials)  # прогрев
+        seconds = min(
+            timeit.repeat(lambda: func(credentials), number=ITERATIONS, repeat=5)
+        )
+        per_call_us = seconds / ITERATIONS * 1_000_000
+        baseline = baseline or per_call_us
+        speedup = baseline / per_call_us
+        print(f"{title:<30} {per_call_us:8.2f} мкс/запрос  x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
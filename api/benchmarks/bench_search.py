@@ -0,0 +1,113 @@
+"""Бенчмарк полнотекстового поиска по вакансиям пользователя
+
+Создает временного пользователя с VACANCIES_COUNT вакансиями, замеряет
+задержку VacancyRepository.search_by_user_id на нескольких запросах и
+удаляет созданные данные. Нужна БД с примененными миграциями.
+
+Запуск из каталога api:
+    python -m benchmarks.bench_search
+"""
+
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, insert, text
+
+from app.database import AsyncSessionLocal
+from app.models import FavoriteModel, UserModel, VacancyModel
+from app.repositories.vacancy_repository import VacancyRepository
+
+VACANCIES_COUNT = 10_000
+ITERATIONS = 50
+PAGE_SIZE = 50
+QUERIES = ["python", "разработчик kafka", '"data engineer"', "удаленка -junior"]
+
+TITLES = [
+    "Python-разработчик",
+    "Backend Developer",
+    "Data Engineer",
+    "Frontend-разработчик",
+    "QA Automation Engineer",
+    "DevOps-инженер",
+    "Аналитик данных",
+    "Junior Go Developer",
+]
+WORDS = (
+    "сервисы платежи команда продукт kafka postgres kubernetes удаленка офис "
+    "микросервисы highload api fastapi django react аналитика ml отчеты"
+).split()
+
+
+def _random_text(words: int) -> str:
+    return " ".join(random.choices(WORDS, k=words))
+
+
+async def seed(db) -> int:
+    result = await db.execute(
+        insert(UserModel).returning(UserModel.id),
+        [
+            {
+                "username": f"bench_{uuid.uuid4().hex[:8]}",
+                "password_hash": "x",
+                "first_name": "Bench",
+                "second_name": "Search",
+            }
+        ],
+    )
+    user_id = result.scalar_one()
+    result = await db.execute(
+        insert(VacancyModel).returning(VacancyModel.id),
+        [
+            {
+                "user_id": user_id,
+                "name": random.choice(TITLES),
+                "link": "https://example.com",
+                "company_name": f"Company {i % 300}",
+                "description": _random_text(60),
+                "requirements": _random_text(20),
+            }
+            for i in range(VACANCIES_COUNT)
+        ],
+    )
+    vacancy_ids = result.scalars().all()
+    await db.execute(
+        insert(FavoriteModel),
+        [
+            {"user_id": user_id, "vacancy_id": vacancy_id, "notes": _random_text(10)}
+            for vacancy_id in vacancy_ids[::5]
+        ],
+    )
+    await db.commit()
+    await db.execute(text("ANALYZE vacancy"))
+    await db.execute(text("ANALYZE favorite"))
+    return user_id
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as db:
+        user_id = await seed(db)
+        repo = VacancyRepository(db)
+        try:
+            for query in QUERIES:
+                await repo.search_by_user_id(user_id, query, PAGE_SIZE)  # прогрев
+                timings = []
+                for _ in range(ITERATIONS):
+                    started = time.perf_counter()
+                    items, _ = await repo.search_by_user_id(user_id, query, PAGE_SIZE)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    db.expunge_all()
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                print(
+                    f"{query:<22} найдено {len(items):>3} "
+                    f"p50 {statistics.median(timings):6.2f} мс  p95 {p95:6.2f} мс"
+                )
+        finally:
+            await db.execute(delete(UserModel).where(UserModel.id == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""Бенчмарк сериализации страницы вакансий
+
+Сравнивает стандартный путь FastAPI (повторная валидация по response_model,
+jsonable_encoder и json.dumps) с сериализацией готовых схем адаптером
+pydantic-core. БД не нужна: страница собирается из синтетических вакансий.
+
+Запуск из каталога api:
+    python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import schema_response
+from app.schemas.favorite import FavoriteStage
+from app.schemas.vacancy import (
+    VACANCY_PAGE_ADAPTER,
+    GetVacancySchema,
+    VacancyPageSchema,
+)
+
+VACANCIES_COUNT = 1000
+ITERATIONS = 50
+
+
+def build_page() -> VacancyPageSchema:
+    created_at = datetime(2026, 1, 1)
+    stages = list(FavoriteStage)
+    return VacancyPageSchema(
+        items=[
+            GetVacancySchema(
+                id=i,
+                user_id=1,
+                name=f"Python-разработчик #{i}",
+                link=f"https://example.com/vacancy/{i}",
+                company_name=f"Company {i % 300}",
+                description="Сервисы платежей, kafka, postgres, kubernetes. " * 8,
+                requirements="Python 3.12, asyncio, SQLAlchemy, FastAPI",
+                salary="от 250 000 ₽",
+                location="Москва",
+                notes="Написать рекрутеру в пятницу" if i % 5 == 0 else None,
+                stage=stages[i % len(stages)],
+                created_at=created_at + timedelta(minutes=i),
+                updated_at=created_at + timedelta(minutes=i),
+            )
+            for i in range(VACANCIES_COUNT)
+        ],
+        next_cursor="eyJjcmVhdGVkX2F0Ijo",
+    )
+
+
+async def fastapi_default(page: VacancyPageSchema) -> bytes:
+    """Путь FastAPI для endpoint с response_model=VacancyPageSchema"""
+    field = create_response_field(name="Response", type_=VacancyPageSchema)
+    content = await serialize_response(
+        field=field, response_content=page, is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+async def adapter_dump(page: VacancyPageSchema) -> bytes:
+    """Сериализация готовой схемы без повторной валидации"""
+    return schema_response(VACANCY_PAGE_ADAPTER, page).body
+
+
+async def measure(name: str, serialize, page: VacancyPageSchema) -> float:
+    body = await serialize(page)  # прогрев
+    timings = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        await serialize(page)
+        timings.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(timings)
+    print(f"{name:<16} {median:7.2f} мс на {VACANCIES_COUNT} вакансий, {len(body)} Б")
+    return median
+
+
+async def main() -> None:
+    page = build_page()
+    before = await measure("response_model", fastapi_default, page)
+    after = await measure("TypeAdapter", adapter_dump, page)
+    print(f"Ускорение: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+import json
 import uuid
 from typing import Any, Self
 
@@ -79,6 +80,10 @@ class AsyncTestAPIClient(AsyncClient):
         """Обновление Telegram username"""
         return await self.put("/auth/update_telegram", json=telegram_data)
 
+    async def get_telegram_changes(self, since: str) -> Response:
+        """Изменения привязки Telegram username после since"""
+        return await self.get("/api/internal/telegram_changes", params={"since": since})
+
     # Вакансии
     async def create_vacancy(
         self, vacancy_data: dict[str, Any] | None = None
@@ -94,25 +99,107 @@ class AsyncTestAPIClient(AsyncClient):
             }
         return await self.post("/api/internal/create_vacancy", json=vacancy_data)
 
+    async def create_vacancies(self, items: list[dict[str, Any]]) -> Response:
+        """Пакетное создание вакансий"""
+        return await self.post("/api/internal/create_vacancies", json={"items": items})
+
     async def get_vacancy(self, vacancy_id: int) -> Response:
         """Получение конкретной вакансии"""
-        return await self.get(f"/vacancy/get_vacancy/{vacancy_id}")
+        return await self.get(f"/api/public/vacancy/get_vacancy/{vacancy_id}")
+
+    async def get_vacancies(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        etag: str | None = None,
+        view: str | None = None,
+        **filters: list,
+    ) -> Response:
+        """Получение страницы вакансий текущего пользователя"""
+        params: dict[str, Any] = dict(filters)
+        if limit is not None:
+            params["limit"] = limit
+        if cursor is not None:
+            params["cursor"] = cursor
+        if view is not None:
+            params["view"] = view
+        return await self.get(
+            "/api/public/vacancy/get_vacancies",
+            params=params,
+            headers=self._conditional_headers(etag),
+        )
 
-    async def get_vacancies(self) -> Response:
-        """Получение вакансий текущего пользователя"""
-        return await self.get("/api/internal/get_vacancies")
+    async def get_vacancy_facets(self, **filters: list) -> Response:
+        """Получение счетчиков вакансий по значениям фильтров"""
+        return await self.get("/api/public/vacancy/get_facets", params=filters)
+
+    async def search_vacancies(
+        self,
+        q: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+        highlight: bool | None = None,
+    ) -> Response:
+        """Полнотекстовый поиск по вакансиям текущего пользователя"""
+        params: dict[str, Any] = {"q": q}
+        if limit is not None:
+            params["limit"] = limit
+        if cursor is not None:
+            params["cursor"] = cursor
+        if highlight is not None:
+            params["highlight"] = str(highlight).lower()
+        return await self.get("/api/public/vacancy/search_vacancies", params=params)
+
+    async def export_vacancies(self, params: dict[str, Any] | None = None) -> Response:
+        """Потоковая выгрузка вакансий текущего пользователя"""
+        return await self.get("/api/public/vacancy/export_vacancies", params=params)
+
+    async def import_vacancies(self, content: str, import_format: str) -> Response:
+        """Импорт вакансий текущего пользователя из файла в теле запроса"""
+        return await self.post(
+            "/api/public/vacancy/import_vacancies",
+            params={"format": import_format},
+            content=content.encode(),
+        )
 
     async def update_vacancy(
         self, vacancy_id: int, vacancy_data: dict[str, Any]
     ) -> Response:
         """Обновление вакансии"""
         return await self.put(
-            f"/vacancy/update_vacancy/{vacancy_id}", json=vacancy_data
+            f"/api/public/vacancy/update_vacancy/{vacancy_id}", json=vacancy_data
         )
 
     async def delete_vacancy(self, vacancy_id: int) -> Response:
         """Удаление вакансии"""
-        return await self.delete(f"/vacancy/delete_vacancy/{vacancy_id}")
+        return await self.delete(f"/api/public/vacancy/delete_vacancy/{vacancy_id}")
+
+    # Избранное
+    async def update_favorite(
+        self, vacancy_id: int, favorite_data: dict[str, Any]
+    ) -> Response:
+        """Обновление этапа и заметок к вакансии"""
+        return await self.put(f"/api/public/favorite/{vacancy_id}", json=favorite_data)
+
+    async def get_funnel_stats(self) -> Response:
+        """Получение количества вакансий на каждом этапе"""
+        return await self.get("/api/public/favorite/stats")
+
+    # Админка
+    async def admin_export(
+        self, entity: str, params: dict[str, Any] | None = None
+    ) -> Response:
+        """Потоковая выгрузка админки: users, vacancies, stages или tokens"""
+        return await self.get(f"/api/admin/get_{entity}", params=params)
+
+    @staticmethod
+    def parse_ndjson(response: Response) -> list[dict[str, Any]]:
+        """Разбирает NDJSON выгрузку в список объектов"""
+        return [json.loads(line) for line in response.text.splitlines() if line]
+
+    async def reconcile_funnel(self) -> Response:
+        """Пересчет счетчиков воронки"""
+        return await self.post("/api/admin/reconcile_funnel")
 
     # Этапы
     async def create_stage(self, stage_data: dict[str, Any] | None = None) -> Response:
@@ -123,25 +210,37 @@ class AsyncTestAPIClient(AsyncClient):
                 "stage_type": "Отклик отправлен",
                 "description": self.faker.text(max_nb_chars=200),
             }
-        return await self.post("/stage/create_stage", json=stage_data)
+        return await self.post("/api/public/stage/create_stage", json=stage_data)
 
     async def get_stage(self, stage_id: int) -> Response:
         """Получение конкретного этапа"""
-        return await self.get(f"/stage/get_stage/{stage_id}")
+        return await self.get(f"/api/public/stage/get_stage/{stage_id}")
 
-    async def get_stages_by_vacancy_id(self, vacancy_id: int) -> Response:
+    async def get_stages_by_vacancy_id(
+        self, vacancy_id: int, etag: str | None = None
+    ) -> Response:
         """Получение этапов вакансии"""
-        return await self.get(f"/stage/get_stages/{vacancy_id}")
+        return await self.get(
+            f"/api/public/stage/get_stages/{vacancy_id}",
+            headers=self._conditional_headers(etag),
+        )
 
     async def update_stage(self, stage_id: int, stage_data: dict[str, Any]) -> Response:
         """Обновление этапа"""
-        return await self.put(f"/stage/update_stage/{stage_id}", json=stage_data)
+        return await self.put(
+            f"/api/public/stage/update_stage/{stage_id}", json=stage_data
+        )
 
     async def delete_stage(self, stage_id: int) -> Response:
         """Удаление этапа"""
-        return await self.delete(f"/stage/delete_stage/{stage_id}")
+        return await self.delete(f"/api/public/stage/delete_stage/{stage_id}")
 
     # Утилиты для тестов
+    @staticmethod
+    def _conditional_headers(etag: str | None) -> dict[str, str]:
+        """Заголовок условного запроса по ранее полученному ETag"""
+        return {"If-None-Match": etag} if etag else {}
+
     async def create_test_user(self) -> tuple[dict[str, Any], str]:
         """Создает тестового пользователя и возвращает данные и токен"""
         # Регистрируем пользователя
@@ -163,6 +262,39 @@ class AsyncTestAPIClient(AsyncClient):
         # Если что-то пошло не так, возвращаем данные без токена
         return user_data, ""
 
+    async def create_user_with_vacancies(
+        self, vacancies: int | list[dict[str, Any]] = 0, **defaults
+    ) -> tuple[int, list[int]]:
+        """Регистрирует пользователя, авторизует клиент и создает ему вакансии
+
+        vacancies - количество вакансий или поля каждой из них. Поля из defaults
+        применяются ко всем вакансиям, остальные заполняются случайно.
+        """
+        register_response = await self.register_user()
+        self.assert_response_status(register_response, status.HTTP_200_OK)
+        access_token = register_response.json()["access_token"]
+        self.set_auth_token(access_token)
+        user_id = self.get_user_id_from_token(access_token)
+
+        if isinstance(vacancies, int):
+            vacancies = [{} for _ in range(vacancies)]
+
+        vacancy_ids = []
+        for overrides in vacancies:
+            vacancy_data = {
+                "name": self.faker.job(),
+                "link": self.faker.url(),
+                "company_name": self.faker.company(),
+                "description": self.faker.text(max_nb_chars=200),
+                "user_id": user_id,
+                **defaults,
+                **overrides,
+            }
+            response = await self.create_vacancy(vacancy_data)
+            self.assert_response_status(response, status.HTTP_200_OK)
+            vacancy_ids.append(response.json()["id"])
+        return user_id, vacancy_ids
+
     def assert_response_status(self, response: Response, expected_status: int):
         """Проверяет статус ответа"""
         assert (
@@ -1,7 +1,10 @@
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
 from faker import Faker
+from sqlalchemy import event
 
 
 def generate_test_uuid() -> str:
@@ -98,3 +101,21 @@ def assert_response_has_error(
             assert "detail" in data, f"No 'detail' field in error response: {data}"
         except ValueError:
             assert False, f"Error response is not JSON: {response.text}"
+
+
+@contextmanager
+def count_queries() -> Iterator[list[str]]:
+    """Собирает SQL-запросы, отправленные в БД внутри блока"""
+    from app.database import async_engine
+
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -4,6 +4,7 @@ import pytest
 from asgi_lifespan import LifespanManager
 from faker import Faker
 from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from tests.common.api_client import AsyncTestAPIClient
 from tests.common.utils import create_test_user_data, create_test_vacancy_data
@@ -35,6 +36,15 @@ async def lifespanned_app(event_loop) -> AsyncIterator[FastAPI]:
         yield app
 
 
+@pytest.fixture
+async def db_session(lifespanned_app: FastAPI) -> AsyncIterator[AsyncSession]:
+    """Фикстура для прямого доступа к БД"""
+    from app.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
 @pytest.fixture(scope="session")
 def faker() -> Faker:
     """Фикстура для генерации тестовых данных"""
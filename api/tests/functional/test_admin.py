@@ -1,3 +1,6 @@
+import csv
+import io
+
 import pytest
 
 from tests.common.api_client import AsyncTestAPIClient
@@ -18,10 +21,11 @@ class TestAdminEndpoints:
         await async_client.register_user(user1_data)
         await async_client.register_user(user2_data)
 
-        response = await async_client.get("/admin/get_users")
+        response = await async_client.admin_export("users")
 
         assert response.status_code == 200
-        users = response.json()
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        users = async_client.parse_ndjson(response)
 
         assert len(users) >= 2
         usernames = [user["username"] for user in users]
@@ -35,49 +39,25 @@ class TestAdminEndpoints:
         assert "telegram_username" in user
         assert "created_at" in user
 
+        # Строки идут по возрастанию id
+        ids = [user["id"] for user in users]
+        assert ids == sorted(ids)
+
     @pytest.mark.asyncio
     async def test_get_vacancies_success(self, async_client: AsyncTestAPIClient):
-        """Тест получения всех вакансий"""
-        # Создаем тестового пользователя и вакансии через API
-        user_factory = UserFactory()
-        user_data = user_factory.build_user_data()
-
-        # Регистрируем пользователя
-        register_response = await async_client.register_user(user_data)
-        assert register_response.status_code == 200
-
-        # Получаем токен и информацию о пользователе
-        access_token = register_response.json().get("access_token")
-        async_client.set_auth_token(access_token)
-
-        # Получаем user_id из токена
-        user_id = async_client.get_user_id_from_token(access_token)
-
-        # Создаем вакансии
-        vacancy1_data = {
-            "name": "Test Vacancy 1",
-            "description": "Test description 1",
-            "link": "https://example.com/1",
-            "company_name": "Test Company 1",
-            "user_id": user_id,
-        }
-        vacancy2_data = {
-            "name": "Test Vacancy 2",
-            "description": "Test description 2",
-            "link": "https://example.com/2",
-            "company_name": "Test Company 2",
-            "user_id": user_id,
-        }
-
-        await async_client.create_vacancy(vacancy1_data)
-        await async_client.create_vacancy(vacancy2_data)
-
-        response = await async_client.get("/admin/get_vacancies")
+        """Тест получения вакансий пользователя"""
+        user_id, _ = await async_client.create_user_with_vacancies(
+            [{"name": "Test Vacancy 1"}, {"name": "Test Vacancy 2"}]
+        )
+
+        response = await async_client.admin_export(
+            "vacancies", params={"user_id": user_id}
+        )
 
         assert response.status_code == 200
-        vacancies = response.json()
+        vacancies = async_client.parse_ndjson(response)
 
-        assert len(vacancies) >= 2
+        assert len(vacancies) == 2
         vacancy_names = [vacancy["name"] for vacancy in vacancies]
         assert "Test Vacancy 1" in vacancy_names
         assert "Test Vacancy 2" in vacancy_names
@@ -94,65 +74,35 @@ class TestAdminEndpoints:
 
     @pytest.mark.asyncio
     async def test_get_stages_success(self, async_client: AsyncTestAPIClient):
-        """Тест получения всех этапов"""
-        # Создаем тестового пользователя, вакансию и этапы через API
-        user_factory = UserFactory()
-        user_data = user_factory.build_user_data()
-
-        # Регистрируем пользователя
-        register_response = await async_client.register_user(user_data)
-        assert register_response.status_code == 200
-
-        # Получаем токен и информацию о пользователе
-        access_token = register_response.json().get("access_token")
-        async_client.set_auth_token(access_token)
-
-        # Получаем user_id из токена
-        user_id = async_client.get_user_id_from_token(access_token)
-
-        # Создаем вакансию
-        vacancy_data = {
-            "name": "Test Vacancy",
-            "description": "Test description",
-            "link": "https://example.com",
-            "company_name": "Test Company",
-            "user_id": user_id,
-        }
-        vacancy_response = await async_client.create_vacancy(vacancy_data)
-        assert vacancy_response.status_code == 200
-
-        # Получаем ID созданной вакансии
-        vacancy_id = vacancy_response.json().get("id", 1)
+        """Тест получения этапов вакансии"""
+        _, (vacancy_id,) = await async_client.create_user_with_vacancies(1)
 
         # Создаем этапы
-        stage1_data = {
-            "stage_type": "Test Stage 1",
-            "description": "Test stage description 1",
-            "vacancy_id": vacancy_id,
-        }
-        stage2_data = {
-            "stage_type": "Test Stage 2",
-            "description": "Test stage description 2",
-            "vacancy_id": vacancy_id,
-        }
-
-        await async_client.create_stage(stage1_data)
-        await async_client.create_stage(stage2_data)
-
-        response = await async_client.get("/admin/get_stages")
+        for index in (1, 2):
+            await async_client.create_stage(
+                {
+                    "stage_type": f"Test Stage {index}",
+                    "description": f"Test stage description {index}",
+                    "vacancy_id": vacancy_id,
+                }
+            )
+
+        response = await async_client.admin_export(
+            "stages", params={"vacancy_id": vacancy_id}
+        )
 
         assert response.status_code == 200
-        stages = response.json()
+        stages = async_client.parse_ndjson(response)
 
-        assert len(stages) >= 2
-        stage_names = [stage["name"] for stage in stages]
-        assert "Test Stage 1" in stage_names
-        assert "Test Stage 2" in stage_names
+        assert len(stages) == 2
+        stage_types = [stage["stage_type"] for stage in stages]
+        assert "Test Stage 1" in stage_types
+        assert "Test Stage 2" in stage_types
 
         # Проверяем структуру ответа
         stage = stages[0]
         assert "id" in stage
-        assert "name" in stage
+        assert "stage_type" in stage
         assert "description" in stage
         assert "vacancy_id" in stage
         assert "created_at" in stage
@@ -160,10 +110,10 @@ class TestAdminEndpoints:
     @pytest.mark.asyncio
     async def test_get_tokens_success(self, async_client: AsyncTestAPIClient):
         """Тест получения всех токенов"""
-        response = await async_client.get("/admin/get_tokens")
+        response = await async_client.admin_export("tokens")
 
         assert response.status_code == 200
-        tokens = response.json()
+        tokens = async_client.parse_ndjson(response)
 
         # Проверяем структуру ответа
         if tokens:  # Если есть токены
@@ -173,3 +123,69 @@ class TestAdminEndpoints:
             assert "user_id" in token
             assert "expires_at" in token
             assert "created_at" in token
+
+    @pytest.mark.asyncio
+    async def test_get_vacancies_csv(self, async_client: AsyncTestAPIClient):
+        """Выгрузка в CSV начинается с заголовка из полей схемы"""
+        user_id, vacancy_ids = await async_client.create_user_with_vacancies(
+            [{"name": "Test Vacancy 1"}, {"name": "Test Vacancy 2"}]
+        )
+
+        response = await async_client.admin_export(
+            "vacancies", params={"user_id": user_id, "format": "csv"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [int(row["id"]) for row in rows] == vacancy_ids
+        assert rows[0]["name"] == "Test Vacancy 1"
+        assert rows[0]["user_id"] == str(user_id)
+
+    @pytest.mark.asyncio
+    async def test_get_vacancies_resume_by_cursor(
+        self, async_client: AsyncTestAPIClient
+    ):
+        """Выгрузка с limit отдает курсор, по которому продолжается следующая"""
+        user_id, vacancy_ids = await async_client.create_user_with_vacancies(5)
+
+        exported = []
+        params = {"user_id": user_id, "limit": 2}
+        for _ in range(len(vacancy_ids)):
+            response = await async_client.admin_export("vacancies", params=params)
+            assert response.status_code == 200
+            page = async_client.parse_ndjson(response)
+            assert len(page) <= 2
+            exported.extend(vacancy["id"] for vacancy in page)
+
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            params["cursor"] = next_cursor
+
+        # Страницы не пересекаются и вместе покрывают всю выборку
+        assert exported == vacancy_ids
+
+    @pytest.mark.asyncio
+    async def test_get_vacancies_without_next_page(
+        self, async_client: AsyncTestAPIClient
+    ):
+        """Последняя страница не содержит курсора продолжения"""
+        user_id, _ = await async_client.create_user_with_vacancies(2)
+
+        response = await async_client.admin_export(
+            "vacancies", params={"user_id": user_id, "limit": 2}
+        )
+
+        assert response.status_code == 200
+        assert len(async_client.parse_ndjson(response)) == 2
+        assert "X-Next-Cursor" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_get_vacancies_invalid_cursor(self, async_client: AsyncTestAPIClient):
+        """Поврежденный курсор отклоняется до начала выгрузки"""
+        response = await async_client.admin_export(
+            "vacancies", params={"cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == 422
@@ -49,6 +49,20 @@ async def test_register_user_duplicate_username(
     assert_response_has_error(response2)
 
 
+@pytest.mark.asyncio
+async def test_register_user_duplicate_email(
+    async_client: AsyncTestAPIClient, user_factory: UserFactory
+):
+    """Занятый email отклоняется уникальным ограничением с ответом 409"""
+    profile = {"first_name": "Иван", "second_name": "Петров", "email": "ivan@test.ru"}
+    response = await async_client.register_user(user_factory.build_user_data(**profile))
+    assert_response_status(response, status.HTTP_200_OK)
+
+    response = await async_client.register_user(user_factory.build_user_data(**profile))
+    assert_response_status(response, status.HTTP_409_CONFLICT)
+    assert response.json()["detail"] == "Пользователь с таким email уже существует"
+
+
 @pytest.mark.asyncio
 async def test_login_user_success(
     async_client: AsyncTestAPIClient, user_factory: UserFactory
@@ -279,3 +293,103 @@ async def test_access_token_contains_telegram_username(
         )
     else:
         pytest.skip("API не возвращает refresh_token в cookie")
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_lookup_by_digest(async_client: AsyncTestAPIClient):
+    """Токены ищутся и удаляются по точному дайджесту, а не по пользователю"""
+    from app.core.security import create_refresh_token, get_token_hash
+    from app.database import AsyncSessionLocal
+    from app.repositories.auth_repository import AuthRepository
+
+    async with AsyncSessionLocal() as db:
+        auth_repo = AuthRepository(db)
+        user = await auth_repo.create(
+            username="digest_user",
+            password="password123",
+            first_name="Digest",
+            second_name="User",
+            email="digest@example.com",
+        )
+        first_token = create_refresh_token(data={"user_id": user.id})
+        second_token = create_refresh_token(data={"user_id": user.id})
+        assert first_token != second_token
+
+        saved = await auth_repo.save_refresh_token(user.id, first_token)
+        await auth_repo.save_refresh_token(user.id, second_token)
+        assert saved.token_hash == get_token_hash(first_token)
+        assert len(saved.token_hash) == 64
+
+        assert await auth_repo.get_valid_refresh_token(user.id, first_token)
+        assert await auth_repo.delete_refresh_token(user.id, first_token)
+
+        # Удаляется только переданный токен, вторая сессия остается активной
+        assert await auth_repo.get_valid_refresh_token(user.id, first_token) is None
+        assert await auth_repo.get_valid_refresh_token(user.id, second_token)
+
+
+@pytest.mark.asyncio
+async def test_telegram_changes_include_updated_username(
+    async_client: AsyncTestAPIClient, user_factory: UserFactory
+):
+    """Новая привязка Telegram попадает в ленту изменений для бота"""
+    from datetime import datetime, timedelta
+
+    since = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    assert_response_status(register_response, status.HTTP_200_OK)
+    async_client.set_auth_token(register_response.json()["access_token"])
+
+    telegram_data = user_factory.build_telegram_update_data()
+    update_response = await async_client.update_telegram_username(telegram_data)
+    assert_response_status(update_response, status.HTTP_200_OK)
+
+    response = await async_client.get_telegram_changes(since)
+    assert_response_status(response, status.HTTP_200_OK)
+    data = response.json()
+    assert telegram_data["telegram_username"] in data["usernames"]
+    assert (
+        async_client.get_user_id_from_token(register_response.json()["access_token"])
+        in data["user_ids"]
+    )
+    assert data["until"] >= since
+
+
+@pytest.mark.asyncio
+async def test_telegram_changes_include_relinked_and_deleted_users(
+    async_client: AsyncTestAPIClient, user_factory: UserFactory
+):
+    """После перепривязки и удаления в ленте есть ID пользователя
+
+    По ID бот сбрасывает закешированный старый username, которого в ленте нет.
+    """
+    from datetime import datetime, timedelta
+
+    from app.database import AsyncSessionLocal
+
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    access_token = register_response.json()["access_token"]
+    async_client.set_auth_token(access_token)
+    user_id = async_client.get_user_id_from_token(access_token)
+    old_data = user_factory.build_telegram_update_data()
+    await async_client.update_telegram_username(old_data)
+
+    since = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+    new_data = user_factory.build_telegram_update_data()
+    update_response = await async_client.update_telegram_username(new_data)
+    assert_response_status(update_response, status.HTTP_200_OK)
+
+    data = (await async_client.get_telegram_changes(since)).json()
+    assert user_id in data["user_ids"]
+    assert new_data["telegram_username"] in data["usernames"]
+    assert old_data["telegram_username"] not in data["usernames"]
+
+    # Удаление в обход API тоже попадает в ленту
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(UserModel).where(UserModel.id == user_id))
+        await db.commit()
+
+    data = (await async_client.get_telegram_changes(since)).json()
+    assert user_id in data["user_ids"]
+    assert new_data["telegram_username"] not in data["usernames"]
@@ -0,0 +1,134 @@
+import asyncio
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from app.core.metrics import metrics
+
+LARGE_TEXT = "Python-разработчик в команду платежей, удаленка. " * 200
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=["gzip"],
+        minimum_size=1024,
+        gzip_level=6,
+        brotli_quality=4,
+    )
+
+    @app.get("/large")
+    async def large():
+        return JSONResponse({"description": LARGE_TEXT})
+
+    @app.get("/small")
+    async def small():
+        return JSONResponse({"status": "ok"})
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(100):
+                yield f'{{"id": {i}, "name": "{LARGE_TEXT[:100]}"}}\n'.encode()
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.fixture
+async def compression_client() -> AsyncClient:
+    async with AsyncClient(
+        transport=ASGITransport(_build_app()), base_url="http://test"
+    ) as client:
+        yield client
+
+
+def test_negotiate_encoding():
+    """Кодирование выбирается по q клиента, затем по предпочтению сервера"""
+    encodings = ["br", "gzip"]
+    assert negotiate_encoding("gzip, deflate, br", encodings) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", encodings) == "gzip"
+    assert negotiate_encoding("br;q=0, gzip", encodings) == "gzip"
+    assert negotiate_encoding("*", encodings) == "br"
+    assert negotiate_encoding("identity", encodings) is None
+    assert negotiate_encoding("", encodings) is None
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_compressed(compression_client: AsyncClient):
+    """Большой ответ сжимается и учитывается в метриках"""
+    responses_before = metrics.get("compression.gzip.responses")
+
+    response = await compression_client.get(
+        "/large", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == {"description": LARGE_TEXT}
+    assert int(response.headers["content-length"]) < len(LARGE_TEXT.encode()) // 10
+    assert metrics.get("compression.gzip.responses") == responses_before + 1
+    assert metrics.get("compression.gzip.ratio") > 1
+
+
+@pytest.mark.asyncio
+async def test_small_or_unaccepted_response_is_not_compressed(
+    compression_client: AsyncClient,
+):
+    """Ответы меньше порога и без Accept-Encoding отдаются как есть"""
+    response = await compression_client.get(
+        "/small", headers={"Accept-Encoding": "gzip"}
+    )
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"status": "ok"}
+
+    response = await compression_client.get(
+        "/large", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_stream_is_compressed_incrementally():
+    """Потоковый ответ сжимается по фрагментам без Content-Length"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"test"), (b"accept-encoding", b"gzip")],
+        "server": ("test", 80),
+        "client": ("127.0.0.1", 12345),
+    }
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()  # Клиент не отключается до конца ответа
+
+    async def send(message):
+        messages.append(message)
+
+    await _build_app()(scope, receive, send)
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    # Каждая строка сброшена отдельным фрагментом, вместе они - целый gzip-поток
+    chunks = [message["body"] for message in bodies]
+    assert len([chunk for chunk in chunks if chunk]) > 1
+    assert bodies[-1]["more_body"] is False
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+    assert len(lines) == 100
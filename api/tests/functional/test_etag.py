@@ -0,0 +1,89 @@
+import pytest
+from fastapi import status
+
+from tests.common.api_client import AsyncTestAPIClient
+from tests.common.utils import assert_response_status
+from tests.factories.base_factories import StageFactory, VacancyFactory
+
+
+@pytest.mark.asyncio
+async def test_get_vacancies_not_modified(async_client: AsyncTestAPIClient):
+    """Повторный запрос с тем же ETag возвращает 304 без тела"""
+    await async_client.create_user_with_vacancies(1)
+
+    response = await async_client.get_vacancies()
+    assert_response_status(response, status.HTTP_200_OK)
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = await async_client.get_vacancies(etag=etag)
+    assert_response_status(response, status.HTTP_304_NOT_MODIFIED)
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # Для If-None-Match признак слабого валидатора не важен
+    assert etag.startswith("W/")
+    response = await async_client.get_vacancies(etag=etag.removeprefix("W/"))
+    assert_response_status(response, status.HTTP_304_NOT_MODIFIED)
+
+
+@pytest.mark.asyncio
+async def test_get_vacancies_etag_changes_with_data(
+    async_client: AsyncTestAPIClient,
+    vacancy_factory: VacancyFactory,
+):
+    """ETag меняется после изменения данных и зависит от параметров запроса"""
+    user_id, (vacancy_id,) = await async_client.create_user_with_vacancies(1)
+
+    etag = (await async_client.get_vacancies()).headers["etag"]
+    limited_etag = (await async_client.get_vacancies(limit=1)).headers["etag"]
+    assert limited_etag != etag
+
+    # Смена этапа в избранном меняет список
+    await async_client.update_favorite(vacancy_id, {"stage": "apply_sent"})
+    response = await async_client.get_vacancies(etag=etag)
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.headers["etag"] != etag
+    etag = response.headers["etag"]
+
+    # Новая вакансия тоже
+    await async_client.create_vacancy(
+        vacancy_factory.build_vacancy_data(user_id=user_id)
+    )
+    response = await async_client.get_vacancies(etag=etag)
+    assert_response_status(response, status.HTTP_200_OK)
+    assert len(response.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_vacancies_etag_is_per_user(async_client: AsyncTestAPIClient):
+    """ETag одного пользователя не подходит другому"""
+    await async_client.create_user_with_vacancies(1)
+    etag = (await async_client.get_vacancies()).headers["etag"]
+
+    await async_client.create_user_with_vacancies(1)
+    response = await async_client.get_vacancies(etag=etag)
+    assert_response_status(response, status.HTTP_200_OK)
+
+
+@pytest.mark.asyncio
+async def test_get_stages_not_modified(
+    async_client: AsyncTestAPIClient,
+    stage_factory: StageFactory,
+):
+    """Этапы вакансии отдают 304, пока не изменились"""
+    _, (vacancy_id,) = await async_client.create_user_with_vacancies(1)
+
+    response = await async_client.get_stages_by_vacancy_id(vacancy_id)
+    assert_response_status(response, status.HTTP_200_OK)
+    etag = response.headers["etag"]
+
+    response = await async_client.get_stages_by_vacancy_id(vacancy_id, etag=etag)
+    assert_response_status(response, status.HTTP_304_NOT_MODIFIED)
+
+    await async_client.create_stage(
+        stage_factory.build_stage_data(vacancy_id=vacancy_id)
+    )
+    response = await async_client.get_stages_by_vacancy_id(vacancy_id, etag=etag)
+    assert_response_status(response, status.HTTP_200_OK)
+    assert len(response.json()) == 1
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FavoriteModel, FunnelCounterModel
+from app.schemas.favorite import FavoriteStage
+from tests.common.api_client import AsyncTestAPIClient
+from tests.common.utils import assert_response_status
+
+
+@pytest.mark.asyncio
+async def test_funnel_stats_follow_favorite_changes(async_client: AsyncTestAPIClient):
+    """Счетчики меняются вместе с этапами и удалением вакансий"""
+    _, vacancy_ids = await async_client.create_user_with_vacancies(3)
+
+    response = await async_client.get_funnel_stats()
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.json()["total"] == 0
+
+    for vacancy_id in vacancy_ids:
+        await async_client.update_favorite(vacancy_id, {"stage": "apply_sent"})
+    await async_client.update_favorite(vacancy_ids[0], {"stage": "hr_interview"})
+    # Повторное сохранение того же этапа не меняет счетчики
+    await async_client.update_favorite(vacancy_ids[0], {"stage": "hr_interview"})
+
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["stages"]["apply_sent"] == 2
+    assert stats["stages"]["hr_interview"] == 1
+    assert stats["stages"]["offer_received"] == 0
+    assert stats["total"] == 3
+
+    response = await async_client.delete(
+        f"/api/public/vacancy/delete_vacancy/{vacancy_ids[1]}"
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["stages"]["apply_sent"] == 1
+    assert stats["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reconcile_funnel_fixes_drift(
+    async_client: AsyncTestAPIClient,
+    db_session: AsyncSession,
+):
+    """Пересчет находит и исправляет расхождения счетчиков"""
+    user_id, vacancy_ids = await async_client.create_user_with_vacancies(2)
+    for vacancy_id in vacancy_ids:
+        await async_client.update_favorite(vacancy_id, {"stage": "tech_interview"})
+
+    await db_session.execute(
+        update(FunnelCounterModel)
+        .where(
+            FunnelCounterModel.user_id == user_id,
+            FunnelCounterModel.stage == FavoriteStage.TECH_INTERVIEW,
+        )
+        .values(count=7)
+    )
+    await db_session.commit()
+
+    response = await async_client.reconcile_funnel()
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert {
+        "user_id": user_id,
+        "stage": "tech_interview",
+        "stored": 7,
+        "actual": 2,
+    } in report["drift"]
+
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["stages"]["tech_interview"] == 2
+
+    # Повторный пересчет расхождений у пользователя уже не находит
+    report = (await async_client.reconcile_funnel()).json()
+    assert user_id not in {item["user_id"] for item in report["drift"]}
+
+
+@pytest.mark.asyncio
+async def test_user_delete_updates_other_users_counters(
+    async_client: AsyncTestAPIClient,
+    db_session: AsyncSession,
+):
+    """Удаление автора вакансии уменьшает счетчики тех, кто ее отслеживал"""
+    from app.repositories.auth_repository import AuthRepository
+
+    author_id, vacancy_ids = await async_client.create_user_with_vacancies(1)
+    await async_client.create_user_with_vacancies(0)
+    await async_client.update_favorite(vacancy_ids[0], {"stage": "offer_received"})
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["stages"]["offer_received"] == 1
+
+    assert await AuthRepository(db_session).delete(author_id)
+
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["stages"]["offer_received"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_favorite_saves_keep_one_row(
+    async_client: AsyncTestAPIClient,
+    db_session: AsyncSession,
+):
+    """Параллельные сохранения избранного не создают дублей и не сбивают счетчики"""
+    user_id, vacancy_ids = await async_client.create_user_with_vacancies(1)
+    stages = ["apply_sent", "hr_interview", "tech_interview", "rejected"] * 2
+
+    responses = await asyncio.gather(
+        *(
+            async_client.update_favorite(vacancy_ids[0], {"stage": stage})
+            for stage in stages
+        )
+    )
+    for response in responses:
+        assert_response_status(response, status.HTTP_200_OK)
+
+    result = await db_session.execute(
+        select(FavoriteModel.stage).where(
+            FavoriteModel.user_id == user_id,
+            FavoriteModel.vacancy_id == vacancy_ids[0],
+        )
+    )
+    (stage,) = result.scalars().all()
+
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["total"] == 1
+    assert stats["stages"][stage.value] == 1
+
+    # Заметки без этапа не сбрасывают этап
+    response = await async_client.update_favorite(vacancy_ids[0], {"notes": "Ок"})
+    assert response.json() == {"stage": stage.value, "notes": "Ок"}
+
+
+@pytest.mark.asyncio
+async def test_favorite_for_missing_vacancy_not_found(async_client: AsyncTestAPIClient):
+    """Избранное несуществующей вакансии отклоняется внешним ключом с ответом 404"""
+    await async_client.create_user_with_vacancies(0)
+
+    response = await async_client.update_favorite(999999999, {"stage": "apply_sent"})
+    assert_response_status(response, status.HTTP_404_NOT_FOUND)
+
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["total"] == 0
@@ -0,0 +1,220 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FavoriteModel, RefreshModel, StageModel, UserModel, VacancyModel
+from app.schemas.favorite import FavoriteStage
+
+USERS_COUNT = 20
+VACANCIES_PER_USER = 100
+
+
+def _collect_index_names(plan: dict) -> set[str]:
+    """Собирает имена индексов из JSON-плана запроса"""
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= _collect_index_names(child)
+    return names
+
+
+async def _used_indexes(db: AsyncSession, query) -> set[str]:
+    """Возвращает индексы, выбранные планировщиком для запроса"""
+    compiled = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    # На небольшом наборе данных seq scan может оказаться дешевле индекса,
+    # поэтому отключаем его и проверяем, что индекс подходит под запрос
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan = result.scalar_one()
+    await db.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return _collect_index_names(plan[0]["Plan"])
+
+
+@pytest.fixture
+async def seeded_user_ids(db_session: AsyncSession) -> list[int]:
+    """Наполняет БД пользователями, вакансиями, этапами и токенами"""
+    now = datetime.utcnow()
+    result = await db_session.execute(
+        insert(UserModel).returning(UserModel.id),
+        [
+            {
+                "username": f"index_{uuid.uuid4().hex[:8]}",
+                "password_hash": "x",
+                "first_name": "Index",
+                "second_name": "Test",
+            }
+            for _ in range(USERS_COUNT)
+        ],
+    )
+    user_ids = list(result.scalars().all())
+
+    result = await db_session.execute(
+        insert(VacancyModel).returning(VacancyModel.id, VacancyModel.user_id),
+        [
+            {
+                "user_id": user_id,
+                "name": f"Vacancy {i}",
+                "link": "https://example.com",
+                "created_at": now - timedelta(minutes=i),
+            }
+            for user_id in user_ids
+            for i in range(VACANCIES_PER_USER)
+        ],
+    )
+    vacancies = result.all()
+
+    await db_session.execute(
+        insert(FavoriteModel),
+        [
+            {
+                "user_id": user_id,
+                "vacancy_id": vacancy_id,
+                "stage": FavoriteStage.APPLY_SENT,
+            }
+            for vacancy_id, user_id in vacancies
+        ],
+    )
+    await db_session.execute(
+        insert(StageModel),
+        [{"vacancy_id": vacancy_id, "title": "HR"} for vacancy_id, _ in vacancies],
+    )
+    await db_session.execute(
+        insert(RefreshModel),
+        [
+            {
+                "user_id": user_id,
+                "token_hash": uuid.uuid4().hex,
+                "expires_at": now + timedelta(days=i - 1),
+            }
+            for user_id in user_ids
+            for i in range(10)
+        ],
+    )
+    await db_session.commit()
+    for table in ("user", "vacancy", "favorite", "stage", "refresh"):
+        await db_session.execute(text(f'ANALYZE "{table}"'))
+
+    yield user_ids
+
+    await db_session.execute(delete(UserModel).where(UserModel.id.in_(user_ids)))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_vacancy_page_uses_index(
+    db_session: AsyncSession, seeded_user_ids: list[int]
+):
+    """Страница вакансий пользователя читается по составному индексу"""
+    query = (
+        select(VacancyModel)
+        .where(VacancyModel.user_id == seeded_user_ids[0])
+        .order_by(VacancyModel.created_at.desc(), VacancyModel.id.desc())
+        .limit(51)
+    )
+    assert "ix_vacancy_user_id_created_at_id" in await _used_indexes(db_session, query)
+
+
+@pytest.mark.asyncio
+async def test_favorite_lookups_use_indexes(
+    db_session: AsyncSession, seeded_user_ids: list[int]
+):
+    """Поиск избранного идет по индексам favorite"""
+    user_id = seeded_user_ids[0]
+    vacancy_id = (
+        await db_session.execute(
+            select(VacancyModel.id).where(VacancyModel.user_id == user_id).limit(1)
+        )
+    ).scalar_one()
+
+    by_user = select(FavoriteModel).where(
+        FavoriteModel.user_id == user_id, FavoriteModel.vacancy_id == vacancy_id
+    )
+    assert "ix_favorite_user_id_vacancy_id" in await _used_indexes(db_session, by_user)
+
+    # Счетчики по этапам читаются только из индекса
+    stage_counts = (
+        select(FavoriteModel.stage, func.count())
+        .where(FavoriteModel.user_id == user_id)
+        .group_by(FavoriteModel.stage)
+    )
+    assert "ix_favorite_user_id_vacancy_id" in await _used_indexes(
+        db_session, stage_counts
+    )
+
+    by_vacancies = select(FavoriteModel).where(
+        FavoriteModel.vacancy_id.in_([vacancy_id, vacancy_id + 1])
+    )
+    assert "ix_favorite_vacancy_id" in await _used_indexes(db_session, by_vacancies)
+
+
+@pytest.mark.asyncio
+async def test_stage_list_uses_index(
+    db_session: AsyncSession, seeded_user_ids: list[int]
+):
+    """Этапы вакансии читаются по индексу"""
+    vacancy_id = (
+        await db_session.execute(
+            select(VacancyModel.id)
+            .where(VacancyModel.user_id == seeded_user_ids[0])
+            .limit(1)
+        )
+    ).scalar_one()
+    query = (
+        select(StageModel)
+        .where(StageModel.vacancy_id == vacancy_id)
+        .order_by(StageModel.created_at)
+    )
+    assert "ix_stage_vacancy_id_created_at" in await _used_indexes(db_session, query)
+
+
+@pytest.mark.asyncio
+async def test_refresh_lookups_use_indexes(
+    db_session: AsyncSession, seeded_user_ids: list[int]
+):
+    """Поиск действующих и истекших токенов идет по индексам refresh"""
+    valid_token = (
+        select(RefreshModel)
+        .where(
+            RefreshModel.user_id == seeded_user_ids[0],
+            RefreshModel.expires_at > func.now(),
+        )
+        .order_by(RefreshModel.created_at.desc())
+        .limit(1)
+    )
+    assert "ix_refresh_user_id_expires_at" in await _used_indexes(
+        db_session, valid_token
+    )
+
+    expired = select(RefreshModel.id).where(RefreshModel.expires_at <= func.now())
+    assert "ix_refresh_expires_at" in await _used_indexes(db_session, expired)
+
+
+@pytest.mark.asyncio
+async def test_search_uses_gin_indexes(
+    db_session: AsyncSession, seeded_user_ids: list[int]
+):
+    """Полнотекстовый поиск по вакансиям и заметкам идет по GIN-индексам"""
+    from app.core.search import build_tsquery
+
+    tsquery = build_tsquery("kubernetes")
+    by_vacancies = select(VacancyModel.id).where(
+        VacancyModel.user_id == seeded_user_ids[0],
+        VacancyModel.search_vector.bool_op("@@")(tsquery),
+    )
+    assert "ix_vacancy_search_vector" in await _used_indexes(db_session, by_vacancies)
+
+    by_notes = select(FavoriteModel.vacancy_id).where(
+        FavoriteModel.user_id == seeded_user_ids[0],
+        FavoriteModel.notes_vector.bool_op("@@")(tsquery),
+    )
+    assert "ix_favorite_notes_vector" in await _used_indexes(db_session, by_notes)
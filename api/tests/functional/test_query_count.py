@@ -0,0 +1,112 @@
+import pytest
+from fastapi import status
+
+from tests.common.api_client import AsyncTestAPIClient
+from tests.common.utils import assert_response_status, count_queries
+from tests.factories.base_factories import StageFactory, UserFactory, VacancyFactory
+
+
+def assert_query_count(statements: list[str], expected: int) -> None:
+    """Проверяет число запросов и показывает их при расхождении"""
+    assert len(statements) == expected, "\n".join(statements)
+
+
+@pytest.mark.asyncio
+async def test_writes_issue_minimal_queries(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+    vacancy_factory: VacancyFactory,
+    stage_factory: StageFactory,
+):
+    """Запись возвращает серверные поля через RETURNING без повторного SELECT"""
+    # INSERT пользователя и INSERT refresh токена, занятость username
+    # проверяет уникальное ограничение
+    with count_queries() as statements:
+        response = await async_client.register_user(user_factory.build_user_data())
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 2)
+    access_token = response.json()["access_token"]
+    async_client.set_auth_token(access_token)
+    user_id = async_client.get_user_id_from_token(access_token)
+
+    # INSERT вакансии и версия данных, автора проверяет внешний ключ
+    with count_queries() as statements:
+        response = await async_client.create_vacancy(
+            vacancy_factory.build_vacancy_data(user_id=user_id)
+        )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 2)
+    vacancy = response.json()
+    assert vacancy["created_at"] and vacancy["updated_at"]
+
+    # UPDATE вакансии и версия данных
+    with count_queries() as statements:
+        response = await async_client.update_vacancy(
+            vacancy["id"],
+            vacancy_factory.build_vacancy_data(user_id=user_id, name="Backend"),
+        )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 2)
+    assert response.json()["name"] == "Backend"
+    assert response.json()["created_at"] == vacancy["created_at"]
+
+    # Только INSERT этапа, вакансию проверяет внешний ключ
+    with count_queries() as statements:
+        response = await async_client.create_stage(
+            stage_factory.build_stage_data(vacancy_id=vacancy["id"])
+        )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 1)
+    stage_id = response.json()["id"]
+
+    # Только UPDATE этапа
+    with count_queries() as statements:
+        response = await async_client.update_stage(stage_id, {"title": "Финал"})
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 1)
+    assert response.json()["title"] == "Финал"
+
+    # Чтение этапа под блокировкой, upsert, блокировка и счетчик воронки,
+    # версия данных
+    with count_queries() as statements:
+        response = await async_client.update_favorite(
+            vacancy["id"], {"stage": "apply_sent"}
+        )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 5)
+
+    # Без смены этапа счетчики воронки не трогаются
+    with count_queries() as statements:
+        response = await async_client.update_favorite(
+            vacancy["id"], {"stage": "apply_sent", "notes": "Перезвонить"}
+        )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 3)
+    assert response.json() == {"stage": "apply_sent", "notes": "Перезвонить"}
+
+    # Без этапа старое значение не нужно: только upsert и версия данных
+    with count_queries() as statements:
+        response = await async_client.update_favorite(vacancy["id"], {"notes": "Ок"})
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 2)
+    assert response.json() == {"stage": "apply_sent", "notes": "Ок"}
+
+    # Только UPDATE пользователя, занятость username проверяет ограничение
+    with count_queries() as statements:
+        response = await async_client.update_telegram_username(
+            {"telegram_username": f"tg_{user_id}_query_count"}
+        )
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 1)
+
+    # DELETE ... RETURNING без предварительной проверки существования
+    with count_queries() as statements:
+        response = await async_client.delete_stage(stage_id)
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 1)
+
+    # DELETE избранного и вакансии, блокировка и счетчик воронки, версия данных
+    with count_queries() as statements:
+        response = await async_client.delete_vacancy(vacancy["id"])
+    assert_response_status(response, status.HTTP_200_OK)
+    assert_query_count(statements, 5)
@@ -0,0 +1,151 @@
+import pytest
+from fastapi import status
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import InMemoryResponseCache
+from app.models import StageModel, VacancyModel
+from app.schemas.stage import StageTypes
+from tests.common.api_client import AsyncTestAPIClient
+from tests.common.utils import assert_response_status
+from tests.factories.base_factories import StageFactory, UserFactory, VacancyFactory
+
+
+async def _load(value):
+    return value
+
+
+@pytest.mark.asyncio
+async def test_response_cache_evicts_least_recently_used():
+    """При переполнении вытесняется давно не использованный ответ"""
+    cache = InMemoryResponseCache(max_size=2)
+    await cache.get_or_load("user:1", "first", lambda: _load(1))
+    await cache.get_or_load("user:2", "second", lambda: _load(2))
+
+    assert await cache.get("user:1", "first") == 1  # first становится самым свежим
+    await cache.get_or_load("user:3", "third", lambda: _load(3))
+
+    assert await cache.get("user:2", "second") is None
+    assert await cache.get("user:1", "first") == 1
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_response_cache_invalidates_namespace():
+    """Сброс пространства удаляет только его значения"""
+    cache = InMemoryResponseCache(max_size=10)
+    await cache.get_or_load("user:1", "page:1", lambda: _load("a"))
+    await cache.get_or_load("user:1", "page:2", lambda: _load("b"))
+    await cache.get_or_load("user:2", "page:1", lambda: _load("c"))
+
+    await cache.invalidate("user:1")
+
+    assert await cache.get("user:1", "page:1") is None
+    assert await cache.get("user:1", "page:2") is None
+    assert await cache.get("user:2", "page:1") == "c"
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_value_loaded_before_invalidation():
+    """Ответ, загруженный до сброса пространства, в кеш не попадает"""
+    cache = InMemoryResponseCache(max_size=10)
+
+    async def load_with_concurrent_write():
+        await cache.invalidate("user:1")
+        return "stale"
+
+    assert (
+        await cache.get_or_load("user:1", "page", load_with_concurrent_write) == "stale"
+    )
+    assert await cache.get("user:1", "page") is None
+
+
+@pytest.mark.asyncio
+async def test_vacancies_cache_invalidated_on_favorite_update(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+    vacancy_factory: VacancyFactory,
+):
+    """Список вакансий показывает этап сразу после его изменения"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    access_token = register_response.json()["access_token"]
+    async_client.set_auth_token(access_token)
+    user_id = async_client.get_user_id_from_token(access_token)
+    response = await async_client.create_vacancy(
+        vacancy_factory.build_vacancy_data(user_id=user_id)
+    )
+    vacancy_id = response.json()["id"]
+
+    response = await async_client.get_vacancies()
+    assert response.json()["items"][0]["stage"] == "nothing"
+
+    await async_client.update_favorite(vacancy_id, {"stage": "apply_sent"})
+    response = await async_client.get_vacancies()
+    assert response.json()["items"][0]["stage"] == "apply_sent"
+
+    # Новая вакансия сбрасывает закешированную страницу
+    await async_client.create_vacancy(
+        vacancy_factory.build_vacancy_data(user_id=user_id)
+    )
+    response = await async_client.get_vacancies()
+    assert len(response.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_stages_cache_invalidated_on_stage_changes(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+    vacancy_factory: VacancyFactory,
+    stage_factory: StageFactory,
+):
+    """Этапы вакансии обновляются после создания и удаления этапа"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    access_token = register_response.json()["access_token"]
+    async_client.set_auth_token(access_token)
+    user_id = async_client.get_user_id_from_token(access_token)
+    response = await async_client.create_vacancy(
+        vacancy_factory.build_vacancy_data(user_id=user_id)
+    )
+    vacancy_id = response.json()["id"]
+
+    assert (await async_client.get_stages_by_vacancy_id(vacancy_id)).json() == []
+
+    response = await async_client.create_stage(
+        stage_factory.build_stage_data(vacancy_id=vacancy_id)
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    stage_id = response.json()["id"]
+    stages = (await async_client.get_stages_by_vacancy_id(vacancy_id)).json()
+    assert [stage["id"] for stage in stages] == [stage_id]
+
+    await async_client.delete_stage(stage_id)
+    assert (await async_client.get_stages_by_vacancy_id(vacancy_id)).json() == []
+
+
+@pytest.mark.asyncio
+async def test_cached_body_follows_etag_version(
+    async_client: AsyncTestAPIClient, db_session: AsyncSession
+):
+    """Изменение, еще не сбросившее кэш, не оставляет старое тело под новым ETag"""
+    _, (vacancy_id,) = await async_client.create_user_with_vacancies(1)
+    vacancy = await async_client.get_vacancy(vacancy_id)
+    stages = await async_client.get_stages_by_vacancy_id(vacancy_id)
+
+    # Запись в обход сервисов: коммит уже прошел, а invalidate еще не вызван
+    await db_session.execute(
+        update(VacancyModel)
+        .where(VacancyModel.id == vacancy_id)
+        .values(name="Переименованная вакансия")
+    )
+    await db_session.execute(
+        insert(StageModel).values(vacancy_id=vacancy_id, stage_type=StageTypes.HR)
+    )
+    await db_session.commit()
+
+    response = await async_client.get_vacancy(vacancy_id)
+    assert response.headers["etag"] != vacancy.headers["etag"]
+    assert response.json()["name"] == "Переименованная вакансия"
+
+    response = await async_client.get_stages_by_vacancy_id(vacancy_id)
+    assert response.headers["etag"] != stages.headers["etag"]
+    assert [stage["stage_type"] for stage in response.json()] == ["hr"]
@@ -0,0 +1,61 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.core.responses import schema_response
+from app.schemas.stage import STAGE_LIST_ADAPTER
+from app.schemas.vacancy import VACANCY_PAGE_ADAPTER, VacancyPageSchema
+
+
+def test_schema_response_matches_model_dump():
+    """Тело ответа совпадает с JSON-дампом схемы"""
+    page = VacancyPageSchema.model_validate(
+        {
+            "items": [
+                {
+                    "id": 1,
+                    "user_id": 2,
+                    "name": "Python-разработчик",
+                    "link": "https://example.com",
+                    "created_at": datetime(2026, 1, 1, 12, 30),
+                    "updated_at": datetime(2026, 1, 2),
+                }
+            ],
+            "next_cursor": None,
+        }
+    )
+
+    response = schema_response(VACANCY_PAGE_ADAPTER, page, headers={"ETag": '"v1"'})
+
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == '"v1"'
+    assert json.loads(response.body) == page.model_dump(mode="json")
+    assert json.loads(response.body)["items"][0]["stage"] == "nothing"
+
+
+def test_schema_response_validates_orm_objects():
+    """ORM-объекты валидируются по схеме один раз при from_attributes"""
+    stage = SimpleNamespace(
+        id=1,
+        vacancy_id=3,
+        stage_type="hr",
+        title="Звонок с HR",
+        description=None,
+        created_at=datetime(2026, 1, 1),
+        updated_at=datetime(2026, 1, 1),
+    )
+
+    response = schema_response(STAGE_LIST_ADAPTER, [stage], from_attributes=True)
+
+    body = json.loads(response.body)
+    assert body == [
+        {
+            "vacancy_id": 3,
+            "stage_type": "hr",
+            "title": "Звонок с HR",
+            "description": None,
+            "id": 1,
+            "created_at": "2026-01-01T00:00:00",
+            "updated_at": "2026-01-01T00:00:00",
+        }
+    ]
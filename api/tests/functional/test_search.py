@@ -0,0 +1,139 @@
+import pytest
+from fastapi import status
+
+from tests.common.api_client import AsyncTestAPIClient
+from tests.common.utils import assert_response_status
+from tests.factories.base_factories import UserFactory
+
+# Случайный текст вакансий мог бы случайно совпасть с запросом
+NO_RANDOM_TEXT = {"company_name": None, "description": None, "requirements": None}
+
+
+@pytest.mark.asyncio
+async def test_search_vacancies_by_text_and_notes(async_client: AsyncTestAPIClient):
+    """Поиск учитывает морфологию обоих языков и заметки к вакансиям"""
+    _, (python_id, java_id, notes_id) = await async_client.create_user_with_vacancies(
+        [
+            {
+                "name": "Python-разработчик",
+                "description": "Разрабатываем сервисы для платежей",
+            },
+            {"name": "Java Developer", "requirements": "Experience with Kafka"},
+            {"name": "Аналитик данных"},
+        ],
+        **NO_RANDOM_TEXT,
+    )
+    response = await async_client.update_favorite(
+        notes_id, {"notes": "Созвонились с рекрутером, ждем тестовое"}
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+
+    response = await async_client.search_vacancies("разработчика")
+    assert_response_status(response, status.HTTP_200_OK)
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [python_id]
+    assert "<mark>" in items[0]["name_highlight"]
+
+    response = await async_client.search_vacancies("developers kafka")
+    assert [item["id"] for item in response.json()["items"]] == [java_id]
+
+    response = await async_client.search_vacancies("рекрутер", highlight=False)
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [notes_id]
+    assert items[0]["notes"].startswith("Созвонились")
+    assert items[0]["name_highlight"] is None
+
+    response = await async_client.search_vacancies("-разработчик")
+    assert python_id not in [item["id"] for item in response.json()["items"]]
+
+
+@pytest.mark.asyncio
+async def test_search_vacancies_ranking_and_pagination(
+    async_client: AsyncTestAPIClient,
+):
+    """Совпадение в названии ранжируется выше, страницы не пересекаются"""
+    _, vacancy_ids = await async_client.create_user_with_vacancies(
+        [
+            {"name": "Менеджер", "description": "Нужен опыт с Kubernetes"},
+            {"name": "Kubernetes Engineer"},
+            {"name": "DevOps", "requirements": "Kubernetes, Terraform"},
+        ],
+        **NO_RANDOM_TEXT,
+    )
+
+    received = []
+    cursor = None
+    while True:
+        response = await async_client.search_vacancies(
+            "kubernetes", limit=1, cursor=cursor
+        )
+        assert_response_status(response, status.HTTP_200_OK)
+        data = response.json()
+        received.extend(data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [item["id"] for item in received] == [
+        vacancy_ids[1],
+        vacancy_ids[2],
+        vacancy_ids[0],
+    ]
+    ranks = [item["rank"] for item in received]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_search_vacancies_only_own(async_client: AsyncTestAPIClient):
+    """Поиск не возвращает вакансии других пользователей"""
+    await async_client.create_user_with_vacancies(
+        [{"name": "Rust Engineer"}], **NO_RANDOM_TEXT
+    )
+    await async_client.create_user_with_vacancies([])
+
+    response = await async_client.search_vacancies("rust")
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_vacancies_highlight_escapes_html(
+    async_client: AsyncTestAPIClient,
+):
+    """Подсветка экранирует HTML из текста вакансии, <mark> остается разметкой"""
+    await async_client.create_user_with_vacancies(
+        [
+            {
+                "name": "<script>alert(1)</script> Rust Engineer",
+                # Незакрытый тег парсер tsvector не распознает как тег
+                "description": "Rust <img src=x onerror=alert(1)//",
+            }
+        ],
+        **NO_RANDOM_TEXT,
+    )
+
+    response = await async_client.search_vacancies("rust")
+    assert_response_status(response, status.HTTP_200_OK)
+    (item,) = response.json()["items"]
+    assert item["name"] == "<script>alert(1)</script> Rust Engineer"
+    for highlight in (item["name_highlight"], item["description_highlight"]):
+        assert "<mark>Rust</mark>" in highlight
+        # Кроме <mark> в подсветке не остается ни одного тега
+        without_marks = highlight.replace("<mark>", "").replace("</mark>", "")
+        assert "<" not in without_marks and ">" not in without_marks
+    assert "&lt;img" in item["description_highlight"]
+
+
+@pytest.mark.asyncio
+async def test_search_vacancies_validation(
+    async_client: AsyncTestAPIClient, user_factory: UserFactory
+):
+    """Пустой запрос и битый курсор отклоняются"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    async_client.set_auth_token(register_response.json()["access_token"])
+
+    response = await async_client.search_vacancies("")
+    assert_response_status(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    response = await async_client.search_vacancies("python", cursor="not-a-cursor")
+    assert_response_status(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core.principal import CurrentUser
+from app.core.security import verify_password
+from app.core.token_cache import VerifiedTokenCache
+from app.core.worker_pool import BoundedWorkerPool
+from app.exceptions import PasswordHashingBusyException
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_rejects_when_queue_is_full():
+    """Переполненный пул сразу отклоняет задачу, а не ставит ее в очередь"""
+    pool = BoundedWorkerPool(
+        max_workers=1,
+        queue_size=1,
+        thread_name_prefix="test",
+        busy_exception=PasswordHashingBusyException,
+    )
+    try:
+        running = asyncio.create_task(pool.run(time.sleep, 0.2))
+        queued = asyncio.create_task(pool.run(time.sleep, 0.2))
+        await asyncio.sleep(0)
+        assert pool.in_flight == 2
+
+        started = time.monotonic()
+        with pytest.raises(PasswordHashingBusyException):
+            await pool.run(time.sleep, 0.2)
+        assert time.monotonic() - started < 0.1
+
+        await asyncio.gather(running, queued)
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_keeps_slot_of_cancelled_task_until_it_finishes():
+    """Отмена ожидающего не освобождает место, пока поток еще работает"""
+    pool = BoundedWorkerPool(
+        max_workers=1,
+        queue_size=0,
+        thread_name_prefix="test",
+        busy_exception=PasswordHashingBusyException,
+    )
+    release = threading.Event()
+    try:
+        task = asyncio.create_task(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert pool.in_flight == 1
+        with pytest.raises(PasswordHashingBusyException):
+            await pool.run(time.sleep, 0)
+
+        release.set()
+        for _ in range(100):
+            if pool.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.in_flight == 0
+        await pool.run(time.sleep, 0)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_verify_password_returns_rehash_for_outdated_cost():
+    """Хеш с устаревшей стоимостью bcrypt пересчитывается при проверке"""
+    cheap_context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4)
+    old_hash = cheap_context.hash("password123")
+
+    is_valid, new_hash = await verify_password("password123", old_hash)
+    assert is_valid
+    assert new_hash is not None and new_hash != old_hash
+
+    # Новый хеш уже соответствует текущим настройкам
+    is_valid, rehashed = await verify_password("password123", new_hash)
+    assert is_valid
+    assert rehashed is None
+
+    is_valid, _ = await verify_password("wrong-password", new_hash)
+    assert not is_valid
+
+
+def test_token_cache_expires_at_token_exp():
+    """Запись кеша перестает действовать в момент exp токена"""
+    cache = VerifiedTokenCache(max_size=10)
+    user = CurrentUser(id=1, username="cached")
+
+    cache.put("fresh", user, time.time() + 60)
+    cache.put("expired", user, time.time() - 1)
+
+    assert cache.get("fresh") is user
+    assert cache.get("expired") is None
+    assert len(cache) == 1
+
+
+def test_token_cache_evicts_least_recently_used():
+    """При переполнении вытесняется давно не использованный токен"""
+    cache = VerifiedTokenCache(max_size=2)
+    expires_at = time.time() + 60
+    cache.put("first", CurrentUser(id=1, username="first"), expires_at)
+    cache.put("second", CurrentUser(id=2, username="second"), expires_at)
+
+    assert cache.get("first") is not None  # first становится самым свежим
+    cache.put("third", CurrentUser(id=3, username="third"), expires_at)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+
+
+def test_current_user_is_immutable():
+    """Пользователь запроса неизменяем и не имеет __dict__"""
+    user = CurrentUser(id=1, username="frozen")
+    with pytest.raises(AttributeError):
+        user.id = 2
+    assert not hasattr(user, "__dict__")
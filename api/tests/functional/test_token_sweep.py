@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import metrics
+from app.database import AsyncSessionLocal
+from app.models import RefreshModel, UserDeletionModel
+from app.repositories.auth_repository import TOKEN_SWEEP_LOCK_NAMESPACE
+from app.services.token_sweep_service import TokenSweepService
+from tests.common.api_client import AsyncTestAPIClient
+from tests.factories.base_factories import UserFactory
+
+
+async def _create_user_with_tokens(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+    db_session: AsyncSession,
+    expired: int,
+    active: int,
+) -> int:
+    """Регистрирует пользователя и добавляет ему истекшие и действующие токены"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    user_id = async_client.get_user_id_from_token(
+        register_response.json()["access_token"]
+    )
+    now = datetime.utcnow()
+    await db_session.execute(
+        insert(RefreshModel),
+        [
+            {
+                "user_id": user_id,
+                "token_hash": f"{user_id:016x}{index:048x}",
+                "expires_at": now + timedelta(days=-1 if index < expired else index),
+            }
+            for index in range(expired + active)
+        ],
+    )
+    await db_session.commit()
+    return user_id
+
+
+async def _count_tokens(db_session: AsyncSession, user_id: int) -> tuple[int, int]:
+    """Количество истекших и действующих токенов пользователя"""
+    result = await db_session.execute(
+        select(
+            func.count().filter(RefreshModel.expires_at <= datetime.utcnow()),
+            func.count().filter(RefreshModel.expires_at > datetime.utcnow()),
+        ).where(RefreshModel.user_id == user_id)
+    )
+    return tuple(result.one())
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_expired_and_excess_tokens(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+    db_session: AsyncSession,
+):
+    """Проход пачками удаляет истекшие токены и старые сессии сверх лимита"""
+    user_id = await _create_user_with_tokens(
+        async_client, user_factory, db_session, expired=5, active=6
+    )
+    expired_before = metrics.get("token_sweep.expired_deleted")
+    runs_before = metrics.get("token_sweep.runs")
+
+    sweeper = TokenSweepService(
+        AsyncSessionLocal, interval_seconds=3600, batch_size=2, max_tokens_per_user=3
+    )
+    removed = await sweeper.sweep()
+
+    # Кроме добавленных есть токен регистрации, он свежее остальных
+    assert removed["expired"] >= 5
+    assert removed["excess"] >= 4
+    assert await _count_tokens(db_session, user_id) == (0, 3)
+    result = await db_session.execute(
+        select(RefreshModel.token_hash).where(
+            RefreshModel.user_id == user_id,
+            RefreshModel.token_hash.like(f"{user_id:016x}%"),
+        )
+    )
+    # Остаются сессии с самым поздним сроком действия
+    assert {int(token_hash[16:], 16) for token_hash in result.scalars()} == {9, 10}
+
+    assert metrics.get("token_sweep.expired_deleted") >= expired_before + 5
+    assert metrics.get("token_sweep.runs") == runs_before + 1
+    assert metrics.get("token_sweep.last_run_seconds") > 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_skipped_while_other_worker_holds_lock(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+    db_session: AsyncSession,
+):
+    """Пока блокировку держит другой воркер, проход ничего не удаляет"""
+    user_id = await _create_user_with_tokens(
+        async_client, user_factory, db_session, expired=2, active=0
+    )
+    skipped_before = metrics.get("token_sweep.skipped_locked")
+    sweeper = TokenSweepService(
+        AsyncSessionLocal, interval_seconds=3600, batch_size=100, max_tokens_per_user=3
+    )
+
+    async with AsyncSessionLocal() as other_worker:
+        await other_worker.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, 0)"),
+            {"namespace": TOKEN_SWEEP_LOCK_NAMESPACE},
+        )
+        assert await sweeper.sweep() is None
+        assert metrics.get("token_sweep.skipped_locked") == skipped_before + 1
+        assert await _count_tokens(db_session, user_id) == (2, 1)
+        await other_worker.rollback()
+
+    removed = await sweeper.sweep()
+    assert removed["expired"] >= 2
+    assert await _count_tokens(db_session, user_id) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_outdated_user_deletions(db_session: AsyncSession):
+    """Записи об удалении пользователей старше срока хранения удаляются"""
+    outdated_id, recent_id = 10**12 + 1, 10**12 + 2
+    now = datetime.utcnow()
+    await db_session.execute(
+        insert(UserDeletionModel),
+        [
+            {"user_id": outdated_id, "deleted_at": now - timedelta(hours=25)},
+            {"user_id": recent_id, "deleted_at": now - timedelta(hours=1)},
+        ],
+    )
+    await db_session.commit()
+
+    sweeper = TokenSweepService(
+        AsyncSessionLocal,
+        interval_seconds=3600,
+        batch_size=100,
+        max_tokens_per_user=3,
+        deletion_retention_hours=24,
+    )
+    removed = await sweeper.sweep()
+
+    assert removed["deletions"] >= 1
+    result = await db_session.execute(
+        select(UserDeletionModel.user_id).where(
+            UserDeletionModel.user_id.in_([outdated_id, recent_id])
+        )
+    )
+    assert result.scalars().all() == [recent_id]
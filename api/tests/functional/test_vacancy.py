@@ -1,6 +1,16 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi import status
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import importing
+from app.models import StageModel
+from app.schemas.stage import StageTypes
 from tests.common.api_client import AsyncTestAPIClient
 from tests.common.utils import (
     assert_response_contains,
@@ -116,10 +126,65 @@ async def test_get_vacancies_success(
     response = await async_client.get_vacancies()
     assert_response_status(response, status.HTTP_200_OK)
 
-    # Проверяем, что получили список
+    # Проверяем, что получили страницу
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) == 3  # Должно быть 3 вакансии
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) == 3  # Должно быть 3 вакансии
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_vacancies_pagination(
+    async_client: AsyncTestAPIClient,
+    vacancy_factory: VacancyFactory,
+    user_factory: UserFactory,
+):
+    """Тест постраничного получения вакансий по курсору"""
+    user_data = user_factory.build_user_data()
+    register_response = await async_client.register_user(user_data)
+    assert_response_status(register_response, status.HTTP_200_OK)
+
+    access_token = register_response.json().get("access_token")
+    async_client.set_auth_token(access_token)
+    user_id = async_client.get_user_id_from_token(access_token)
+
+    created_ids = []
+    for _ in range(5):
+        vacancy_data = vacancy_factory.build_vacancy_data(user_id=user_id)
+        create_response = await async_client.create_vacancy(vacancy_data)
+        assert_response_status(create_response, status.HTTP_200_OK)
+        created_ids.append(create_response.json()["id"])
+
+    # Обходим все страницы по 2 вакансии
+    received_ids = []
+    cursor = None
+    while True:
+        response = await async_client.get_vacancies(limit=2, cursor=cursor)
+        assert_response_status(response, status.HTTP_200_OK)
+        data = response.json()
+        assert len(data["items"]) <= 2
+        received_ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    # Новые вакансии идут первыми, без пропусков и повторов
+    assert received_ids == list(reversed(created_ids))
+
+
+@pytest.mark.asyncio
+async def test_get_vacancies_invalid_cursor(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+):
+    """Тест получения вакансий с некорректным курсором"""
+    user_data = user_factory.build_user_data()
+    register_response = await async_client.register_user(user_data)
+    assert_response_status(register_response, status.HTTP_200_OK)
+    async_client.set_auth_token(register_response.json().get("access_token"))
+
+    response = await async_client.get_vacancies(cursor="not-a-cursor")
+    assert_response_status(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
 
 
 @pytest.mark.asyncio
@@ -141,10 +206,10 @@ async def test_get_vacancies_empty_for_new_user(
     response = await async_client.get_vacancies()
     assert_response_status(response, status.HTTP_200_OK)
 
-    # Проверяем, что получили пустой список
+    # Проверяем, что получили пустую страницу
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) == 0  # У нового пользователя нет вакансий
+    assert data["items"] == []  # У нового пользователя нет вакансий
+    assert data["next_cursor"] is None
 
 
 @pytest.mark.asyncio
@@ -270,3 +335,358 @@ async def test_vacancy_validation_errors(async_client: AsyncTestAPIClient):
     }
     response = await async_client.create_vacancy(invalid_data)
     assert_response_status(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+@pytest.mark.asyncio
+async def test_create_vacancies_bulk_reports_each_item(
+    async_client: AsyncTestAPIClient,
+    vacancy_factory: VacancyFactory,
+    user_factory: UserFactory,
+):
+    """Тест пакетного создания вакансий с отчетом по каждой позиции"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    assert_response_status(register_response, status.HTTP_200_OK)
+    access_token = register_response.json().get("access_token")
+    user_id = async_client.get_user_id_from_token(access_token)
+
+    items = [
+        vacancy_factory.build_vacancy_data(user_id=user_id),
+        vacancy_factory.build_vacancy_data(user_id=user_id, name=""),
+        vacancy_factory.build_vacancy_data(user_id=10**12),
+        vacancy_factory.build_vacancy_data(user_id=user_id),
+    ]
+    response = await async_client.create_vacancies(items)
+    assert_response_status(response, status.HTTP_200_OK)
+
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    results = data["items"]
+    assert [item["index"] for item in results] == [0, 1, 2, 3]
+    assert [item["success"] for item in results] == [True, False, False, True]
+    assert results[0]["id"] < results[3]["id"]
+    assert "name" in results[1]["error"]
+    assert results[2]["error"] == "Пользователь не найден"
+
+
+async def _create_vacancies_for_filters(async_client: AsyncTestAPIClient) -> list[int]:
+    """Создает пользователя с вакансиями в разных компаниях, локациях и этапах"""
+    _, vacancy_ids = await async_client.create_user_with_vacancies(
+        [
+            {"company_name": "Ozon", "location": "Москва", "employment": "remote"},
+            {"company_name": "Ozon", "location": "Москва", "employment": "office"},
+            {"company_name": "Avito", "location": "Москва", "employment": "remote"},
+            {"company_name": "Avito", "location": None, "employment": "remote"},
+        ]
+    )
+    response = await async_client.update_favorite(
+        vacancy_ids[0], {"stage": "hr_interview"}
+    )
+    assert_response_status(response, status.HTTP_200_OK)
+    return vacancy_ids
+
+
+@pytest.mark.asyncio
+async def test_get_vacancies_filters(async_client: AsyncTestAPIClient):
+    """Тест фильтрации списка вакансий на сервере"""
+    vacancy_ids = await _create_vacancies_for_filters(async_client)
+
+    response = await async_client.get_vacancies(company_name=["Ozon"])
+    assert_response_status(response, status.HTTP_200_OK)
+    assert {item["id"] for item in response.json()["items"]} == set(vacancy_ids[:2])
+
+    # Значения одного фильтра объединяются через OR, разные фильтры - через AND
+    response = await async_client.get_vacancies(
+        company_name=["Ozon", "Avito"], employment=["remote"], location=["Москва"]
+    )
+    assert {item["id"] for item in response.json()["items"]} == {
+        vacancy_ids[0],
+        vacancy_ids[2],
+    }
+
+    response = await async_client.get_vacancies(stage=["hr_interview"])
+    assert [item["id"] for item in response.json()["items"]] == [vacancy_ids[0]]
+
+    # Вакансии без записи в избранном находятся на этапе nothing
+    response = await async_client.get_vacancies(stage=["nothing"])
+    assert {item["id"] for item in response.json()["items"]} == set(vacancy_ids[1:])
+
+    response = await async_client.get_vacancies(stage=["unknown"])
+    assert_response_status(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+@pytest.mark.asyncio
+async def test_get_vacancy_facets(async_client: AsyncTestAPIClient):
+    """Тест счетчиков вакансий по значениям фильтров"""
+    await _create_vacancies_for_filters(async_client)
+
+    response = await async_client.get_vacancy_facets()
+    assert_response_status(response, status.HTTP_200_OK)
+    facets = response.json()
+    assert facets["company_name"] == [
+        {"value": "Avito", "count": 2},
+        {"value": "Ozon", "count": 2},
+    ]
+    assert facets["location"] == [
+        {"value": "Москва", "count": 3},
+        {"value": None, "count": 1},
+    ]
+    assert facets["stage"] == [
+        {"value": "nothing", "count": 3},
+        {"value": "hr_interview", "count": 1},
+    ]
+    assert facets["status"] == [{"value": "draft", "count": 4}]
+
+    # Фильтр по компании сужает остальные измерения, но не само себя
+    response = await async_client.get_vacancy_facets(company_name=["Ozon"])
+    facets = response.json()
+    assert facets["company_name"] == [
+        {"value": "Avito", "count": 2},
+        {"value": "Ozon", "count": 2},
+    ]
+    assert facets["employment"] == [
+        {"value": "office", "count": 1},
+        {"value": "remote", "count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_vacancies_compact_view(
+    async_client: AsyncTestAPIClient,
+    vacancy_factory: VacancyFactory,
+    user_factory: UserFactory,
+):
+    """Компактный список не содержит длинных текстов и отдает начало описания"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    access_token = register_response.json()["access_token"]
+    async_client.set_auth_token(access_token)
+    user_id = async_client.get_user_id_from_token(access_token)
+
+    description = "Разработка   сервисов\nплатежей. " + "Подробности. " * 40
+    vacancy_data = vacancy_factory.build_vacancy_data(
+        user_id=user_id, description=description, requirements="Python"
+    )
+    create_response = await async_client.create_vacancy(vacancy_data)
+    vacancy_id = create_response.json()["id"]
+    await async_client.update_favorite(vacancy_id, {"stage": "hr_interview"})
+
+    response = await async_client.get_vacancies(view="compact")
+    assert_response_status(response, status.HTTP_200_OK)
+    item = response.json()["items"][0]
+
+    assert item["id"] == vacancy_id
+    assert item["name"] == vacancy_data["name"]
+    assert item["stage"] == "hr_interview"
+    assert item["description_snippet"].startswith("Разработка сервисов платежей.")
+    assert len(item["description_snippet"]) == 200
+    for heavy_field in ("description", "requirements", "conditions", "notes"):
+        assert heavy_field not in item
+
+    # Полный вид по-прежнему отдает все поля
+    response = await async_client.get_vacancies()
+    assert response.json()["items"][0]["description"] == description
+
+    response = await async_client.get_vacancies(view="unknown")
+    assert_response_status(response, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+@pytest.mark.asyncio
+async def test_export_vacancies_with_history(
+    async_client: AsyncTestAPIClient,
+    db_session: AsyncSession,
+):
+    """Выгрузка содержит этап, заметки и хронологию этапов каждой вакансии"""
+    user_id, vacancy_ids = await async_client.create_user_with_vacancies(3)
+    await async_client.update_favorite(
+        vacancy_ids[0], {"stage": "hr_interview", "notes": "Созвон в пятницу"}
+    )
+    now = datetime.utcnow()
+    await db_session.execute(
+        insert(StageModel),
+        [
+            {
+                "vacancy_id": vacancy_ids[0],
+                "stage_type": stage_type,
+                "description": f"Этап {index}",
+                "created_at": now + timedelta(minutes=index),
+            }
+            for index, stage_type in enumerate((StageTypes.HR, StageTypes.TECH))
+        ],
+    )
+    await db_session.commit()
+
+    response = await async_client.export_vacancies()
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "vacancies.ndjson" in response.headers["content-disposition"]
+    items = async_client.parse_ndjson(response)
+
+    assert [item["id"] for item in items] == vacancy_ids
+    assert all(item["user_id"] == user_id for item in items)
+    first = items[0]
+    assert first["stage"] == "hr_interview"
+    assert first["notes"] == "Созвон в пятницу"
+    assert [stage["stage_type"] for stage in first["stages"]] == ["hr", "tech"]
+    assert [stage["description"] for stage in first["stages"]] == ["Этап 0", "Этап 1"]
+    assert items[1]["stage"] == "nothing"
+    assert items[1]["stages"] == []
+
+    # В CSV хронология этапов лежит в одной ячейке JSON-массивом
+    response = await async_client.export_vacancies({"format": "csv", "limit": 1})
+    assert_response_status(response, status.HTTP_200_OK)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == vacancy_ids[:1]
+    assert len(json.loads(rows[0]["stages"])) == 2
+
+    # Продолжение по курсору отдает оставшиеся вакансии
+    response = await async_client.export_vacancies(
+        {"cursor": response.headers["X-Next-Cursor"]}
+    )
+    items = async_client.parse_ndjson(response)
+    assert [item["id"] for item in items] == vacancy_ids[1:]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_export_vacancies_only_own(async_client: AsyncTestAPIClient):
+    """Выгрузка не содержит чужих вакансий"""
+    for _ in range(2):
+        user_id, _ = await async_client.create_user_with_vacancies(1)
+
+    response = await async_client.export_vacancies()
+    assert_response_status(response, status.HTTP_200_OK)
+    items = async_client.parse_ndjson(response)
+    assert len(items) == 1
+    assert items[0]["user_id"] == user_id
+
+
+@pytest.mark.asyncio
+async def test_import_vacancies_ndjson_with_report(
+    async_client: AsyncTestAPIClient, user_factory: UserFactory
+):
+    """Импорт загружает корректные записи, ошибочные попадают в отчет"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    access_token = register_response.json()["access_token"]
+    async_client.set_auth_token(access_token)
+    user_id = async_client.get_user_id_from_token(access_token)
+
+    lines = [
+        {
+            "name": "Python-разработчик",
+            "link": "example.com/1",
+            "stage": "hr_interview",
+        },
+        {"name": "", "link": "example.com/2"},
+        {"name": "Go-разработчик", "link": "https://example.com/3", "notes": "Позже"},
+        {"name": "Аналитик", "link": "example.com/4", "stage": "unknown"},
+        {"name": "DevOps", "link": "example.com/5", "status": "published"},
+    ]
+    content = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+    content += "\n\nне json\n"
+
+    response = await async_client.import_vacancies(content, "ndjson")
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert report["imported"] == 3
+    assert report["failed"] == 3
+    assert [error["row"] for error in report["errors"]] == [2, 4, 6]
+    assert report["errors"][0]["error"].startswith("name:")
+
+    response = await async_client.export_vacancies()
+    items = {item["name"]: item for item in async_client.parse_ndjson(response)}
+    assert set(items) == {"Python-разработчик", "Go-разработчик", "DevOps"}
+    assert all(item["user_id"] == user_id for item in items.values())
+    assert items["Python-разработчик"]["link"] == "https://example.com/1"
+    assert items["Python-разработчик"]["stage"] == "hr_interview"
+    assert items["Go-разработчик"]["notes"] == "Позже"
+    assert items["Go-разработчик"]["stage"] == "nothing"
+    assert items["DevOps"]["status"] == "published"
+
+    # Счетчики воронки учитывают импортированное избранное
+    stats = (await async_client.get_funnel_stats()).json()
+    assert stats["stages"]["hr_interview"] == 1
+    assert stats["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_import_vacancies_csv(
+    async_client: AsyncTestAPIClient, user_factory: UserFactory
+):
+    """CSV с многострочными значениями и пустыми ячейками"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    async_client.set_auth_token(register_response.json()["access_token"])
+
+    content = (
+        "name,link,company_name,notes\r\n"
+        'Backend,example.com/1,Ozon,"Первая строка\nвторая ""в кавычках"""\r\n'
+        "Frontend,example.com/2,,\r\n"
+        "Без ссылки\r\n"
+    )
+    response = await async_client.import_vacancies(content, "csv")
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["errors"] == [
+        {"row": 3, "error": "Ожидалось колонок: 4, получено: 1"}
+    ]
+
+    response = await async_client.export_vacancies()
+    items = {item["name"]: item for item in async_client.parse_ndjson(response)}
+    assert items["Backend"]["notes"] == 'Первая строка\nвторая "в кавычках"'
+    assert items["Backend"]["company_name"] == "Ozon"
+    assert items["Frontend"]["company_name"] is None
+    assert items["Frontend"]["notes"] is None
+
+
+@pytest.mark.asyncio
+async def test_import_vacancies_nothing_valid(
+    async_client: AsyncTestAPIClient, user_factory: UserFactory
+):
+    """Файл без корректных записей ничего не создает"""
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    async_client.set_auth_token(register_response.json()["access_token"])
+
+    response = await async_client.import_vacancies('{"name": "Без ссылки"}\n', "ndjson")
+    assert_response_status(response, status.HTTP_200_OK)
+    assert response.json()["imported"] == 0
+    assert response.json()["failed"] == 1
+
+    response = await async_client.export_vacancies()
+    assert async_client.parse_ndjson(response) == []
+
+
+@pytest.mark.asyncio
+async def test_import_vacancies_too_long_line(
+    async_client: AsyncTestAPIClient,
+    user_factory: UserFactory,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Строка длиннее лимита попадает в отчет, остальные записи загружаются"""
+    monkeypatch.setattr(importing, "MAX_RECORD_SIZE", 200)
+    register_response = await async_client.register_user(user_factory.build_user_data())
+    async_client.set_auth_token(register_response.json()["access_token"])
+
+    content = (
+        '{"name": "Backend", "link": "example.com/1"}\n'
+        + '{"name": "'
+        + "x" * 1000
+        + '"}\n'
+        + '{"name": "Frontend", "link": "example.com/2"}\n'
+        + '{"name": "'
+        + "y" * 1000
+    )
+    response = await async_client.import_vacancies(content, "ndjson")
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["errors"] == [
+        {"row": 2, "error": "Слишком длинная запись"},
+        {"row": 4, "error": "Слишком длинная запись"},
+    ]
+
+    content = "name,link\n" + "z" * 1000 + ",example.com/3\nQA,example.com/4\n"
+    response = await async_client.import_vacancies(content, "csv")
+    assert_response_status(response, status.HTTP_200_OK)
+    report = response.json()
+    assert report["imported"] == 1
+    assert report["errors"] == [{"row": 1, "error": "Слишком длинная запись"}]
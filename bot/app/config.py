@@ -12,6 +12,21 @@ class AppConfig(BaseSettings):
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
     api_url: str
+    api_connection_limit: int = 20  # Максимум одновременных соединений с API
+    api_keepalive_timeout: float = 30.0
+    api_connect_timeout: float = 3.0
+    api_read_timeout: float = 10.0
+    api_total_timeout: float = 15.0
+
+    # Кеш telegram_username -> user_id
+    user_cache_size: int = 10000
+    user_cache_ttl: float = 300.0
+    user_cache_negative_ttl: float = 30.0  # Для незарегистрированных пользователей
+    user_cache_sync_interval: float = 15.0  # Опрос изменений привязок в API
+
+    # Пакетная отправка пересланных вакансий
+    forward_batch_window: float = 2.0  # Сколько ждать следующих сообщений, сек
+    forward_batch_max_size: int = 50
 
     telegram_bot_token: str
 
@@ -4,11 +4,10 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
-from app.services.api_client import APIClient
+from app.services.api_client import api_client
 
 logger = logging.getLogger(__name__)
 router = Router()
-api_client = APIClient()
 
 
 @router.message(Command("my_vacancies"))
@@ -16,24 +15,27 @@ async def cmd_my_vacancies(message: Message):
     """Показывает все вакансии пользователя"""
     # Проверяем, знаем ли пользователя
     username = message.from_user.username
-    if not username or not await api_client.get_user_by_telegram_username(username):
+    user_id = (
+        await api_client.get_user_by_telegram_username(username) if username else None
+    )
+    if not user_id:
         await message.answer(
             "Вы не зарегистрированы в системе. Пожалуйста, перейдите на сайт https://applyr.vladsergeichev.ru и зарегистрируйтесь, используя ваш Telegram username. После этого вы сможете пользоваться ботом."
         )
         return
     try:
-        # Используем username пользователя, если он есть, иначе используем user_id как строку
-        applies = await api_client.get_user_applies(username)
+        # Запрашиваем только первую страницу - больше 10 вакансий не показываем
+        applies, next_cursor = await api_client.get_user_applies(user_id, limit=10)
 
         if applies:
             text = "📋 <b>Ваши вакансии:</b>\n\n"
-            for i, apply in enumerate(applies[:10], 1):  # Показываем первые 10
+            for i, apply in enumerate(applies, 1):
                 text += f"{i}. <b>{apply['name']}</b>\n"
                 text += f"   📅 {apply['created_at'][:10]}\n"
                 text += f"   🔗 <a href=\"{apply['link']}\">Ссылка</a>\n\n"
 
-            if len(applies) > 10:
-                text += f"... и еще {len(applies) - 10} вакансий"
+            if next_cursor:
+                text += "... остальные вакансии доступны на сайте"
         else:
             text = (
                 "У вас пока нет сохраненных вакансий. Перешлите сообщение с вакансией!"
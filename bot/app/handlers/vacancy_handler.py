@@ -3,12 +3,12 @@ import logging
 from aiogram import Router
 from aiogram.types import Message
 
-from app.services.api_client import APIClient
-from app.utils.text_processor import extract_vacancy_name, generate_link
+from app.services.api_client import api_client
+from app.services.vacancy_batcher import vacancy_batcher
+from app.utils.text_processor import extract_vacancy_fields, generate_link
 
 logger = logging.getLogger(__name__)
 router = Router()
-api_client = APIClient()
 
 
 @router.message()
@@ -31,29 +31,23 @@ async def handle_message(message: Message):
         )
         return
 
-    # Извлекаем название вакансии из текста
+    # Извлекаем поля вакансии из текста
     if not message.text:
         await message.answer("Сообщение должно содержать текст с описанием вакансии.")
         return
 
-    vacancy_name = extract_vacancy_name(message.text)
+    fields = extract_vacancy_fields(message.text)
     link = generate_link(message.forward_from_chat.id, message.forward_from_message_id)
     description = message.text
 
-    # Создаем
-    success, result = await api_client.create_vacancy(
-        user_id, vacancy_name, link, description
+    # Сохраняем пакетом вместе с другими сообщениями, пересланными одновременно
+    await vacancy_batcher.add(
+        message,
+        {
+            "user_id": user_id,
+            "name": "Неизвестная вакансия",
+            **fields,
+            "link": link,
+            "description": description,
+        },
     )
-
-    if success:
-        await message.answer(
-            f"✅ <b>Вакансия сохранена!</b>\n\n"
-            f"<b>Вакансия:</b> {vacancy_name}\n"
-            f'<b>Ссылка:</b> <a href="{link}">Перейти к посту</a>\n\n'
-            f"Используйте /my_vacancies для просмотра всех вакансий\n"
-            f"Или заходите на сайт applyr.vladsergeichev.ru",
-            parse_mode="HTML",
-            disable_web_page_preview=True,
-        )
-    else:
-        await message.answer(f"❌ {result}")
@@ -5,6 +5,8 @@ from aiogram import Bot, Dispatcher
 
 from app.config import app_config
 from app.handlers import applies, commands, vacancy_handler
+from app.services.api_client import api_client
+from app.services.vacancy_batcher import vacancy_batcher
 
 # Настройка логирования
 logging.basicConfig(
@@ -23,6 +25,21 @@ dp.include_router(vacancy_handler.router)
 dp.include_router(applies.router)
 
 
+async def on_startup():
+    """Открывает соединения с API при запуске бота"""
+    await api_client.start()
+
+
+async def on_shutdown():
+    """Отправляет накопленные вакансии и закрывает соединения с API"""
+    await vacancy_batcher.close()
+    await api_client.close()
+
+
+dp.startup.register(on_startup)
+dp.shutdown.register(on_shutdown)
+
+
 async def main():
     """Основная функция"""
     logger.info("Запуск Telegram бота...")
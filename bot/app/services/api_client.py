@@ -1,77 +1,214 @@
+import asyncio
 import logging
+from datetime import datetime, timedelta
 
 import aiohttp
 
 from app.config import app_config
+from app.utils.ttl_cache import MISSING, TTLCache
 
 logger = logging.getLogger(__name__)
 
 
 class APIClient:
-    """Клиент для работы с API"""
+    """Клиент для работы с API
+
+    Использует одну долгоживущую сессию с пулом keep-alive соединений.
+    Сессия открывается в start() и закрывается в close() вместе с ботом.
+    Результаты поиска пользователя по telegram_username кешируются,
+    а кеш сбрасывается по ленте изменений привязок из API.
+    """
+
+    # Запас на транзакции, которые закоммитились позже момента until
+    SYNC_OVERLAP = timedelta(seconds=5)
 
     def __init__(self, base_url: str = ""):
         self.base_url = base_url or app_config.api_url
+        self._session: aiohttp.ClientSession | None = None
+        self._user_cache = TTLCache(max_size=app_config.user_cache_size)
+        self._sync_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Открывает HTTP-сессию с пулом соединений"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=app_config.api_connection_limit,
+            keepalive_timeout=app_config.api_keepalive_timeout,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=app_config.api_total_timeout,
+            connect=app_config.api_connect_timeout,
+            sock_read=app_config.api_read_timeout,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._sync_task = asyncio.create_task(self._sync_user_cache())
+        logger.info("HTTP-сессия API открыта")
+
+    async def close(self) -> None:
+        """Закрывает HTTP-сессию и все соединения"""
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP-сессия API закрыта")
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Текущая HTTP-сессия"""
+        if self._session is None or self._session.closed:
+            raise RuntimeError("APIClient не запущен: вызовите start()")
+        return self._session
 
     async def create_vacancy(
         self, user_id: int, name: str, link: str, description: str
     ) -> tuple[bool, str]:
         """Создает отклик через API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                apply_data = {
-                    "user_id": user_id,
-                    "name": name,
-                    "link": link,
-                    "description": description,
-                }
-
-                async with session.post(
-                    f"{self.base_url}/api/internal/create_vacancy", json=apply_data
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        logger.info(f"Создан отклик: {result['id']}")
-                        return True, result["id"]
-                    else:
-                        error_text = await response.text()
-                        logger.error(
-                            f"Ошибка создания отклика: {response.status} - {error_text}"
-                        )
-                        return False, f"Ошибка создания отклика: {response.status}"
+            apply_data = {
+                "user_id": user_id,
+                "name": name,
+                "link": link,
+                "description": description,
+            }
+
+            async with self.session.post(
+                f"{self.base_url}/api/internal/create_vacancy", json=apply_data
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    logger.info(f"Создан отклик: {result['id']}")
+                    return True, result["id"]
+                else:
+                    error_text = await response.text()
+                    logger.error(
+                        f"Ошибка создания отклика: {response.status} - {error_text}"
+                    )
+                    return False, f"Ошибка создания отклика: {response.status}"
 
         except Exception as e:
             logger.error(f"Ошибка при создании отклика: {e}")
             return False, f"Ошибка: {str(e)}"
 
-    async def get_user_applies(self, username: str) -> list:
-        """Получает вакансии пользователя по username"""
+    async def create_vacancies(self, vacancies: list[dict]) -> list[dict] | None:
+        """Создает пакет вакансий и возвращает результат по каждой позиции"""
+        try:
+            async with self.session.post(
+                f"{self.base_url}/api/internal/create_vacancies",
+                json={"items": vacancies},
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    logger.info(
+                        f"Пакетно создано {result['created']} из {len(vacancies)}"
+                    )
+                    return result["items"]
+                error_text = await response.text()
+                logger.error(
+                    f"Ошибка пакетного создания: {response.status} - {error_text}"
+                )
+                return None
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном создании вакансий: {e}")
+            return None
+
+    async def get_user_applies(
+        self, user_id: int, limit: int = 10, cursor: str | None = None
+    ) -> tuple[list, str | None]:
+        """Получает страницу вакансий пользователя и курсор следующей страницы"""
+        params = {"user_id": user_id, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/api/internal/get_vacancies/{username}"
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"Ошибка получения откликов: {response.status}")
-                        return []
+            async with self.session.post(
+                f"{self.base_url}/api/internal/get_vacancies", params=params
+            ) as response:
+                if response.status == 200:
+                    page = await response.json()
+                    return page["items"], page.get("next_cursor")
+                else:
+                    logger.error(f"Ошибка получения откликов: {response.status}")
+                    return [], None
 
         except Exception as e:
             logger.error(f"Ошибка получения откликов: {e}")
-            return []
+            return [], None
 
     async def get_user_by_telegram_username(self, telegram_username: str) -> int | None:
         """Возвращает user_id пользователя по telegram_username, если найден, иначе None"""
+        user_id = self._user_cache.get(telegram_username)
+        if user_id is not MISSING:
+            return user_id
+
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/api/internal/get_by_telegram/{telegram_username}"
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("id")
-                    return None
+            async with self.session.get(
+                f"{self.base_url}/api/internal/get_by_telegram/{telegram_username}"
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    user_id = data.get("id")
+                    self._user_cache.set(
+                        telegram_username, user_id, app_config.user_cache_ttl
+                    )
+                    return user_id
+                if response.status == 404:
+                    self._user_cache.set(
+                        telegram_username, None, app_config.user_cache_negative_ttl
+                    )
+                return None
         except Exception as e:
             logger.error(f"Ошибка при проверке telegram_username: {e}")
             return None
+
+    async def get_telegram_changes(
+        self, since: datetime
+    ) -> tuple[list[int], list[str], datetime] | None:
+        """Получает пользователей, привязка которых могла измениться после since
+
+        Возвращает ID измененных и удаленных пользователей, их текущие
+        telegram_username и момент, до которого собраны изменения.
+        """
+        try:
+            async with self.session.get(
+                f"{self.base_url}/api/internal/telegram_changes",
+                params={"since": since.isoformat()},
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return (
+                        data["user_ids"],
+                        data["usernames"],
+                        datetime.fromisoformat(data["until"]),
+                    )
+                logger.error(f"Ошибка получения изменений привязок: {response.status}")
+                return None
+        except Exception as e:
+            logger.error(f"Ошибка получения изменений привязок: {e}")
+            return None
+
+    async def _sync_user_cache(self) -> None:
+        """Периодически сбрасывает кеш для пользователей с измененной привязкой"""
+        since = datetime.utcnow()
+        while True:
+            await asyncio.sleep(app_config.user_cache_sync_interval)
+            changes = await self.get_telegram_changes(since - self.SYNC_OVERLAP)
+            if changes is None:
+                # Не знаем, что изменилось, - сбрасываем кеш целиком
+                self._user_cache.clear()
+                continue
+
+            user_ids, usernames, since = changes
+            # По ID сбрасываются старые username после перепривязки, отвязки
+            # и удаления, по username - закешированное "не найден" для новых
+            self._user_cache.delete_values(set(user_ids))
+            for username in usernames:
+                self._user_cache.delete(username)
+            if user_ids:
+                logger.info(f"Сброшен кеш для {len(user_ids)} пользователей")
+
+
+# Общий клиент для всех обработчиков бота
+api_client = APIClient()
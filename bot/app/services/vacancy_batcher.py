@@ -0,0 +1,132 @@
+import asyncio
+import html
+import logging
+from dataclasses import dataclass
+
+from aiogram.types import Message
+
+from app.config import app_config
+from app.services.api_client import APIClient, api_client
+
+logger = logging.getLogger(__name__)
+
+# Сколько вакансий перечислять в итоговом ответе
+SUMMARY_MAX_LINES = 20
+
+
+@dataclass
+class PendingVacancy:
+    message: Message
+    data: dict
+
+
+class VacancyBatcher:
+    """Собирает пересланные вакансии чата в пакеты
+
+    Первое сообщение открывает окно длиной window секунд. Все сообщения,
+    пришедшие за это время, отправляются в API одним запросом в порядке
+    message_id, а пользователь получает один итоговый ответ.
+    """
+
+    def __init__(self, client: APIClient, window: float, max_size: int):
+        self.client = client
+        self.window = window
+        self.max_size = max_size
+        self._pending: dict[int, list[PendingVacancy]] = {}
+        self._timers: dict[int, asyncio.Task] = {}
+        self._flushing: set[asyncio.Task] = set()
+
+    async def add(self, message: Message, vacancy_data: dict) -> None:
+        """Добавляет вакансию в пакет чата"""
+        chat_id = message.chat.id
+        batch = self._pending.setdefault(chat_id, [])
+        batch.append(PendingVacancy(message=message, data=vacancy_data))
+
+        if len(batch) >= self.max_size:
+            timer = self._timers.pop(chat_id, None)
+            if timer is not None:
+                timer.cancel()
+            await self._flush(chat_id)
+        elif chat_id not in self._timers:
+            self._timers[chat_id] = asyncio.create_task(self._flush_later(chat_id))
+
+    async def close(self) -> None:
+        """Отправляет все накопленные пакеты при остановке бота"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+        for chat_id in list(self._pending):
+            await self._flush(chat_id)
+
+    async def _flush_later(self, chat_id: int) -> None:
+        """Отправляет пакет чата по окончании окна"""
+        await asyncio.sleep(self.window)
+        task = asyncio.current_task()
+        self._timers.pop(chat_id, None)
+        self._flushing.add(task)
+        try:
+            await self._flush(chat_id)
+        finally:
+            self._flushing.discard(task)
+
+    async def _flush(self, chat_id: int) -> None:
+        """Отправляет пакет чата в API и отвечает одним сообщением"""
+        batch = self._pending.pop(chat_id, [])
+        if not batch:
+            return
+
+        # Обработчики выполняются конкурентно, поэтому восстанавливаем порядок
+        batch.sort(key=lambda item: item.message.message_id)
+        results = await self.client.create_vacancies([item.data for item in batch])
+
+        try:
+            await batch[0].message.answer(
+                self._render_summary(batch, results),
+                parse_mode="HTML",
+                disable_web_page_preview=True,
+            )
+        except Exception as e:
+            logger.error(f"Ошибка отправки итогов пакета в чат {chat_id}: {e}")
+
+    @staticmethod
+    def _render_summary(batch: list[PendingVacancy], results: list | None) -> str:
+        """Формирует итоговый ответ по пакету"""
+        if results is None:
+            return f"❌ Не удалось сохранить вакансии ({len(batch)}). Попробуйте позже."
+
+        if len(batch) == 1:
+            item, result = batch[0], results[0]
+            if not result["success"]:
+                return f"❌ {html.escape(result['error'])}"
+            return (
+                f"✅ <b>Вакансия сохранена!</b>\n\n"
+                f"<b>Вакансия:</b> {html.escape(item.data['name'])}\n"
+                f'<b>Ссылка:</b> <a href="{item.data["link"]}">Перейти к посту</a>\n\n'
+                f"Используйте /my_vacancies для просмотра всех вакансий\n"
+                f"Или заходите на сайт applyr.vladsergeichev.ru"
+            )
+
+        created = sum(1 for result in results if result["success"])
+        text = f"✅ <b>Сохранено вакансий: {created} из {len(batch)}</b>\n\n"
+        for i, (item, result) in enumerate(zip(batch, results), 1):
+            if i > SUMMARY_MAX_LINES:
+                text += f"... и еще {len(batch) - SUMMARY_MAX_LINES}\n"
+                break
+            name = html.escape(item.data["name"])
+            if result["success"]:
+                text += f'{i}. <a href="{item.data["link"]}">{name}</a>\n'
+            else:
+                text += f"{i}. ❌ {name}: {html.escape(result['error'])}\n"
+
+        text += "\nИспользуйте /my_vacancies для просмотра всех вакансий"
+        return text
+
+
+vacancy_batcher = VacancyBatcher(
+    api_client,
+    window=app_config.forward_batch_window,
+    max_size=app_config.forward_batch_max_size,
+)
@@ -0,0 +1,57 @@
+import time
+from collections import OrderedDict
+from collections.abc import Collection
+from typing import Any
+
+# Отличает отсутствие записи от закешированного None
+MISSING = object()
+
+
+class TTLCache:
+    """Ограниченный по размеру кеш с временем жизни для каждой записи"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[Any, tuple[Any, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Any:
+        """Возвращает значение или MISSING, если записи нет или она истекла"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        """Сохраняет значение на ttl секунд"""
+        if self.max_size <= 0 or ttl <= 0:
+            return
+
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        """Удаляет запись"""
+        self._entries.pop(key, None)
+
+    def delete_values(self, values: Collection[Any]) -> int:
+        """Удаляет записи с любым из значений и возвращает их количество"""
+        keys = [key for key, (value, _) in self._entries.items() if value in values]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Очищает кеш"""
+        self._entries.clear()
@@ -0,0 +1,63 @@
+"""Бенчмарк извлечения полей вакансии из текста поста
+
+Проверяет точность extract_vacancy_fields на корпусе типовых постов
+(vacancy_corpus.json) по каждому полю и измеряет пропускную способность.
+
+Запуск из каталога bot:
+    python -m benchmarks.bench_text_processor
+"""
+
+import json
+import time
+from pathlib import Path
+
+from app.utils.text_processor import extract_vacancy_fields
+
+CORPUS_PATH = Path(__file__).with_name("vacancy_corpus.json")
+FIELDS = ("name", "company_name", "salary", "experience", "location", "employment")
+ITERATIONS = 2000
+
+
+def load_corpus() -> list[dict]:
+    with CORPUS_PATH.open(encoding="utf-8") as file:
+        return json.load(file)
+
+
+def check_accuracy(corpus: list[dict]) -> None:
+    """Печатает долю верно извлеченных значений по каждому полю"""
+    hits = dict.fromkeys(FIELDS, 0)
+    totals = dict.fromkeys(FIELDS, 0)
+
+    for i, post in enumerate(corpus):
+        extracted = extract_vacancy_fields(post["text"])
+        for field in FIELDS:
+            expected = post["expected"].get(field)
+            actual = extracted.get(field)
+            # Поле, которого нет в посте, не должно появляться в результате
+            totals[field] += 1
+            if actual == expected:
+                hits[field] += 1
+            else:
+                print(f"  пост #{i} {field}: ожидалось {expected!r}, а не {actual!r}")
+
+    print("Точность по полям:")
+    for field in FIELDS:
+        print(f"  {field:<13} {hits[field]}/{totals[field]}")
+    print(f"  {'всего':<13} {sum(hits.values())}/{sum(totals.values())}")
+
+
+def measure_throughput(corpus: list[dict]) -> None:
+    texts = [post["text"] for post in corpus]
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for text in texts:
+            extract_vacancy_fields(text)
+    elapsed = time.perf_counter() - started
+    posts = ITERATIONS * len(texts)
+    print(f"Пропускная способность: {posts / elapsed:,.0f} постов/с")
+
+
+if __name__ == "__main__":
+    corpus = load_corpus()
+    check_accuracy(corpus)
+    measure_throughput(corpus)
@@ -13,6 +13,9 @@ const HTTP_STATUS = {
 };
 
 
+// Размер страницы при загрузке списка вакансий
+const VACANCIES_PAGE_SIZE = 100;
+
 // Сообщения об ошибках
 const ERROR_MESSAGES = {
     INVALID_URL: 'URL должен быть строкой',
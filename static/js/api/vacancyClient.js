@@ -18,9 +18,51 @@ class VacancyClient extends BaseClient {
         }
     }
 
-    // Получение вакансий текущего пользователя
-    async getVacancies() {
-        return this.get('/get_vacancies');
+    // Query-параметры фильтров: { stage: ['apply_sent'], company_name: ['Ozon'] }
+    _appendFilters(params, filters) {
+        for (const [name, values] of Object.entries(filters)) {
+            for (const value of values) {
+                params.append(name, value);
+            }
+        }
+        return params;
+    }
+
+    // Получение страницы вакансий текущего пользователя
+    // view: 'full' - все поля, 'compact' - поля карточки и начало описания
+    async getVacanciesPage(cursor = null, limit = VACANCIES_PAGE_SIZE, filters = {}, view = 'full') {
+        const params = this._appendFilters(new URLSearchParams({ limit, view }), filters);
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        return this.get(`/get_vacancies?${params}`);
+    }
+
+    // Получение всех вакансий текущего пользователя постранично
+    async getVacancies(filters = {}, view = 'full') {
+        const vacancies = [];
+        let cursor = null;
+        do {
+            const page = await this.getVacanciesPage(cursor, VACANCIES_PAGE_SIZE, filters, view);
+            vacancies.push(...page.items);
+            cursor = page.next_cursor;
+        } while (cursor);
+        return vacancies;
+    }
+
+    // Количество вакансий по значениям фильтров для чипов со счетчиками
+    async getVacancyFacets(filters = {}) {
+        const params = this._appendFilters(new URLSearchParams(), filters);
+        return this.get(`/get_facets?${params}`);
+    }
+
+    // Полнотекстовый поиск по вакансиям и заметкам текущего пользователя
+    async searchVacancies(query, cursor = null, limit = VACANCIES_PAGE_SIZE) {
+        const params = new URLSearchParams({ q: query, limit });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        return this.get(`/search_vacancies?${params}`);
     }
 
     // Создание вакансии
@@ -187,7 +187,8 @@ class App {
             // Обновляем ссылку на список вакансий после пересоздания DOM
             this.vacancyRenderer.updateVacanciesList();
 
-            const vacancies = await this.vacancyClient.getVacancies();
+            // Доске хватает полей карточки, полная вакансия грузится при открытии
+            const vacancies = await this.vacancyClient.getVacancies({}, 'compact');
             this.vacancyRenderer.renderVacancies(vacancies);
         } catch (error) {
             console.error('Ошибка загрузки вакансий:', error);
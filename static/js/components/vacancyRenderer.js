@@ -119,7 +119,15 @@ class VacancyRenderer {
             items: [
                 {
                     text: 'Редактировать',
-                    onClick: () => window.showVacancyModal({mode: 'edit', vacancy})
+                    onClick: async () => {
+                        // В списке компактные вакансии, для формы нужны все поля
+                        try {
+                            const fullVacancy = await window.app.vacancyClient.getVacancy(vacancy.id);
+                            window.showVacancyModal({mode: 'edit', vacancy: fullVacancy});
+                        } catch (err) {
+                            window.app.messageManager.showError('Ошибка загрузки вакансии');
+                        }
+                    }
                 },
                 {
                     text: 'Удалить',